@@ -1,52 +1,101 @@
 """依赖项（认证、数据库等）"""
-from typing import Generator, Optional
+from typing import Generator, Optional, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.models.user import User
-from app.core.security import decode_access_token
+from app.core.config import get_settings
+from app.core.security import decode_access_token, is_admin
+from app.core.user_cache import UserSnapshot, user_cache
 
 security = HTTPBearer(auto_error=False)
+settings = get_settings()
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-) -> User:
-    """获取当前认证用户"""
-    credentials_exception = HTTPException(
+def credentials_exception() -> HTTPException:
+    """未认证异常"""
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="未认证或令牌无效",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def decode_credentials(credentials: Optional[HTTPAuthorizationCredentials]) -> Tuple[str, dict]:
+    """校验 Bearer 令牌，返回 (token, payload)"""
     if credentials is None:
-        raise credentials_exception
+        raise credentials_exception()
 
     token = credentials.credentials
     payload = decode_access_token(token)
 
-    if payload is None:
-        raise credentials_exception
+    if payload is None or payload.get("sub") is None:
+        raise credentials_exception()
+
+    return token, payload
+
+
+def get_current_user(
+    db: Session = Depends(get_db),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+) -> UserSnapshot:
+    """获取当前认证用户（优先读取进程内缓存）"""
+    token, payload = decode_credentials(credentials)
 
-    user_id: Optional[int] = payload.get("sub")
-    if user_id is None:
-        raise credentials_exception
+    cached = user_cache.get(token)
+    if cached is not None:
+        return cached
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).filter(User.id == payload["sub"]).first()
     if user is None:
-        raise credentials_exception
+        raise credentials_exception()
 
-    return user
+    snapshot = UserSnapshot.from_user(user)
+    user_cache.put(token, snapshot, payload.get("exp"))
+    return snapshot
+
+
+def get_current_user_readonly(
+    db: Session = Depends(get_db),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+) -> UserSnapshot:
+    """只读接口使用的当前用户
+
+    开启 AUTH_TRUST_TOKEN_CLAIMS 时直接使用令牌中的签名声明，不查询用户表；
+    旧令牌缺少声明时回退到 get_current_user。
+    """
+    if settings.AUTH_TRUST_TOKEN_CLAIMS:
+        _, payload = decode_credentials(credentials)
+        if "email" in payload and "name" in payload:
+            return UserSnapshot(id=int(payload["sub"]), email=payload["email"], full_name=payload["name"])
+    return get_current_user(db, credentials)
+
+
+def get_current_admin(current_user: UserSnapshot = Depends(get_current_user_readonly)) -> UserSnapshot:
+    """当前用户须在 ADMIN_EMAILS 中"""
+    if not is_admin(current_user.email):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="需要管理员权限")
+    return current_user
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    """用户被更新或删除后使缓存失效"""
+    user_cache.invalidate_user(target.id)
 
 
 def get_resume_by_id_for_user(
     resume_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user_readonly),
 ):
-    """获取用户指定简历（验证权限）"""
+    """获取用户指定简历（验证权限）
+
+    作为依赖注入时只用于读接口；写接口直接调用并传入 get_current_user 的结果。
+    """
     from app.models.resume import Resume
 
     resume = db.query(Resume).filter(Resume.id == resume_id).first()
@@ -0,0 +1,67 @@
+"""异步依赖项（认证、数据库等）"""
+from typing import Optional
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import security, settings, credentials_exception, decode_credentials
+from app.db.async_session import get_async_db
+from app.models.user import User
+from app.models.resume import Resume
+from app.core.user_cache import UserSnapshot, user_cache
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+) -> UserSnapshot:
+    """获取当前认证用户（优先读取进程内缓存）"""
+    token, payload = decode_credentials(credentials)
+
+    cached = user_cache.get(token)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(select(User).where(User.id == int(payload["sub"])))
+    user = result.scalar_one_or_none()
+    if user is None:
+        raise credentials_exception()
+
+    snapshot = UserSnapshot.from_user(user)
+    user_cache.put(token, snapshot, payload.get("exp"))
+    return snapshot
+
+
+async def get_current_user_readonly_async(
+    db: AsyncSession = Depends(get_async_db),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+) -> UserSnapshot:
+    """只读接口使用的当前用户（见 get_current_user_readonly）"""
+    if settings.AUTH_TRUST_TOKEN_CLAIMS:
+        _, payload = decode_credentials(credentials)
+        if "email" in payload and "name" in payload:
+            return UserSnapshot(id=int(payload["sub"]), email=payload["email"], full_name=payload["name"])
+    return await get_current_user_async(db, credentials)
+
+
+async def get_resume_by_id_for_user_async(
+    resume_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_readonly_async),
+) -> Resume:
+    """获取用户指定简历（验证权限）"""
+    resume = await db.get(Resume, resume_id)
+
+    if resume is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="简历不存在",
+        )
+
+    if resume.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="无权访问此简历",
+        )
+
+    return resume
@@ -1,8 +1,12 @@
 """应用配置"""
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Optional
 import os
 
+# 后端根目录（backend/）
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 
 class Settings(BaseSettings):
     """应用配置"""
@@ -12,12 +16,97 @@ class Settings(BaseSettings):
 
     # 数据库
     DATABASE_URL: str = "sqlite:///./resume.db"
+    # 启用异步数据库层（认证、简历路由改用 AsyncSession）
+    DB_ASYNC: bool = False
+    # 异步驱动连接串，留空时由 DATABASE_URL 推导（aiosqlite / asyncpg）
+    ASYNC_DATABASE_URL: str = ""
+
+    # SQLite PRAGMA 配置档（default / wal / production），见 app/db/base.py
+    SQLITE_PRAGMA_PROFILE: str = "production"
+    # 覆盖配置档中的单项 PRAGMA，例如 "busy_timeout=10000,cache_size=-20000"
+    SQLITE_PRAGMAS: str = ""
+
+    # 连接池
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # 秒
+    DB_POOL_RECYCLE: int = 1800  # 秒，-1 表示不回收
+    DB_POOL_PRE_PING: bool = True
 
     # JWT
     SECRET_KEY: str = ""
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 小时
 
+    # 已认证用户缓存
+    USER_CACHE_SIZE: int = 10000  # 0 表示关闭缓存
+    USER_CACHE_TTL: int = 60  # 秒
+    # 只读接口直接信任令牌中的签名声明，不再查询用户表
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
+    # 管理员邮箱，逗号分隔（可使用采样分析器等管理接口）
+    ADMIN_EMAILS: str = ""
+
+    # 密码哈希
+    BCRYPT_ROUNDS: Optional[int] = None  # 留空时按环境取默认值，修改后用户登录时自动重新哈希
+    HASH_POOL_WORKERS: int = 0  # 0 表示使用 CPU 核数
+    HASH_POOL_MAX_QUEUE: int = 64  # 排队上限，超过后直接返回 503
+
+    # 模板清单目录与热重载检查间隔（秒，0 表示不监听）
+    TEMPLATES_DIR: str = os.path.join(BASE_DIR, "templates")
+    TEMPLATE_RELOAD_INTERVAL: float = 5.0
+
+    # 服务端 PDF 渲染
+    PDF_RENDER_WORKERS: int = 2  # 渲染进程数，0 表示在请求线程内渲染
+    PDF_RENDER_MAX_QUEUE: int = 16
+    PDF_RENDER_TIMEOUT: float = 30.0  # 秒
+    PDF_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # 自动保存写缓冲：按间隔（秒）或待写入数量合并落盘
+    AUTOSAVE_FLUSH_INTERVAL: float = 2.0
+    AUTOSAVE_MAX_PENDING: int = 200
+
+    # 修订历史：每隔多少个修订保存一次完整快照，其余只存增量
+    REVISION_SNAPSHOT_INTERVAL: int = 50
+
+    # 简历内容存储压缩：none / zlib / zstd（zstd 需要安装 zstandard，未安装时回退到 zlib）
+    CONTENT_CODEC: str = "zlib"
+    CONTENT_COMPRESSION_LEVEL: int = 6
+
+    # 岗位匹配：按内容哈希缓存的简历向量个数，0 表示关闭缓存
+    MATCH_CACHE_SIZE: int = 10000
+
+    # 批量导入：每个事务写入的份数，单次请求最多导入的份数
+    BULK_IMPORT_BATCH_SIZE: int = 500
+    BULK_IMPORT_MAX_ITEMS: int = 10000
+
+    # 日志：后台线程写出，队列满时 drop（丢弃，错误日志除外）或 block（等待，超时后丢弃）
+    LOG_DIR: str = os.path.join(BASE_DIR, "logs")
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_QUEUE_POLICY: str = "drop"
+    LOG_QUEUE_BLOCK_TIMEOUT: float = 1.0  # 秒
+    # 文件轮转：按时间（TimedRotatingFileHandler 的 when）和大小，保留的归档个数
+    LOG_ROTATE_WHEN: str = "midnight"
+    LOG_MAX_BYTES: int = 50 * 1024 * 1024  # 0 表示不按大小轮转
+    LOG_BACKUP_COUNT: int = 14
+    # 每条日志输出一行 JSON（便于日志平台解析），否则为文本
+    LOG_JSON: bool = False
+    # INFO 及以下日志的保留比例（按请求整体保留或丢弃），警告和错误始终保留
+    LOG_SAMPLE_RATE: float = 1.0
+
+    # SQL 统计：超过该耗时（毫秒）的查询记录警告（0 表示不记录），
+    # 同一请求中同一语句执行达到该次数时记为疑似 N+1
+    DB_SLOW_QUERY_MS: float = 200
+    DB_N_PLUS_ONE_THRESHOLD: int = 10
+
+    # 采样分析器（仅管理员），关闭时不注册中间件、没有任何开销
+    PROFILER_ENABLED: bool = False
+    PROFILER_MAX_SECONDS: float = 60
+    PROFILER_REQUEST_INTERVAL_MS: float = 1  # 单请求采样间隔
+    PROFILER_KEEP_RESULTS: int = 20  # 保留最近多少个单请求采样结果
+
+    # Prometheus 指标（GET /metrics），多 worker 时另需设置环境变量 PROMETHEUS_MULTIPROC_DIR
+    METRICS_ENABLED: bool = True
+
     # CORS
     FRONTEND_URL: str = "http://localhost:5175"
 
@@ -35,6 +124,9 @@ class Settings(BaseSettings):
         # 生产环境必须有 SECRET_KEY
         elif self.ENVIRONMENT == "production" and not self.SECRET_KEY:
             raise ValueError("SECRET_KEY 环境变量在 production 环境是必需的")
+        # 生产环境使用 bcrypt 默认强度，其余环境降低强度以加快开发和测试
+        if self.BCRYPT_ROUNDS is None:
+            self.BCRYPT_ROUNDS = 12 if self.ENVIRONMENT == "production" else 10
 
 
 @lru_cache()
@@ -0,0 +1,161 @@
+"""简历内容的存储编码
+
+简历内容是以中文为主、键名高度重复的 JSON，写入 content_blobs 前压缩，
+读取时由 Resume.content 按需解压。编码结果的第一个字节是格式版本：
+
+    0x00  未压缩的 UTF-8（压缩后反而更大时使用）
+    0x01  zlib（raw deflate），预置字典 v1
+    0x02  zstd，预置字典 v1（需要安装 zstandard）
+
+预置字典由模板的 defaultContent 生成并冻结在 content_dicts 目录中：
+模板支持热重载，字典一旦用于写入就不能再变化，更换字典须新增格式版本。
+旧版本写入的 TEXT 值（str）视为未编码的 JSON，原样返回。
+"""
+import json
+import logging
+import sys
+import threading
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+
+from app.core.config import get_settings
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard 为可选依赖
+    zstandard = None
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+DICTIONARY_DIR = Path(__file__).with_name("content_dicts")
+
+FORMAT_RAW = 0x00
+FORMAT_ZLIB_V1 = 0x01
+FORMAT_ZSTD_V1 = 0x02
+
+
+def build_dictionary(samples: Iterable[dict]) -> bytes:
+    """把样本按紧凑格式拼接为预置字典（与 model_dump_json 的输出格式一致）"""
+    return b"".join(
+        json.dumps(sample, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        for sample in samples
+    )
+
+
+@lru_cache(maxsize=None)
+def load_dictionary(name: str) -> bytes:
+    """读取冻结的预置字典"""
+    with open(DICTIONARY_DIR / f"{name}.json", encoding="utf-8") as f:
+        return build_dictionary(json.load(f))
+
+
+def _zlib_encode(data: bytes, dictionary: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, 9, zlib.Z_DEFAULT_STRATEGY, dictionary)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _zlib_decode(data: bytes, dictionary: bytes) -> bytes:
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS, zdict=dictionary)
+    return decompressor.decompress(data) + decompressor.flush()
+
+
+_zstd_local = threading.local()
+
+
+def _zstd_objects(dictionary: bytes, level: int) -> Tuple:
+    """zstd 的压缩器不是线程安全的，每个线程各自缓存一份"""
+    key = (id(dictionary), level)
+    cached = getattr(_zstd_local, "objects", None)
+    if cached is None or cached[0] != key:
+        zdict = zstandard.ZstdCompressionDict(dictionary, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+        cached = (
+            key,
+            zstandard.ZstdCompressor(level=level, dict_data=zdict, write_checksum=False, write_dict_id=False),
+            zstandard.ZstdDecompressor(dict_data=zdict),
+        )
+        _zstd_local.objects = cached
+    return cached[1], cached[2]
+
+
+def _zstd_encode(data: bytes, dictionary: bytes, level: int) -> bytes:
+    return _zstd_objects(dictionary, level)[0].compress(data)
+
+
+def _zstd_decode(data: bytes, dictionary: bytes) -> bytes:
+    if zstandard is None:
+        raise RuntimeError("内容使用 zstd 压缩，但未安装 zstandard")
+    return _zstd_objects(dictionary, settings.CONTENT_COMPRESSION_LEVEL)[1].decompress(data)
+
+
+# 格式版本 -> (编码函数, 解码函数, 字典名)
+_FORMATS: Dict[int, Tuple[Callable[[bytes, bytes, int], bytes], Callable[[bytes, bytes], bytes], str]] = {
+    FORMAT_ZLIB_V1: (_zlib_encode, _zlib_decode, "v1"),
+    FORMAT_ZSTD_V1: (_zstd_encode, _zstd_decode, "v1"),
+}
+
+# CONTENT_CODEC 配置值 -> 写入时使用的格式版本
+CODECS: Dict[str, int] = {
+    "none": FORMAT_RAW,
+    "zlib": FORMAT_ZLIB_V1,
+    "zstd": FORMAT_ZSTD_V1,
+}
+
+
+def resolve_format(codec: str) -> int:
+    """解析配置的编码方式，未安装 zstandard 时回退到 zlib"""
+    if codec not in CODECS:
+        raise ValueError(f"未知的内容编码: {codec}")
+    if codec == "zstd" and zstandard is None:
+        logger.warning("未安装 zstandard，内容压缩回退到 zlib")
+        return FORMAT_ZLIB_V1
+    return CODECS[codec]
+
+
+def encode_content(content: str, fmt: Optional[int] = None, level: Optional[int] = None) -> bytes:
+    """编码简历内容，fmt 缺省时使用 CONTENT_CODEC 配置"""
+    if fmt is None:
+        fmt = _default_format()
+    data = content.encode("utf-8")
+    if fmt != FORMAT_RAW:
+        encode, _, dictionary = _FORMATS[fmt]
+        compressed = encode(data, load_dictionary(dictionary), settings.CONTENT_COMPRESSION_LEVEL if level is None else level)
+        if len(compressed) < len(data):
+            return bytes((fmt,)) + compressed
+    return bytes((FORMAT_RAW,)) + data
+
+
+def decode_content(data: Union[str, bytes, None]) -> Optional[str]:
+    """解码 encode_content 的结果，旧版未编码的文本原样返回"""
+    if data is None or isinstance(data, str):
+        return data
+    fmt, payload = data[0], memoryview(data)[1:]
+    if fmt == FORMAT_RAW:
+        return str(payload, "utf-8")
+    if fmt not in _FORMATS:
+        raise ValueError(f"未知的内容格式版本: {fmt}")
+    _, decode, dictionary = _FORMATS[fmt]
+    return decode(bytes(payload), load_dictionary(dictionary)).decode("utf-8")
+
+
+@lru_cache(maxsize=1)
+def _default_format() -> int:
+    return resolve_format(settings.CONTENT_CODEC)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    # 由当前模板生成新的预置字典：python -m app.core.content_codec v2
+    # 生成后需在 _FORMATS 中登记新的格式版本才会被使用
+    from app.core.template_registry import template_registry
+
+    name = sys.argv[1]
+    target = DICTIONARY_DIR / f"{name}.json"
+    if target.exists():
+        sys.exit(f"字典已存在，不能覆盖: {target}")
+    samples = [template["defaultContent"] for template in sorted(template_registry.all(), key=lambda t: t["id"])]
+    with open(target, "w", encoding="utf-8") as f:
+        json.dump(samples, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"已生成 {target}（{len(build_dictionary(samples))} 字节）")
@@ -0,0 +1,123 @@
+"""密码哈希工作池
+
+bcrypt 每次计算需要 100-300 ms CPU，直接在请求线程上执行会让突发的登录/注册
+占满线程池，拖慢其他接口。这里把哈希计算放到独立的有界线程池中执行
+（bcrypt 计算期间会释放 GIL），排队数量超过上限时立即拒绝，由调用方返回 503。
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class HashingPoolSaturated(Exception):
+    """哈希工作池已满"""
+
+
+class LatencyStats:
+    """简单的延迟统计（毫秒）"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max, 3),
+        }
+
+
+class PasswordHasher:
+    """有界的密码哈希线程池"""
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # 正在执行 + 排队中的任务总数上限
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._rejected = 0
+        self._queue_wait = LatencyStats()
+        self._execution = LatencyStats()
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> "Future[T]":
+        """提交哈希任务，工作池已满时抛出 HashingPoolSaturated"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HashingPoolSaturated("密码哈希工作池已满")
+
+        enqueued_at = time.perf_counter()
+        with self._lock:
+            self._pending += 1
+
+        def run() -> T:
+            started_at = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                finished_at = time.perf_counter()
+                with self._lock:
+                    self._pending -= 1
+                    self._queue_wait.record(started_at - enqueued_at)
+                    self._execution.record(finished_at - started_at)
+                self._slots.release()
+
+        return self._get_executor().submit(run)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """按需创建线程池（关闭后再次使用时重新创建）"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="bcrypt"
+                )
+            return self._executor
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """在工作池中执行并阻塞等待结果（供同步路由使用）"""
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable[..., T], *args: Any) -> T:
+        """在工作池中执行并异步等待结果（供异步路由使用）"""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> Dict[str, Any]:
+        """工作池状态与排队/执行延迟"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "pending": self._pending,
+                "rejected": self._rejected,
+                "queue_wait": self._queue_wait.snapshot(),
+                "execution": self._execution.snapshot(),
+            }
+
+    def shutdown(self) -> None:
+        """关闭工作池，等待已提交的任务完成"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+def default_workers() -> int:
+    """默认工作线程数：CPU 核数"""
+    return os.cpu_count() or 1
@@ -0,0 +1,54 @@
+"""HTTP 条件请求工具（ETag / If-None-Match）"""
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+from app.core.responses import dumps
+
+
+@dataclass(frozen=True)
+class EncodedResponse:
+    """预先编码好的 JSON 响应体及其 ETag"""
+
+    body: bytes
+    etag: str
+
+
+def make_etag(body: bytes) -> str:
+    """根据响应体生成强 ETag"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def encode_envelope(data: Any) -> EncodedResponse:
+    """把数据编码为统一响应格式 {success, data, error}"""
+    body = dumps({"success": True, "data": data, "error": None})
+    return EncodedResponse(body=body, etag=make_etag(body))
+
+
+def etag_matches(header: Optional[str], etag: str, strong: bool = False) -> bool:
+    """判断 If-None-Match / If-Match 请求头是否匹配 ETag
+
+    默认弱比较（忽略 W/ 前缀），用于 If-None-Match；strong=True 时按 RFC 9110 强比较，
+    弱 ETag 一律不匹配，用于 If-Match。
+    """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for tag in (tag.strip() for tag in header.split(",")):
+        if tag.startswith("W/"):
+            if not strong and tag[2:] == etag:
+                return True
+        elif tag == etag:
+            return True
+    return False
+
+
+def cached_response(request: Request, encoded: EncodedResponse, cache_control: str) -> Response:
+    """返回预编码响应，客户端缓存仍有效时返回 304"""
+    headers = {"ETag": encoded.etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), encoded.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=encoded.body, media_type="application/json", headers=headers)
@@ -0,0 +1,218 @@
+"""JSON Patch（RFC 6902）与 JSON Merge Patch（RFC 7386）
+
+只处理已解析的 JSON 数据（dict / list / 标量），就地修改传入的文档并返回结果；
+make_patch 生成两个文档之间的差异，用于简历修订历史的增量存储。
+"""
+import copy
+from typing import Any, Iterable, List, Set, Tuple
+
+_MISSING = object()
+
+
+class JsonPatchError(ValueError):
+    """补丁格式错误或无法应用"""
+
+
+class JsonPatchTestFailed(JsonPatchError):
+    """test 操作比较不一致"""
+
+
+def parse_pointer(pointer: Any) -> List[str]:
+    """解析 JSON Pointer（RFC 6901）为路径片段"""
+    if not isinstance(pointer, str):
+        raise JsonPatchError(f"JSON Pointer 必须是字符串: {pointer!r}")
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"无效的 JSON Pointer: {pointer}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _list_index(container: list, token: str, allow_end: bool) -> int:
+    """解析数组下标，add 操作允许使用 "-" 或 len 表示追加"""
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise JsonPatchError(f"无效的数组下标: {token}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"数组下标越界: {token}")
+    return index
+
+
+def _resolve_parent(doc: Any, tokens: List[str]) -> Tuple[Any, str]:
+    """定位路径的父容器和最后一个片段"""
+    if not tokens:
+        raise JsonPatchError("不支持对整个文档操作")
+    parent = doc
+    for token in tokens[:-1]:
+        if isinstance(parent, dict):
+            if token not in parent:
+                raise JsonPatchError(f"路径不存在: {token}")
+            parent = parent[token]
+        elif isinstance(parent, list):
+            parent = parent[_list_index(parent, token, allow_end=False)]
+        else:
+            raise JsonPatchError(f"路径不存在: {token}")
+    if not isinstance(parent, (dict, list)):
+        raise JsonPatchError(f"路径不存在: {tokens[-1]}")
+    return parent, tokens[-1]
+
+
+def _get(doc: Any, tokens: List[str]) -> Any:
+    parent, key = _resolve_parent(doc, tokens)
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"路径不存在: {key}")
+        return parent[key]
+    return parent[_list_index(parent, key, allow_end=False)]
+
+
+def _add(doc: Any, tokens: List[str], value: Any) -> None:
+    parent, key = _resolve_parent(doc, tokens)
+    if isinstance(parent, dict):
+        parent[key] = value
+    else:
+        parent.insert(_list_index(parent, key, allow_end=True), value)
+
+
+def _remove(doc: Any, tokens: List[str]) -> Any:
+    parent, key = _resolve_parent(doc, tokens)
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"路径不存在: {key}")
+        return parent.pop(key)
+    return parent.pop(_list_index(parent, key, allow_end=False))
+
+
+def _replace(doc: Any, tokens: List[str], value: Any) -> None:
+    parent, key = _resolve_parent(doc, tokens)
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"路径不存在: {key}")
+        parent[key] = value
+    else:
+        parent[_list_index(parent, key, allow_end=False)] = value
+
+
+def _operation_field(operation: dict, name: str) -> Any:
+    value = operation.get(name, _MISSING)
+    if value is _MISSING:
+        raise JsonPatchError(f"{operation.get('op')} 操作缺少 {name} 字段")
+    return value
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    """按 JSON 语义比较（布尔值与数字不相等）"""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_json_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_json_equal(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def apply_patch(doc: Any, operations: Iterable[Any]) -> Any:
+    """按顺序应用 JSON Patch 操作"""
+    for operation in operations:
+        if not isinstance(operation, dict):
+            raise JsonPatchError("补丁操作必须是对象")
+        op = operation.get("op")
+        tokens = parse_pointer(_operation_field(operation, "path"))
+
+        if op == "add":
+            _add(doc, tokens, _operation_field(operation, "value"))
+        elif op == "remove":
+            _remove(doc, tokens)
+        elif op == "replace":
+            _replace(doc, tokens, _operation_field(operation, "value"))
+        elif op == "move":
+            source = parse_pointer(_operation_field(operation, "from"))
+            if tokens[:len(source)] == source and len(tokens) > len(source):
+                raise JsonPatchError("不能把节点移动到自己的子节点下")
+            _add(doc, tokens, _remove(doc, source))
+        elif op == "copy":
+            source = parse_pointer(_operation_field(operation, "from"))
+            _add(doc, tokens, copy.deepcopy(_get(doc, source)))
+        elif op == "test":
+            if not _json_equal(_get(doc, tokens), _operation_field(operation, "value")):
+                raise JsonPatchTestFailed(f"test 操作未通过: {operation['path']}")
+        else:
+            raise JsonPatchError(f"不支持的补丁操作: {op}")
+    return doc
+
+
+def apply_merge_patch(target: Any, patch: Any) -> Any:
+    """应用 JSON Merge Patch：null 表示删除，对象递归合并，其余直接替换"""
+    if not isinstance(patch, dict):
+        return patch
+    if not isinstance(target, dict):
+        target = {}
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        else:
+            target[key] = apply_merge_patch(target.get(key), value)
+    return target
+
+
+def touched_keys(operations: Iterable[dict]) -> Set[str]:
+    """JSON Patch 涉及的顶层字段（move/copy 的来源也算在内）"""
+    keys: Set[str] = set()
+    for operation in operations:
+        if operation.get("op") == "test":
+            continue
+        for field in ("path", "from"):
+            pointer = operation.get(field)
+            if isinstance(pointer, str):
+                tokens = parse_pointer(pointer)
+                if tokens:
+                    keys.add(tokens[0])
+    return keys
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _diff(source: Any, target: Any, path: str, operations: List[dict]) -> None:
+    if isinstance(source, dict) and isinstance(target, dict):
+        for key in source:
+            if key not in target:
+                operations.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in target.items():
+            child = f"{path}/{_escape(key)}"
+            if key in source:
+                _diff(source[key], value, child, operations)
+            else:
+                operations.append({"op": "add", "path": child, "value": value})
+    elif isinstance(source, list) and isinstance(target, list):
+        # 去掉首尾相同的元素，中间部分逐项比较，多出的元素插入或删除
+        prefix = 0
+        limit = min(len(source), len(target))
+        while prefix < limit and _json_equal(source[prefix], target[prefix]):
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and _json_equal(source[-1 - suffix], target[-1 - suffix]):
+            suffix += 1
+        source_mid = len(source) - prefix - suffix
+        target_mid = len(target) - prefix - suffix
+        common = min(source_mid, target_mid)
+        for i in range(prefix, prefix + common):
+            _diff(source[i], target[i], f"{path}/{i}", operations)
+        for _ in range(source_mid - common):
+            operations.append({"op": "remove", "path": f"{path}/{prefix + common}"})
+        for i in range(prefix + common, prefix + target_mid):
+            operations.append({"op": "add", "path": f"{path}/{i}", "value": target[i]})
+    elif not _json_equal(source, target):
+        operations.append({"op": "replace", "path": path, "value": target})
+
+
+def make_patch(source: Any, target: Any) -> List[dict]:
+    """生成把 source 变为 target 的 JSON Patch（根节点须同为对象）"""
+    if not (isinstance(source, dict) and isinstance(target, dict)):
+        raise JsonPatchError("只支持对象之间的差异")
+    operations: List[dict] = []
+    _diff(source, target, "", operations)
+    return operations
@@ -1,62 +1,364 @@
-"""日志配置模块"""
+"""日志配置模块
+
+请求线程只把日志记录放进有界队列（QueueHandler），由后台线程（QueueListener）
+写控制台和文件，磁盘 I/O 不再阻塞请求。队列满时按 LOG_QUEUE_POLICY 处理：
+- drop：丢弃并计数（ERROR 及以上仍会等待，不丢错误日志）
+- block：等待队列空出位置，最多 LOG_QUEUE_BLOCK_TIMEOUT 秒，超时后丢弃
+
+日志文件按时间（LOG_ROTATE_WHEN）和大小（LOG_MAX_BYTES）轮转，
+归档为 app.log.2024-01-01、app.log.2024-01-01.1 …，保留最近 LOG_BACKUP_COUNT 个。
+
+结构化日志：消息写成 LogEvent("更新简历", resume_id=1, user_id=2)，字段在后台线程
+格式化时才拼接，被级别过滤或采样掉的日志不产生格式化开销。LOG_JSON 开启时每条日志
+输出一行 JSON（字段展开为顶层键），否则仍输出 "更新简历: resume_id=1, user_id=2"。
+每条日志带上当前请求的关联 ID（见 app.core.request_context）。
+
+采样：LOG_SAMPLE_RATE < 1 时按比例保留 INFO 及以下的日志，同一请求的日志整体保留或
+整体丢弃；WARNING 及以上和带异常信息（exc_info）的日志始终保留。
+"""
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
+import random
 import sys
-from pathlib import Path
+import threading
+import time
+import zlib
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from app.core.config import get_settings
+from app.core.request_context import request_id_var
+
+settings = get_settings()
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(request_id)s - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+QUEUE_POLICIES = ("drop", "block")
+
+
+class LogEvent:
+    """带字段的日志消息，写出时才格式化"""
+
+    __slots__ = ("message", "fields")
+
+    def __init__(self, message: str, **fields: Any):
+        self.message = message
+        self.fields = fields
+
+    def __str__(self) -> str:
+        if not self.fields:
+            return self.message
+        return f"{self.message}: " + ", ".join(f"{key}={value}" for key, value in self.fields.items())
+
+
+class TextFormatter(logging.Formatter):
+    """文本日志，没有关联 ID 时显示 -"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        request_id = getattr(record, "request_id", None)
+        record.request_id = request_id or "-"
+        try:
+            return super().format(record)
+        finally:
+            record.request_id = request_id
+
+
+class JsonFormatter(logging.Formatter):
+    """每条日志输出一行 JSON，LogEvent 的字段展开为顶层键（不覆盖 time、level 等固定键）"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.msg
+        if isinstance(message, LogEvent):
+            text, fields = message.message, message.fields
+        else:
+            text, fields = record.getMessage(), {}
+        document = {
+            "time": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": text,
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in fields.items():
+            document.setdefault(key, value)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            document["exc_info"] = record.exc_text
+        return json.dumps(document, ensure_ascii=False, default=str)
+
+
+class LogSampler(logging.Filter):
+    """按比例保留 INFO 及以下的日志，警告、错误和带异常信息的日志始终保留"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+        self.threshold = int(rate * 2 ** 32)
+        self.sampled_out = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1 or record.levelno >= logging.WARNING or record.exc_info:
+            return True
+        # 同一请求按关联 ID 决定，保证一次请求的日志完整
+        request_id = request_id_var.get()
+        if request_id is not None:
+            keep = zlib.crc32(request_id.encode("utf-8")) < self.threshold
+        else:
+            keep = random.random() < self.rate
+        if not keep:
+            with self._lock:
+                self.sampled_out += 1
+        return keep
+
+
+class RotatingLogFileHandler(TimedRotatingFileHandler):
+    """按时间和大小轮转的日志文件
+
+    到达轮转时刻或文件将超过 max_bytes 时归档；同一周期内因大小多次轮转时，
+    归档文件名追加序号，不会覆盖之前的归档。
+    """
+
+    def __init__(self, filename: Union[str, Path], when: str, max_bytes: int, backup_count: int):
+        super().__init__(filename, when=when, backupCount=backup_count, encoding="utf-8", delay=True)
+        self.max_bytes = max_bytes
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        size = self.stream.seek(0, os.SEEK_END)
+        return size > 0 and size + len(self.format(record).encode("utf-8")) + 1 > self.max_bytes
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        # 归档名取当前周期的起始时间
+        period_start = self.rolloverAt - self.interval
+        period = time.gmtime(period_start) if self.utc else time.localtime(period_start)
+        archive = f"{self.baseFilename}.{time.strftime(self.suffix, period)}"
+        name, serial = archive, 0
+        while os.path.exists(name):
+            serial += 1
+            name = f"{archive}.{serial}"
+        if os.path.exists(self.baseFilename):
+            os.rename(self.baseFilename, name)
+        self._remove_old_archives()
+
+        now = int(time.time())
+        if now >= self.rolloverAt:
+            rollover_at = self.computeRollover(now)
+            while rollover_at <= now:
+                rollover_at += self.interval
+            self.rolloverAt = rollover_at
+        self.stream = self._open()
+
+    def _remove_old_archives(self) -> None:
+        """只保留最近 backupCount 个归档（按修改时间）"""
+        if self.backupCount <= 0:
+            return
+        directory, base = os.path.split(self.baseFilename)
+        archives = [
+            os.path.join(directory, name)
+            for name in os.listdir(directory)
+            if name.startswith(base + ".")
+        ]
+        archives.sort(key=os.path.getmtime)
+        for path in archives[:-self.backupCount]:
+            os.remove(path)
 
 
-def setup_logging(env: str = "production"):
+class LogQueueHandler(QueueHandler):
+    """把日志记录放进有界队列，队列满时按策略丢弃或等待
+
+    后台线程未运行（启动前、关闭后）时在当前线程直接写出，不会积压在队列里。
+    """
+
+    # 请求线程中只提取异常堆栈，消息格式化留给后台线程
+    _exc_formatter = logging.Formatter()
+
+    def __init__(self, log_queue: "queue.Queue", policy: str, block_timeout: float):
+        super().__init__(log_queue)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.listener: Optional[QueueListener] = None
+        self.running = False
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """在请求线程中记下关联 ID，固定消息参数和异常堆栈"""
+        record = copy.copy(record)
+        record.request_id = request_id_var.get()
+        if not isinstance(record.msg, LogEvent):
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if not self.running:
+            if self.listener is not None:
+                self.listener.handle(record)
+            return
+        try:
+            if self.policy == "block" or record.levelno >= logging.ERROR:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class _LogListener(QueueListener):
+    """队列满时等待放入结束标记，保证关闭前写完队列中的记录"""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class LogPipeline:
+    """根日志记录器 -> 有界队列 -> 后台写线程 -> 控制台 / 文件"""
+
+    def __init__(
+        self,
+        handlers: List[logging.Handler],
+        maxsize: int,
+        policy: str,
+        block_timeout: float,
+        sample_rate: float = 1.0,
+    ):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"未知的日志队列策略: {policy}")
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"日志采样比例应在 0 到 1 之间: {sample_rate}")
+        self.queue: "queue.Queue" = queue.Queue(maxsize)
+        self.handlers = handlers
+        self.handler = LogQueueHandler(self.queue, policy, block_timeout)
+        # 采样在放入队列之前进行，被丢弃的日志不占队列
+        self.sampler = LogSampler(sample_rate)
+        self.handler.addFilter(self.sampler)
+        self.listener = _LogListener(self.queue, *handlers, respect_handler_level=True)
+        self.handler.listener = self.listener
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """启动后台写线程（可重复调用）"""
+        with self._lock:
+            if not self.handler.running:
+                self.listener.start()
+                self.handler.running = True
+
+    def stop(self) -> None:
+        """停止后台写线程，写完队列中剩余的记录"""
+        with self._lock:
+            if self.handler.running:
+                self.handler.running = False
+                self.listener.stop()
+        for handler in self.handlers:
+            # 进程退出时控制台流可能已被关闭（与 logging.shutdown 的处理一致）
+            try:
+                handler.flush()
+            except (OSError, ValueError):
+                pass
+
+    def close(self) -> None:
+        """停止并关闭文件"""
+        self.stop()
+        for handler in self.handlers:
+            handler.close()
+
+    def stats(self) -> Dict[str, Union[int, float, str, bool]]:
+        """队列积压、丢弃与采样计数"""
+        return {
+            "running": self.handler.running,
+            "policy": self.handler.policy,
+            "queued": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+            "dropped": self.handler.dropped,
+            "sample_rate": self.sampler.rate,
+            "sampled_out": self.sampler.sampled_out,
+        }
+
+
+log_pipeline: Optional[LogPipeline] = None
+
+
+def setup_logging(env: str = "production", log_dir: Optional[Union[str, Path]] = None) -> LogPipeline:
     """配置日志系统
 
     Args:
         env: 环境类型 ("development" 或 "production")
+        log_dir: 日志目录，默认为 LOG_DIR
     """
-    # 创建 logs 目录
-    log_dir = Path(__file__).parent.parent.parent / "logs"
-    log_dir.mkdir(exist_ok=True)
+    global log_pipeline
 
-    # 日志格式
-    log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    date_format = "%Y-%m-%d %H:%M:%S"
+    log_dir = Path(log_dir or settings.LOG_DIR)
+    log_dir.mkdir(parents=True, exist_ok=True)
 
     # 根据环境设置日志级别
     log_level = logging.DEBUG if env == "development" else logging.INFO
+    if settings.LOG_JSON:
+        formatter: logging.Formatter = JsonFormatter()
+    else:
+        formatter = TextFormatter(LOG_FORMAT, datefmt=DATE_FORMAT)
 
-    # 配置根日志记录器
-    root_logger = logging.getLogger()
-    root_logger.setLevel(log_level)
-
-    # 清除已有的 handlers
-    root_logger.handlers.clear()
-
-    # 创建格式化器
-    formatter = logging.Formatter(log_format, datefmt=date_format)
-
-    # 1. 控制台输出（带颜色）
+    # 1. 控制台输出
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
-
-    # 2. 文件输出（按日期）
-    today = datetime.now().strftime("%Y%m%d")
-    file_handler = logging.FileHandler(
-        log_dir / f"app_{today}.log",
-        encoding="utf-8"
+
+    # 2. 文件输出（按时间和大小轮转）
+    file_handler = RotatingLogFileHandler(
+        log_dir / "app.log", settings.LOG_ROTATE_WHEN, settings.LOG_MAX_BYTES, settings.LOG_BACKUP_COUNT
     )
     file_handler.setLevel(log_level)
-    file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
 
     # 3. 错误日志单独文件
-    error_handler = logging.FileHandler(
-        log_dir / f"error_{today}.log",
-        encoding="utf-8"
+    error_handler = RotatingLogFileHandler(
+        log_dir / "error.log", settings.LOG_ROTATE_WHEN, settings.LOG_MAX_BYTES, settings.LOG_BACKUP_COUNT
     )
     error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(formatter)
-    root_logger.addHandler(error_handler)
+
+    handlers: List[logging.Handler] = [console_handler, file_handler, error_handler]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # 重复调用时先写完并关闭之前的管道
+    if log_pipeline is not None:
+        log_pipeline.close()
+        atexit.unregister(log_pipeline.stop)
+    log_pipeline = LogPipeline(
+        handlers,
+        maxsize=settings.LOG_QUEUE_SIZE,
+        policy=settings.LOG_QUEUE_POLICY,
+        block_timeout=settings.LOG_QUEUE_BLOCK_TIMEOUT,
+        sample_rate=settings.LOG_SAMPLE_RATE,
+    )
+    # 后台线程是守护线程，进程退出前写完队列
+    atexit.register(log_pipeline.stop)
+
+    # 配置根日志记录器：只挂队列处理器
+    root_logger = logging.getLogger()
+    root_logger.setLevel(log_level)
+    root_logger.handlers.clear()
+    root_logger.addHandler(log_pipeline.handler)
+    log_pipeline.start()
 
     # 配置第三方库日志级别
     logging.getLogger("uvicorn").setLevel(logging.INFO)
@@ -64,7 +366,14 @@ def setup_logging(env: str = "production"):
     logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
     logging.getLogger("fastapi").setLevel(logging.INFO)
 
-    root_logger.info(f"日志系统初始化完成 - 环境: {env}, 级别: {logging.getLevelName(log_level)}")
+    root_logger.info(LogEvent(
+        "日志系统初始化完成",
+        env=env,
+        log_level=logging.getLevelName(log_level),
+        json=settings.LOG_JSON,
+        sample_rate=settings.LOG_SAMPLE_RATE,
+    ))
+    return log_pipeline
 
 
 def get_logger(name: str) -> logging.Logger:
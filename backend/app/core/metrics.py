@@ -0,0 +1,241 @@
+"""Prometheus 指标
+
+GET /metrics 输出 Prometheus 文本格式，记录：
+- 各路由的请求数、延迟直方图、进行中的请求数和响应大小（路由取路径模板，
+  如 /api/resumes/{resume_id}，避免按 id 产生大量标签）
+- get_db 取得数据库连接的耗时，每个请求的 SQL 条数和总耗时
+- bcrypt 哈希 / 校验耗时
+- 各组件的运行状态（哈希工作池、PDF 渲染、自动保存、日志队列、缓存），抓取时读取
+  其 stats() 输出为 gauge，如 password_hasher_pending、user_cache_hits
+
+多个 uvicorn worker 进程时，启动前设置环境变量 PROMETHEUS_MULTIPROC_DIR 指向一个
+空目录：各进程把指标写入该目录下的 mmap 文件，/metrics 读取时汇总所有进程，
+无论请求落在哪个 worker 上结果都一致。
+"""
+import os
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Pattern, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from prometheus_client.core import GaugeMetricFamily
+from starlette.routing import Mount, WebSocketRoute, compile_path
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+# 未匹配任何路由的请求（404）合并为一个标签
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP 请求数",
+    ["method", "route", "status"],
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP 请求耗时（秒）",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "进行中的 HTTP 请求数",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "HTTP 响应体大小（字节）",
+    ["method", "route"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216),
+)
+DB_CHECKOUT = Histogram(
+    "db_session_checkout_seconds",
+    "get_db 取得数据库连接的耗时（秒）",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0),
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "每个请求执行的 SQL 条数",
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "每个请求的 SQL 执行总耗时（秒）",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+PASSWORD_HASH = Histogram(
+    "password_hash_seconds",
+    "bcrypt 计算耗时（秒，不含排队）",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+)
+
+
+def _numeric_items(stats: Mapping[str, Any], prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """展开嵌套的 stats 字典，布尔值记为 0/1，非数值（如策略名）跳过"""
+    for key, value in stats.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, Mapping):
+            yield from _numeric_items(value, f"{name}_")
+        elif isinstance(value, (bool, int, float)):
+            yield name, float(value)
+
+
+class ComponentStatsCollector:
+    """抓取时读取已登记组件的 stats()，每个数值字段输出为一个 gauge
+
+    多进程模式下只反映处理本次 /metrics 请求的 worker。
+    """
+
+    def __init__(self):
+        self._sources: Dict[str, Tuple[str, Callable[[], Mapping[str, Any]]]] = {}
+
+    def register(self, component: str, description: str, stats: Callable[[], Mapping[str, Any]]) -> None:
+        self._sources[component] = (description, stats)
+
+    def collect(self):
+        for component, (description, stats) in list(self._sources.items()):
+            for key, value in _numeric_items(stats()):
+                yield GaugeMetricFamily(f"{component}_{key}", f"{description}：{key}", value=value)
+
+
+component_stats = ComponentStatsCollector()
+REGISTRY.register(component_stats)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """生成 /metrics 响应体和类型，多进程模式下汇总各 worker 的指标"""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(component_stats)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """worker 退出时清理其进行中请求数（多进程模式下）"""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class _RouteMetrics:
+    """某个 (方法, 路由) 的指标子项，避免每次请求查找标签"""
+
+    __slots__ = ("method", "route", "duration", "in_progress", "response_size", "requests")
+
+    def __init__(self, method: str, route: str):
+        self.method = method
+        self.route = route
+        self.duration = REQUEST_DURATION.labels(method, route)
+        self.in_progress = REQUESTS_IN_PROGRESS.labels(method, route)
+        self.response_size = RESPONSE_SIZE.labels(method, route)
+        self.requests: Dict[int, Counter] = {}
+
+    def count(self, status: int) -> None:
+        counter = self.requests.get(status)
+        if counter is None:
+            counter = self.requests[status] = REQUESTS.labels(self.method, self.route, str(status))
+        counter.inc()
+
+
+def _route_templates(routes, prefix: str = "") -> Iterator[Tuple[str, Pattern, Optional[set]]]:
+    """展开路由表为 (完整路径模板, 路径正则, 方法集合)
+
+    include_router 加入的路由在新版 FastAPI 中保留为嵌套路由对象（不带 path，
+    通过 original_router / include_context 指向原路由表），按其 include 前缀展开；
+    其他不带 path 的路由对象跳过。
+    """
+    for route in routes:
+        path = getattr(route, "path", None)
+        if path is None:
+            included = getattr(route, "original_router", None)
+            context = getattr(route, "include_context", None)
+            if included is not None and context is not None:
+                yield from _route_templates(included.routes, prefix + context.prefix)
+            continue
+        if isinstance(route, WebSocketRoute):
+            continue
+        template = prefix + path
+        if isinstance(route, Mount):
+            regex, _, _ = compile_path(template + "/{path:path}")
+        else:
+            regex, _, _ = compile_path(template)
+        yield template, regex, getattr(route, "methods", None)
+
+
+class MetricsMiddleware:
+    """记录每个 HTTP 请求的耗时、状态码和响应大小
+
+    路由在进入应用前按路径模板解析（结果按方法和路径缓存），这样进行中的请求数
+    也能按路由统计。
+    """
+
+    def __init__(self, app, router=None):
+        self.app = app
+        self.router = router
+        self._metrics: Dict[Tuple[str, str], _RouteMetrics] = {}
+        self._templates: Optional[List[Tuple[str, Pattern, Optional[set]]]] = None
+        self._resolve = lru_cache(maxsize=4096)(self._match_route)
+
+    def _match_route(self, method: str, path: str) -> str:
+        """请求对应的路径模板，方法不匹配时取路径相同的路由
+
+        路由表在首次解析时展开（此时所有路由均已注册），之后按正则逐个匹配。
+        """
+        if self._templates is None:
+            self._templates = list(_route_templates(self.router.routes if self.router is not None else ()))
+        partial = None
+        for template, regex, methods in self._templates:
+            if regex.match(path) is None:
+                continue
+            if not methods or method in methods:
+                return template
+            if partial is None:
+                partial = template
+        return partial or UNMATCHED_ROUTE
+
+    def _route_metrics(self, method: str, route: str) -> _RouteMetrics:
+        key = (method, route)
+        metrics = self._metrics.get(key)
+        if metrics is None:
+            metrics = self._metrics[key] = _RouteMetrics(method, route)
+        return metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        metrics = self._route_metrics(method, self._resolve(method, scope["path"]))
+        status_code = 500
+        size = 0
+
+        async def send_with_metrics(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        metrics.in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            metrics.duration.observe(time.perf_counter() - started)
+            metrics.in_progress.dec()
+            metrics.response_size.observe(size)
+            metrics.count(status_code)
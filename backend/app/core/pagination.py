@@ -0,0 +1,21 @@
+"""游标分页工具"""
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+def encode_cursor(updated_at: datetime, resume_id: int) -> str:
+    """把 (updated_at, id) 编码为不透明游标"""
+    raw = f"{updated_at.isoformat()}|{resume_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """解码游标，格式不合法时返回 None"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        updated_at, resume_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(updated_at), int(resume_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
@@ -0,0 +1,183 @@
+"""采样分析器
+
+后台线程每隔固定间隔读取一次 sys._current_frames()，把各线程的调用栈折叠为
+"线程;模块:函数;模块:函数" 并计数，输出 collapsed stacks 格式（每行"栈 次数"），
+可直接交给 flamegraph.pl、speedscope 等工具生成火焰图。
+
+两种用法（均需 PROFILER_ENABLED 开启且为管理员）：
+- POST /api/admin/profile?seconds=N：采样整个进程 N 秒
+- 请求带 X-Profile 头：采样该请求处理期间的进程，响应头 X-Profile-Id 给出结果编号，
+  之后用 GET /api/admin/profile/requests/{id} 取回
+
+未开启时不注册中间件、不启动线程，对请求没有任何开销。同一时间只运行一个采样器。
+"""
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from types import CodeType, FrameType
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.request_context import request_id_var
+from app.core.security import decode_access_token, is_admin
+
+settings = get_settings()
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+# 单个调用栈的最大深度（超出部分从根部截断）
+MAX_STACK_DEPTH = 128
+
+
+class ProfilerBusy(Exception):
+    """已有采样在进行"""
+
+
+class StackSampler:
+    """在后台线程中定时采样所有线程的调用栈"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._labels: Dict[CodeType, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self.started = 0.0
+        self.duration = 0.0
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+
+    def _label(self, frame: FrameType) -> str:
+        code = frame.f_code
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{frame.f_globals.get('__name__', '?')}:{code.co_name}"
+        return label
+
+    def sample(self) -> None:
+        """记录一次所有线程（采样线程自身除外）的调用栈"""
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack: List[str] = []
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                stack.append(self._label(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def collapsed(self) -> str:
+        """collapsed stacks 格式，按次数从多到少"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self, limit: int = 50) -> Dict[str, object]:
+        """采样概况与最常见的调用栈"""
+        return {
+            "samples": self.samples,
+            "interval_ms": self.interval * 1000,
+            "duration_ms": round(self.duration * 1000, 1),
+            "stacks": [{"stack": stack, "count": count} for stack, count in self.stacks.most_common(limit)],
+        }
+
+
+class Profiler:
+    """保证同一时间只有一个采样器，并保留最近的单请求采样结果"""
+
+    def __init__(self, keep_results: int):
+        self.keep_results = keep_results
+        self._lock = threading.Lock()
+        # 结果读写与采样互斥锁分开，采样进行中也能取回之前的结果
+        self._results_lock = threading.Lock()
+        self._results: "OrderedDict[str, str]" = OrderedDict()
+
+    def start(self, interval: float) -> StackSampler:
+        """启动采样器，已有采样在进行时抛出 ProfilerBusy"""
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy()
+        sampler = StackSampler(interval)
+        sampler.start()
+        return sampler
+
+    def stop(self, sampler: StackSampler) -> None:
+        sampler.stop()
+        self._lock.release()
+
+    def save_result(self, profile_id: str, collapsed: str) -> None:
+        with self._results_lock:
+            self._results[profile_id] = collapsed
+            while len(self._results) > self.keep_results:
+                self._results.popitem(last=False)
+
+    def get_result(self, profile_id: str) -> Optional[str]:
+        with self._results_lock:
+            return self._results.get(profile_id)
+
+
+profiler = Profiler(keep_results=settings.PROFILER_KEEP_RESULTS)
+
+
+def _bearer_email(headers: List[Tuple[bytes, bytes]]) -> Optional[str]:
+    for name, value in headers:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return None
+            payload = decode_access_token(token.strip())
+            return payload.get("email") if payload else None
+    return None
+
+
+class ProfilerMiddleware:
+    """带 X-Profile 头的管理员请求在处理期间采样，结果按请求关联 ID 保存
+
+    只在 PROFILER_ENABLED 开启时注册；不带该请求头的请求只多一次请求头查找。
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._header = PROFILE_HEADER.lower().encode("latin-1")
+        self._id_header = PROFILE_ID_HEADER.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not any(name == self._header for name, _ in scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+        if not is_admin(_bearer_email(scope["headers"])):
+            await self.app(scope, receive, send)
+            return
+        try:
+            sampler = profiler.start(settings.PROFILER_REQUEST_INTERVAL_MS / 1000)
+        except ProfilerBusy:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = request_id_var.get() or f"{time.time_ns():x}"
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((self._id_header, profile_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop(sampler)
+            profiler.save_result(profile_id, sampler.collapsed())
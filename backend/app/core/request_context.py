@@ -0,0 +1,66 @@
+"""请求关联 ID
+
+每个请求分配一个关联 ID（优先沿用客户端或网关传入的 X-Request-ID），保存在
+contextvars 中：同一请求在事件循环和线程池（run_in_threadpool 会复制上下文）里
+记录的日志都带上这个 ID，并在响应头中返回，便于按请求串联日志。
+"""
+import re
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# 当前请求的关联 ID，请求之外（后台线程、启动阶段）为 None
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# 只接受长度有限的安全字符，避免把任意内容写进日志和响应头
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,64}")
+
+
+def get_request_id() -> Optional[str]:
+    """当前请求的关联 ID"""
+    return request_id_var.get()
+
+
+def new_request_id(incoming: Optional[str] = None) -> str:
+    """沿用合法的传入 ID，否则生成新的"""
+    if incoming and _VALID_REQUEST_ID.fullmatch(incoming):
+        return incoming
+    return uuid.uuid4().hex
+
+
+class RequestIdMiddleware:
+    """为每个 HTTP 请求设置关联 ID，并写入响应头
+
+    直接实现 ASGI 接口，不经过 BaseHTTPMiddleware 的额外任务和流包装。
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._header = REQUEST_ID_HEADER.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = None
+        for name, value in scope["headers"]:
+            if name == self._header:
+                incoming = value.decode("latin-1")
+                break
+        request_id = new_request_id(incoming)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((self._header, request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
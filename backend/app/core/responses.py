@@ -0,0 +1,101 @@
+"""统一响应格式的快速序列化
+
+路由返回 APIResponse 时，FastAPI 会先用 jsonable_encoder 逐层转换、再用标准库
+json 编码。这里直接把 {success, data, error} 编码为字节，安装了 orjson 时优先使用。
+
+数据库中的简历 content 本身就是 JSON 字符串，用 raw_json() 包装后原样拼接进
+响应，不再 json.loads 再重新编码（校验只在写入时进行）。
+"""
+import json
+import re
+import secrets
+from datetime import date, datetime
+from typing import Any, List, Mapping, Optional, Union
+
+from fastapi import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 为可选依赖
+    orjson = None
+
+
+# 支持 orjson.Fragment 时由 orjson 直接拼接，否则使用占位符替换
+_FRAGMENT = getattr(orjson, "Fragment", None) if orjson is not None else None
+
+
+class RawJSON:
+    """已编码的 JSON 片段，序列化时原样写入"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Union[str, bytes]):
+        self.value = value.encode("utf-8") if isinstance(value, str) else value
+
+
+def raw_json(value: Union[str, bytes]) -> Any:
+    """包装已编码的 JSON，调用方需保证其合法"""
+    if orjson is not None and _FRAGMENT is not None:
+        return _FRAGMENT(value)
+    return RawJSON(value)
+
+
+def _default(obj: Any) -> Any:
+    """处理 JSON 原生不支持的类型"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """序列化为紧凑的 UTF-8 JSON 字节"""
+    fragments: List[bytes] = []
+    nonce = ""
+
+    def default(value: Any) -> Any:
+        nonlocal nonce
+        if isinstance(value, RawJSON):
+            # 先输出带随机标记的字符串占位，编码完成后整体替换为原始片段
+            if not nonce:
+                nonce = secrets.token_hex(8)
+            fragments.append(value.value)
+            return f"\x00{nonce}:{len(fragments) - 1}\x00"
+        return _default(value)
+
+    if orjson is not None:
+        body = orjson.dumps(obj, default=default)
+    else:
+        body = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=default).encode("utf-8")
+
+    if not fragments:
+        return body
+    pattern = re.compile(rb'"\\u0000' + nonce.encode() + rb':(\d+)\\u0000"')
+    return pattern.sub(lambda match: fragments[int(match.group(1))], body)
+
+
+class EnvelopeResponse(Response):
+    """直接输出 JSON 字节的响应类"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def envelope(
+    data: Any = None,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> EnvelopeResponse:
+    """构造成功响应 {success: true, data, error: null}
+
+    直接返回 Response 时路由装饰器上的 status_code 不生效，需要在这里传入。
+    """
+    return EnvelopeResponse(
+        {"success": True, "data": data, "error": None},
+        status_code=status_code,
+        headers=headers,
+    )
@@ -1,24 +1,76 @@
 """安全相关工具（密码哈希、JWT）"""
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Optional, Tuple, TypeVar
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import get_settings
+from app.core.hashing import PasswordHasher, default_workers
+from app.core.metrics import PASSWORD_HASH
 
 settings = get_settings()
 
+T = TypeVar("T")
+
 # 密码哈希上下文
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min/max rounds 与默认强度一致：强度调整后，旧哈希在登录时被判定为需要更新
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# 密码哈希工作池
+password_hasher = PasswordHasher(
+    max_workers=settings.HASH_POOL_WORKERS or default_workers(),
+    max_queue=settings.HASH_POOL_MAX_QUEUE,
+)
+
+
+def _timed(operation: str, fn: Callable[..., T]) -> Callable[..., T]:
+    """在工作线程中记录 bcrypt 计算耗时（不含排队）"""
+    histogram = PASSWORD_HASH.labels(operation)
+
+    def run(*args: Any) -> T:
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            histogram.observe(time.perf_counter() - started)
+
+    return run
+
+
+_verify = _timed("verify", pwd_context.verify)
+_verify_and_update = _timed("verify", pwd_context.verify_and_update)
+_hash = _timed("hash", pwd_context.hash)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """验证密码"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.run(_verify, plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """验证密码，哈希强度与当前配置不一致时同时返回新哈希"""
+    return password_hasher.run(_verify_and_update, plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """获取密码哈希"""
-    return pwd_context.hash(password)
+    return password_hasher.run(_hash, password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """verify_and_update_password 的异步版本"""
+    return await password_hasher.run_async(_verify_and_update, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash 的异步版本"""
+    return await password_hasher.run_async(_hash, password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -34,6 +86,22 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def create_user_access_token(user) -> str:
+    """为用户签发 Token（携带邮箱、姓名声明，供只读接口免查用户表）"""
+    return create_access_token(
+        data={"sub": str(user.id), "email": user.email, "name": user.full_name},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+
+
+def is_admin(email: Optional[str]) -> bool:
+    """邮箱是否在 ADMIN_EMAILS 中"""
+    if not email:
+        return False
+    admins = {item.strip().lower() for item in settings.ADMIN_EMAILS.split(",")}
+    return email.lower() in admins - {""}
+
+
 def decode_access_token(token: str) -> Optional[dict]:
     """解码 JWT Token"""
     try:
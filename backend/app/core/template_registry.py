@@ -0,0 +1,153 @@
+"""模板注册表
+
+模板以 JSON 清单的形式放在 TEMPLATES_DIR 目录中（每个文件一个模板），
+启动时加载为按 id 索引的字典。后台线程定期检查目录变化，变化后整体重新加载，
+加载成功才替换当前快照（原子切换），预编码的响应随快照一起重建。
+"""
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.http_cache import EncodedResponse, encode_envelope
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# 清单中仅用于排序、不返回给客户端的字段
+INTERNAL_FIELDS = ("order",)
+
+
+class TemplateSnapshot:
+    """某一时刻的模板集合及其预编码响应（创建后只读）"""
+
+    def __init__(self, manifests: List[Tuple[dict, str]]):
+        manifests = sorted(manifests, key=lambda item: (item[0].get("order", 0), item[0]["id"]))
+        templates = [
+            {key: value for key, value in manifest.items() if key not in INTERNAL_FIELDS}
+            for manifest, _ in manifests
+        ]
+        self.templates: List[dict] = templates
+        self.by_id: Dict[str, dict] = {template["id"]: template for template in templates}
+        # 模板版本：清单内容的哈希，内容不变则版本不变
+        self.versions: Dict[str, str] = {manifest["id"]: version for manifest, version in manifests}
+
+        self.full = encode_envelope(templates)
+        self.slim = encode_envelope([
+            {key: value for key, value in template.items() if key != "defaultContent"}
+            for template in templates
+        ])
+        self.items: Dict[str, EncodedResponse] = {
+            template["id"]: encode_envelope(template) for template in templates
+        }
+
+
+class TemplateRegistry:
+    """从目录加载模板清单，支持热重载"""
+
+    def __init__(self, directory: Path, reload_interval: float = 0):
+        self.directory = Path(directory)
+        self.reload_interval = reload_interval
+        self._snapshot: Optional[TemplateSnapshot] = None
+        self._signature: Tuple = ()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    @property
+    def snapshot(self) -> TemplateSnapshot:
+        """当前模板快照（首次访问时加载）"""
+        if self._snapshot is None:
+            self.reload()
+        return self._snapshot
+
+    def get(self, template_id: str) -> Optional[dict]:
+        """按 id 获取模板"""
+        return self.snapshot.by_id.get(template_id)
+
+    def version(self, template_id: str) -> Optional[str]:
+        """模板版本（清单内容哈希）"""
+        return self.snapshot.versions.get(template_id)
+
+    def all(self) -> List[dict]:
+        """全部模板（按 order 排序）"""
+        return self.snapshot.templates
+
+    def _directory_signature(self) -> Tuple:
+        return tuple(
+            (path.name, stat.st_mtime_ns, stat.st_size)
+            for path, stat in ((p, p.stat()) for p in sorted(self.directory.glob("*.json")))
+        )
+
+    def _load(self) -> TemplateSnapshot:
+        manifests = []
+        seen = set()
+        for path in sorted(self.directory.glob("*.json")):
+            raw = path.read_bytes()
+            manifest = json.loads(raw)
+            template_id = manifest.get("id")
+            if not template_id:
+                raise ValueError(f"模板清单缺少 id: {path.name}")
+            if template_id in seen:
+                raise ValueError(f"模板 id 重复: {template_id}")
+            seen.add(template_id)
+            manifests.append((manifest, hashlib.sha256(raw).hexdigest()[:16]))
+        return TemplateSnapshot(manifests)
+
+    def reload(self) -> bool:
+        """重新加载模板目录，失败时保留当前快照
+
+        Returns:
+            bool: 是否加载成功
+        """
+        with self._lock:
+            signature = self._directory_signature()
+            try:
+                snapshot = self._load()
+            except (OSError, ValueError) as e:
+                if self._snapshot is None:
+                    raise
+                # 记录失败时的目录状态，目录再次变化后才重试
+                self._signature = signature
+                logger.error(f"模板重新加载失败，继续使用旧版本: {e}")
+                return False
+            self._snapshot = snapshot
+            self._signature = signature
+        logger.info(f"模板已加载: count={len(snapshot.templates)}, dir={self.directory}")
+        return True
+
+    def reload_if_changed(self) -> bool:
+        """目录有变化时重新加载"""
+        try:
+            changed = self._directory_signature() != self._signature
+        except OSError:
+            return False
+        return changed and self.reload()
+
+    def start_watching(self) -> None:
+        """启动后台线程轮询目录变化"""
+        if self.reload_interval <= 0 or self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="template-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """停止后台轮询"""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.reload_interval):
+            self.reload_if_changed()
+
+
+template_registry = TemplateRegistry(
+    Path(settings.TEMPLATES_DIR),
+    reload_interval=settings.TEMPLATE_RELOAD_INTERVAL,
+)
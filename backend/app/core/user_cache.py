@@ -0,0 +1,115 @@
+"""已认证用户缓存
+
+get_current_user 每次请求都要按 JWT 中的用户 ID 查一次数据库。这里按令牌缓存
+用户快照（TTL + LRU，容量有上限），用户被更新或删除时按用户 ID 失效。
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """用户只读快照（路由只读取这些字段）"""
+
+    id: int
+    email: str
+    full_name: str
+    created_at: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user: Any) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            created_at=user.created_at,
+        )
+
+
+class UserCache:
+    """令牌 -> 用户快照的 TTL + LRU 缓存"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, UserSnapshot]]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str) -> Optional[UserSnapshot]:
+        """查找缓存，过期条目视为未命中"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._remove(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, token: str, snapshot: UserSnapshot, token_exp: Optional[float] = None) -> None:
+        """写入缓存，过期时间不晚于令牌本身的 exp"""
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0:
+            return
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (time.monotonic() + ttl, snapshot)
+            self._tokens_by_user.setdefault(snapshot.id, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        """移除某个用户的全部缓存条目"""
+        with self._lock:
+            for token in self._tokens_by_user.pop(user_id, set()):
+                self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """命中/未命中计数"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, token: str) -> None:
+        _, snapshot = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(snapshot.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[snapshot.id]
+
+
+user_cache = UserCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
@@ -0,0 +1,51 @@
+"""异步数据库会话
+
+仅在 DB_ASYNC 开启时导入，需要安装对应的异步驱动
+（SQLite 使用 aiosqlite，PostgreSQL 使用 asyncpg）。
+"""
+import time
+from typing import AsyncGenerator
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.config import get_settings
+from app.core.metrics import DB_CHECKOUT
+from app.db.base import configure_engine, engine_options
+
+settings = get_settings()
+
+# 同步驱动前缀 -> 异步驱动前缀
+ASYNC_DRIVERS = {
+    "sqlite://": "sqlite+aiosqlite://",
+    "postgresql://": "postgresql+asyncpg://",
+    "postgres://": "postgresql+asyncpg://",
+}
+
+
+def to_async_url(url: str) -> str:
+    """把同步连接串转换为异步驱动连接串"""
+    for prefix, async_prefix in ASYNC_DRIVERS.items():
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL)
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL))
+# PRAGMA 钩子注册在底层同步引擎上
+configure_engine(async_engine.sync_engine, ASYNC_DATABASE_URL)
+
+# 提交后不过期对象，避免在异步上下文中触发隐式懒加载
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """获取异步数据库会话（立即取得连接并记录耗时）"""
+    async with AsyncSessionLocal() as db:
+        started = time.perf_counter()
+        await db.connection()
+        DB_CHECKOUT.observe(time.perf_counter() - started)
+        yield db
@@ -1,14 +1,105 @@
 """SQLAlchemy Base"""
-from sqlalchemy import create_engine
+from typing import Any, Dict
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import NullPool
 from sqlalchemy.ext.declarative import declarative_base
 from app.core.config import get_settings
+from app.db.query_stats import instrument_engine
 
 settings = get_settings()
 
+# SQLite PRAGMA 配置档，按顺序在每个新连接上执行
+SQLITE_PRAGMA_PROFILES: Dict[str, Dict[str, Any]] = {
+    # SQLite 默认行为（回滚日志）
+    "default": {},
+    # WAL 日志：读写互不阻塞，写入只需顺序追加
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+    },
+    # 生产环境：WAL + 更大的页缓存和内存映射
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -64000,  # 负数表示 KiB，约 64 MB
+        "mmap_size": 268435456,  # 256 MB
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def is_sqlite(url: str) -> bool:
+    """是否为 SQLite 连接串"""
+    return url.startswith("sqlite")
+
+
+def build_sqlite_pragmas(profile: str, overrides: str = "") -> Dict[str, Any]:
+    """合并配置档与逐项覆盖，得到最终要执行的 PRAGMA"""
+    if profile not in SQLITE_PRAGMA_PROFILES:
+        raise ValueError(f"未知的 SQLite PRAGMA 配置档: {profile}")
+    pragmas = dict(SQLITE_PRAGMA_PROFILES[profile])
+    for item in filter(None, (part.strip() for part in overrides.split(","))):
+        name, _, value = item.partition("=")
+        pragmas[name.strip()] = value.strip()
+    return pragmas
+
+
+def install_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]) -> None:
+    """在引擎的每个新连接上执行 PRAGMA"""
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def default_pool_class(url: str) -> type:
+    """驱动默认使用的连接池类型（不导入驱动本身）"""
+    parsed = make_url(url)
+    return parsed.get_dialect().get_pool_class(parsed)
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """根据连接串生成 create_engine 参数（连接池、SQLite 线程检查）"""
+    options: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if is_sqlite(url):
+        options["connect_args"] = {"check_same_thread": False}  # SQLite 需要
+        if ":memory:" in url or url.rstrip("/").endswith("sqlite:"):
+            # 内存数据库使用单连接池，不支持连接池大小配置
+            return options
+    if default_pool_class(url) is NullPool:
+        # 不复用连接（如 SQLAlchemy 2.0.38 之前的 aiosqlite），不支持连接池大小配置
+        return options
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+
+def configure_engine(engine: Engine, url: str) -> Engine:
+    """为 SQLite 引擎安装 PRAGMA 配置档，并安装查询统计钩子"""
+    if is_sqlite(url):
+        pragmas = build_sqlite_pragmas(settings.SQLITE_PRAGMA_PROFILE, settings.SQLITE_PRAGMAS)
+        install_sqlite_pragmas(engine, pragmas)
+    return instrument_engine(engine)
+
+
 # 创建数据库引擎
-engine = create_engine(
+engine = configure_engine(
+    create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL)),
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}  # SQLite 需要
 )
 
 # 声明基类
@@ -0,0 +1,236 @@
+"""轻量级数据库迁移
+
+项目没有引入 Alembic，启动时由这里补齐 create_all 不会处理的变更
+（已存在表上的新索引、新列等），所有步骤都必须可重复执行。
+"""
+import logging
+from typing import List
+from sqlalchemy import LargeBinary, bindparam, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateColumn, CreateTable
+
+from app.db.base import Base, is_sqlite
+from app.core.content_codec import decode_content, encode_content
+from app.models.content_blob import ContentBlob, acquire_blobs, content_hash
+from app.models.revision import REVISION_SNAPSHOT, ResumeRevision
+from app.services.search import SEARCH_TABLE, index_resumes, search_supported
+
+logger = logging.getLogger(__name__)
+
+# 等待其他 worker 完成迁移的最长时间（毫秒）
+MIGRATION_LOCK_TIMEOUT_MS = 600_000
+
+
+def ensure_indexes(engine: Engine) -> None:
+    """为已存在的表补建模型中声明的索引"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def ensure_columns(engine: Engine) -> None:
+    """为已存在的表补齐模型中新增的列
+
+    新增列必须可为空或带有 server_default，否则 SQLite 无法 ADD COLUMN。
+    """
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = CreateColumn(column).compile(dialect=engine.dialect)
+            with engine.begin() as conn:
+                conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+            logger.info(f"已添加列: {table.name}.{column.name}")
+
+
+def _register_functions(conn) -> None:
+    """在 SQLite 连接上注册迁移 SQL 用到的 Python 函数"""
+    driver_connection = conn.connection.driver_connection
+    driver_connection.create_function("sha256_hex", 1, content_hash, deterministic=True)
+    driver_connection.create_function("encode_content", 1, encode_content, deterministic=True)
+    driver_connection.create_function("decode_content", 1, decode_content, deterministic=True)
+
+
+def _lock_for_migration(conn) -> None:
+    """在迁移事务开始时取得写锁，多个 worker 同时启动时依次执行
+
+    SQLite 用 BEGIN IMMEDIATE，等待时间放宽到 MIGRATION_LOCK_TIMEOUT_MS
+    （迁移大表可能超过平时的 busy_timeout）；其他数据库锁住 resumes 表。
+    """
+    if not is_sqlite(conn.engine.url.drivername):
+        conn.exec_driver_sql("LOCK TABLE resumes IN ACCESS EXCLUSIVE MODE")
+        return
+    busy_timeout = conn.exec_driver_sql("PRAGMA busy_timeout").scalar()
+    conn.exec_driver_sql(f"PRAGMA busy_timeout = {MIGRATION_LOCK_TIMEOUT_MS}")
+    try:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    finally:
+        conn.exec_driver_sql(f"PRAGMA busy_timeout = {busy_timeout}")
+
+
+def migrate_content_blobs(engine: Engine) -> None:
+    """把旧版 resumes.content 列迁移到按哈希去重的 content_blobs
+
+    SQLite 无法删除带 NOT NULL 约束的列，这里按模型重建 resumes 表：
+    先把内容写入 content_blobs，再把其余列连同 content_hash 复制到新表后替换旧表。
+    其他数据库见 _migrate_content_blobs_in_place。索引随后由 ensure_indexes 补建。
+
+    每个 worker 启动时都会执行：取得写锁后在同一事务内重新检查 content 列，
+    先拿到锁的 worker 完成迁移，其余 worker 看到已迁移的表后直接返回。
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table("resumes"):
+        return
+    if "content" not in {column["name"] for column in inspector.get_columns("resumes")}:
+        return
+
+    with engine.begin() as conn:
+        _lock_for_migration(conn)
+        existing = [column["name"] for column in inspect(conn).get_columns("resumes")]
+        if "content" not in existing:
+            return
+        Base.metadata.tables["content_blobs"].create(bind=conn, checkfirst=True)
+        if is_sqlite(engine.url.drivername):
+            _rebuild_resumes_with_blobs(conn, existing)
+        else:
+            _migrate_content_blobs_in_place(conn)
+
+
+def _rebuild_resumes_with_blobs(conn, existing: List[str]) -> None:
+    """SQLite：内容写入 content_blobs 后按模型重建 resumes 表"""
+    resumes = Base.metadata.tables["resumes"]
+    migrated = resumes.to_metadata(Base.metadata, name="resumes_migrated")
+    copied = [column.name for column in resumes.columns if column.name in existing]
+    try:
+        _register_functions(conn)
+        conn.exec_driver_sql(
+            "INSERT INTO content_blobs (hash, data, size, refcount) "
+            "SELECT sha256_hex(content), content, length(CAST(content AS BLOB)), count(*) "
+            "FROM resumes GROUP BY 1 "
+            "ON CONFLICT (hash) DO UPDATE SET refcount = refcount + excluded.refcount"
+        )
+        conn.execute(CreateTable(migrated))
+        columns = ", ".join(copied)
+        conn.exec_driver_sql(
+            f"INSERT INTO resumes_migrated ({columns}, content_hash) "
+            f"SELECT {columns}, sha256_hex(content) FROM resumes"
+        )
+        conn.exec_driver_sql("DROP TABLE resumes")
+        conn.exec_driver_sql("ALTER TABLE resumes_migrated RENAME TO resumes")
+    finally:
+        Base.metadata.remove(migrated)
+    logger.info("已将简历内容迁移到 content_blobs")
+
+
+def _migrate_content_blobs_in_place(conn, batch_size: int = 1000) -> None:
+    """支持 DROP COLUMN 的数据库（PostgreSQL）：加列回填 content_hash 后删除 content 列"""
+    conn.exec_driver_sql("ALTER TABLE resumes ADD COLUMN content_hash VARCHAR")
+    rows = conn.execute(text("SELECT id, content FROM resumes")).all()
+    session = Session(bind=conn)
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        acquire_blobs(session, [row.content for row in batch])
+        conn.execute(
+            text("UPDATE resumes SET content_hash = :hash WHERE id = :id"),
+            [{"hash": content_hash(row.content), "id": row.id} for row in batch],
+        )
+    conn.exec_driver_sql("ALTER TABLE resumes ALTER COLUMN content_hash SET NOT NULL")
+    conn.exec_driver_sql("ALTER TABLE resumes ADD FOREIGN KEY (content_hash) REFERENCES content_blobs (hash)")
+    conn.exec_driver_sql("ALTER TABLE resumes DROP COLUMN content")
+    logger.info(f"已将 {len(rows)} 份简历的内容迁移到 content_blobs")
+
+
+def compress_content_blobs(engine: Engine) -> None:
+    """压缩旧版写入的未编码内容块（TEXT 值），读取时两种格式都能识别"""
+    if not is_sqlite(engine.url.drivername):
+        _convert_content_blobs_to_binary(engine)
+        return
+    with engine.begin() as conn:
+        _register_functions(conn)
+        result = conn.execute(text("UPDATE content_blobs SET data = encode_content(data) WHERE typeof(data) = 'text'"))
+    if result.rowcount:
+        logger.info(f"已压缩 {result.rowcount} 个内容块")
+
+
+def _convert_content_blobs_to_binary(engine: Engine) -> None:
+    """PostgreSQL 旧库的 data 列为 TEXT：改为 BYTEA 并编码已有内容
+
+    SQLite 不限制列类型，旧的 TEXT 值由 compress_content_blobs 原地压缩即可。
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table("content_blobs"):
+        return
+    column = next(column for column in inspector.get_columns("content_blobs") if column["name"] == "data")
+    if isinstance(column["type"], LargeBinary):
+        return
+    with engine.begin() as conn:
+        rows = conn.execute(text("SELECT hash, data FROM content_blobs")).all()
+        conn.exec_driver_sql("ALTER TABLE content_blobs ALTER COLUMN data TYPE BYTEA USING convert_to(data, 'UTF8')")
+        if rows:
+            conn.execute(
+                ContentBlob.__table__.update()
+                .where(ContentBlob.__table__.c.hash == bindparam("b_hash"))
+                .values(data=bindparam("b_data")),
+                [{"b_hash": row.hash, "b_data": encode_content(row.data)} for row in rows],
+            )
+    logger.info(f"已将 content_blobs.data 改为二进制列并压缩 {len(rows)} 个内容块")
+
+
+def backfill_revisions(engine: Engine, batch_size: int = 1000) -> None:
+    """为还没有修订记录的简历补一条初始快照"""
+    with engine.begin() as conn:
+        rows = conn.execute(text(
+            "SELECT r.id, r.version, r.title, r.template_id, b.data "
+            "FROM resumes r JOIN content_blobs b ON b.hash = r.content_hash "
+            "WHERE NOT EXISTS (SELECT 1 FROM resume_revisions v WHERE v.resume_id = r.id)"
+        )).all()
+        for start in range(0, len(rows), batch_size):
+            conn.execute(ResumeRevision.__table__.insert(), [
+                {
+                    "resume_id": row.id,
+                    "number": 1,
+                    "version": row.version,
+                    "kind": REVISION_SNAPSHOT,
+                    "title": row.title,
+                    "template_id": row.template_id,
+                    "data": decode_content(row.data),
+                }
+                for row in rows[start:start + batch_size]
+            ])
+    if rows:
+        logger.info(f"已为 {len(rows)} 份简历补建初始修订")
+
+
+def backfill_search_index(engine: Engine, batch_size: int = 1000) -> None:
+    """为还没有进入全文索引的简历建立索引（全文索引表由 create_all 创建）"""
+    if not search_supported(engine):
+        return
+    with engine.begin() as conn:
+        rows = conn.execute(text(
+            "SELECT r.id, r.user_id, r.title, b.data FROM resumes r "
+            "JOIN content_blobs b ON b.hash = r.content_hash "
+            f"WHERE r.id NOT IN (SELECT rowid FROM {SEARCH_TABLE})"
+        )).all()
+        for start in range(0, len(rows), batch_size):
+            index_resumes(conn, [
+                (row.id, row.user_id, row.title, decode_content(row.data))
+                for row in rows[start:start + batch_size]
+            ])
+    if rows:
+        logger.info(f"已为 {len(rows)} 份简历建立全文索引")
+
+
+def run_migrations(engine: Engine) -> None:
+    """执行全部迁移步骤"""
+    migrate_content_blobs(engine)
+    compress_content_blobs(engine)
+    ensure_columns(engine)
+    ensure_indexes(engine)
+    backfill_revisions(engine)
+    backfill_search_index(engine)
+    logger.info("数据库迁移检查完成")
@@ -0,0 +1,149 @@
+"""SQL 查询统计
+
+引擎上的 before/after_cursor_execute 钩子为每条 SQL 计时：
+- 累加到当前请求的 QueryStats（contextvars，线程池中执行的同步路由同样可见）
+- 超过 DB_SLOW_QUERY_MS 的查询记录警告，参数只输出类型，不输出值
+- 请求结束时，同一条语句执行次数达到 DB_N_PLUS_ONE_THRESHOLD 的记为疑似 N+1
+
+测试中用 track_queries(global_scope=True) 统计所有线程的查询
+（TestClient 在另一个线程里运行应用），见 tests/conftest.py 的 query_budget。
+"""
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import get_settings
+from app.core.logging import LogEvent, get_logger
+from app.core.metrics import DB_QUERIES_PER_REQUEST, DB_TIME_PER_REQUEST
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+# 慢查询日志中语句的最大长度
+MAX_STATEMENT_LENGTH = 1000
+
+
+class QueryStats:
+    """一段范围内（一个请求或一个测试）执行的查询"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.duration += seconds
+            self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """执行次数达到 threshold 的语句（疑似 N+1）"""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+
+# 当前请求的统计，请求之外为 None
+query_stats_var: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+# 不区分线程和请求的统计（测试用）
+_global_stats: List[QueryStats] = []
+
+
+@contextmanager
+def track_queries(global_scope: bool = False) -> Iterator[QueryStats]:
+    """统计范围内的查询；global_scope 为 True 时包括其他线程中的查询"""
+    stats = QueryStats()
+    if global_scope:
+        _global_stats.append(stats)
+        try:
+            yield stats
+        finally:
+            _global_stats.remove(stats)
+        return
+    token = query_stats_var.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats_var.reset(token)
+
+
+def redact_parameters(parameters: Any, executemany: bool) -> str:
+    """只保留参数类型，如 (int, str)；批量执行时给出行数"""
+    if executemany:
+        rows = list(parameters)
+        sample = f"{redact_parameters(rows[0], False)} " if rows else ""
+        return f"{sample}x {len(rows)}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    stats = query_stats_var.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    for tracked in _global_stats:
+        tracked.record(statement, elapsed)
+    if settings.DB_SLOW_QUERY_MS and elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+        logger.warning(LogEvent(
+            "慢查询",
+            ms=round(elapsed * 1000, 1),
+            statement=" ".join(statement.split())[:MAX_STATEMENT_LENGTH],
+            params=redact_parameters(parameters, executemany),
+        ))
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """为引擎安装查询计时钩子（重复调用只安装一次）"""
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
+
+
+class QueryStatsMiddleware:
+    """按请求统计查询数和数据库耗时，结束时检查疑似 N+1 的重复查询"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            await self.app(scope, receive, send)
+
+        DB_QUERIES_PER_REQUEST.observe(stats.count)
+        DB_TIME_PER_REQUEST.observe(stats.duration)
+        if not stats.count:
+            return
+        logger.debug(LogEvent(
+            "请求数据库统计",
+            method=scope["method"],
+            path=scope["path"],
+            queries=stats.count,
+            db_ms=round(stats.duration * 1000, 1),
+        ))
+        for statement, count in stats.repeated(settings.DB_N_PLUS_ONE_THRESHOLD):
+            logger.warning(LogEvent(
+                "疑似 N+1 查询",
+                method=scope["method"],
+                path=scope["path"],
+                count=count,
+                statement=" ".join(statement.split())[:MAX_STATEMENT_LENGTH],
+            ))
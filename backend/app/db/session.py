@@ -1,14 +1,20 @@
 """数据库会话"""
+import time
+
 from sqlalchemy.orm import sessionmaker
+from app.core.metrics import DB_CHECKOUT
 from app.db.base import engine
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 def get_db():
-    """获取数据库会话"""
+    """获取数据库会话（立即取得连接并记录耗时，连接池耗尽时在这里体现）"""
     db = SessionLocal()
     try:
+        started = time.perf_counter()
+        db.connection()
+        DB_CHECKOUT.observe(time.perf_counter() - started)
         yield db
     finally:
         db.close()
@@ -1,17 +1,29 @@
 """FastAPI 主应用"""
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import HTTPException
 from app.core.config import get_settings
-from app.core.logging import setup_logging, get_logger
-from app.routes import auth, resumes, templates
+from app.core.logging import LogEvent, setup_logging, get_logger
+from app.core.request_context import REQUEST_ID_HEADER, RequestIdMiddleware
+from app.core.hashing import HashingPoolSaturated
+from app.core.metrics import MetricsMiddleware, component_stats, mark_process_dead, render_metrics
+from app.core.profiler import PROFILE_ID_HEADER, ProfilerMiddleware
+from app.core.security import get_password_hash, password_hasher
+from app.core.user_cache import user_cache
+from app.core.template_registry import template_registry
+from app.services.render_engine import RenderPoolSaturated, render_engine
+from app.services.autosave import autosave_buffer
+from app.services.matching import vector_cache
+from app.routes import api_routers
 from app.db.base import engine, Base
+from app.db.query_stats import QueryStatsMiddleware
+from app.db.migrations import run_migrations
 
 settings = get_settings()
 
 # 初始化日志系统
-setup_logging(settings.ENVIRONMENT)
+log_pipeline = setup_logging(settings.ENVIRONMENT)
 logger = get_logger(__name__)
 
 # 创建 FastAPI 应用
@@ -27,15 +39,25 @@ app = FastAPI(
 @app.on_event("startup")
 async def startup_event():
     """应用启动事件"""
+    # 日志后台写线程（关闭后再次启动时重新开启）
+    log_pipeline.start()
+
     # 自动创建数据库表
     logger.info("创建数据库表...")
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
     logger.info("数据库表创建完成")
 
+    # 加载模板清单并监听目录变化
+    template_registry.reload()
+    template_registry.start_watching()
+
+    # 启动自动保存落盘线程
+    autosave_buffer.start()
+
     # 创建测试账号（如果不存在）
     from app.db.session import SessionLocal
     from app.models.user import User
-    import bcrypt
 
     db = SessionLocal()
     try:
@@ -43,7 +65,7 @@ async def startup_event():
         if not existing_user:
             test_user = User(
                 email="test@example.com",
-                password_hash=bcrypt.hashpw(b"password123", bcrypt.gensalt()).decode(),
+                password_hash=get_password_hash("password123"),
                 full_name="测试用户"
             )
             db.add(test_user)
@@ -66,7 +88,18 @@ async def startup_event():
 async def shutdown_event():
     """应用关闭事件"""
     logger.info("Resume Builder API 正在关闭...")
+    # 先把自动保存缓冲同步写入数据库
+    autosave_buffer.stop()
+    password_hasher.shutdown()
+    template_registry.stop_watching()
+    render_engine.shutdown()
+    if settings.DB_ASYNC:
+        from app.db.async_session import async_engine
+        await async_engine.dispose()
+    mark_process_dead()
     logger.info("=" * 50)
+    # 最后停止日志写线程，写完队列中剩余的记录
+    log_pipeline.stop()
 
 
 # HTTPException 异常处理器
@@ -79,7 +112,9 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         403: "FORBIDDEN",
         404: "NOT_FOUND",
         409: "CONFLICT",
+        412: "PRECONDITION_FAILED",
         500: "INTERNAL_ERROR",
+        503: "SERVICE_UNAVAILABLE",
     }
     return JSONResponse(
         status_code=exc.status_code,
@@ -93,6 +128,30 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     )
 
 
+# 密码哈希工作池已满
+@app.exception_handler(HashingPoolSaturated)
+async def hashing_saturated_handler(request: Request, exc: HashingPoolSaturated):
+    """哈希工作池饱和时快速失败，提示客户端稍后重试"""
+    logger.warning(LogEvent("密码哈希工作池已满", path=request.url.path))
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "1"},
+        content={"success": False, "error": {"code": "SERVICE_UNAVAILABLE", "message": "服务繁忙，请稍后重试"}}
+    )
+
+
+# PDF 渲染进程池已满
+@app.exception_handler(RenderPoolSaturated)
+async def render_saturated_handler(request: Request, exc: RenderPoolSaturated):
+    """渲染队列已满时快速失败，提示客户端稍后重试"""
+    logger.warning(LogEvent("PDF 渲染队列已满", path=request.url.path))
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "2"},
+        content={"success": False, "error": {"code": "SERVICE_UNAVAILABLE", "message": "PDF 渲染繁忙，请稍后重试"}}
+    )
+
+
 # 统一异常处理器
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -116,12 +175,35 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 前端读取 ETag 用于条件请求，关联 ID 用于反馈问题，以及单请求采样结果编号
+    expose_headers=["ETag", REQUEST_ID_HEADER, PROFILE_ID_HEADER],
 )
 
-# 注册路由
-app.include_router(auth.router, prefix="/api/auth", tags=["认证"])
-app.include_router(resumes.router, prefix="/api/resumes", tags=["简历"])
-app.include_router(templates.router, prefix="/api/templates", tags=["模板"])
+# 每个请求的 SQL 条数与耗时
+app.add_middleware(QueryStatsMiddleware)
+
+# 请求指标（按路由统计耗时、状态码和响应大小）
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, router=app.router)
+
+# 单请求采样分析（X-Profile 头，仅管理员），未开启时不注册
+if settings.PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+
+# 请求关联 ID（最外层，所有响应都带上）
+app.add_middleware(RequestIdMiddleware)
+
+# 各组件状态随 /metrics 输出
+component_stats.register("password_hasher", "密码哈希工作池", password_hasher.stats)
+component_stats.register("pdf_render", "PDF 渲染", render_engine.stats)
+component_stats.register("autosave", "自动保存缓冲", autosave_buffer.stats)
+component_stats.register("log_pipeline", "日志队列", log_pipeline.stats)
+component_stats.register("match_vector_cache", "岗位匹配简历向量缓存", vector_cache.stats)
+component_stats.register("user_cache", "已认证用户缓存", user_cache.stats)
+
+# 注册路由（DB_ASYNC 时已移植的路由改用 AsyncSession）
+for router, prefix, tag in api_routers(settings.DB_ASYNC):
+    app.include_router(router, prefix=prefix, tags=[tag])
 
 
 @app.get("/")
@@ -138,3 +220,11 @@ def root():
 def health_check():
     """健康检查"""
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus 指标（多 worker 时汇总各进程）"""
+    body, media_type = render_metrics()
+    return Response(content=body, media_type=media_type)
+
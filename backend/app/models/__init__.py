@@ -1,5 +1,7 @@
 """导入所有模型"""
 from app.models.user import User
+from app.models.content_blob import ContentBlob
 from app.models.resume import Resume
+from app.models.revision import ResumeRevision
 
-__all__ = ["User", "Resume"]
+__all__ = ["User", "ContentBlob", "Resume", "ResumeRevision"]
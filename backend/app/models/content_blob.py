@@ -0,0 +1,95 @@
+"""内容块模型（按哈希去重的简历内容）"""
+import hashlib
+from collections import Counter
+from typing import Callable, Dict, Iterable, List
+
+from sqlalchemy import Column, Integer, LargeBinary, String, bindparam, delete, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.db.base import Base
+from app.core.content_codec import encode_content
+
+
+class ContentBlob(Base):
+    """内容块表：相同内容只存一份，refcount 为引用它的简历数"""
+
+    __tablename__ = "content_blobs"
+
+    hash = Column(String, primary_key=True)  # 内容 UTF-8 编码的 SHA-256
+    # encode_content 编码后的字节（首字节为格式版本），SQLite 旧库中可能还有未压缩的 JSON 文本
+    data = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)  # 原始字节数
+    refcount = Column(Integer, nullable=False, default=0)
+
+
+def content_hash(content: str) -> str:
+    """内容寻址使用的哈希"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+# 支持 INSERT ... ON CONFLICT DO UPDATE 的数据库，其余数据库先查后改
+UPSERT_INSERTS: Dict[str, Callable] = {
+    "sqlite": sqlite_insert,
+    "postgresql": postgresql_insert,
+}
+
+
+def acquire_blobs(db: Session, contents: Iterable[str]) -> None:
+    """为每份内容增加一次引用，不存在时插入"""
+    counts: Counter = Counter()
+    data = {}
+    for content in contents:
+        key = content_hash(content)
+        counts[key] += 1
+        data[key] = content
+    if not counts:
+        return
+
+    rows = [
+        {"hash": key, "data": encode_content(data[key]), "size": len(data[key].encode("utf-8")), "refcount": count}
+        for key, count in counts.items()
+    ]
+    table = ContentBlob.__table__
+    upsert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if upsert is None:
+        _acquire_blobs_portable(db, rows)
+        return
+    stmt = upsert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.hash],
+        set_={"refcount": table.c.refcount + stmt.excluded.refcount},
+    )
+    db.execute(stmt, rows)
+
+
+def _acquire_blobs_portable(db: Session, rows: List[dict]) -> None:
+    """先查出已存在的内容块增加引用，再插入其余的"""
+    table = ContentBlob.__table__
+    existing = set(db.execute(select(table.c.hash).where(table.c.hash.in_([row["hash"] for row in rows]))).scalars())
+    if existing:
+        db.execute(
+            update(table)
+            .where(table.c.hash == bindparam("b_hash"))
+            .values(refcount=table.c.refcount + bindparam("b_count")),
+            [{"b_hash": row["hash"], "b_count": row["refcount"]} for row in rows if row["hash"] in existing],
+        )
+    missing = [row for row in rows if row["hash"] not in existing]
+    if missing:
+        db.execute(insert(table), missing)
+
+
+def release_blobs(db: Session, hashes: Iterable[str]) -> None:
+    """减少引用，引用归零的内容块随即删除"""
+    counts = Counter(key for key in hashes if key)
+    if not counts:
+        return
+
+    table = ContentBlob.__table__
+    db.execute(
+        update(table)
+        .where(table.c.hash == bindparam("b_hash"))
+        .values(refcount=table.c.refcount - bindparam("b_count")),
+        [{"b_hash": key, "b_count": count} for key, count in counts.items()],
+    )
+    db.execute(delete(table).where(table.c.hash.in_(list(counts)), table.c.refcount <= 0))
@@ -1,7 +1,21 @@
 """简历模型"""
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from typing import List, Optional
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, event, inspect, select
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session, column_property
 from sqlalchemy.sql import func
 from app.db.base import Base
+from app.core.content_codec import decode_content
+from app.models.content_blob import ContentBlob, acquire_blobs, content_hash, release_blobs
+
+# SQLite 的 CURRENT_TIMESTAMP 精确到秒，绑定参数也按同样格式渲染，
+# 否则游标分页比较 updated_at 时会因为字符串格式不同而出错
+Timestamp = DateTime().with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
 
 
 class Resume(Base):
@@ -13,6 +27,68 @@ class Resume(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title = Column(String, nullable=False)
     template_id = Column(String, nullable=False)
-    content = Column(Text, nullable=False)  # JSON 字符串
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # 内容按哈希存放在 content_blobs，复制出的简历在修改前共用同一份（写时复制）
+    content_hash = Column(String, ForeignKey("content_blobs.hash"), nullable=False, index=True)
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, server_default=func.now(), onupdate=func.now())
+    # 乐观并发版本号，每次 UPDATE 自增，驱动 ETag / If-Match
+    version = Column(Integer, nullable=False, server_default="1")
+
+    # 随简历一起查询出的编码后内容（只读），读写请使用 content
+    stored_content = column_property(
+        select(ContentBlob.data)
+        .where(ContentBlob.hash == content_hash)
+        .correlate_except(ContentBlob)
+        .scalar_subquery()
+    )
+
+    __table_args__ = (
+        # 列表页按 (updated_at, id) 做游标分页
+        Index("ix_resumes_user_updated", "user_id", updated_at.desc(), "id"),
+    )
+    # UPDATE 语句带上 WHERE version = 旧值，并发写入冲突时抛出 StaleDataError
+    __mapper_args__ = {"version_id_col": version}
+
+    @property
+    def content(self) -> Optional[str]:
+        """JSON 字符串（首次读取时解压，按内容哈希缓存）"""
+        key = self.content_hash
+        cached = self.__dict__.get("_content_cache")
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        value = decode_content(self.stored_content)
+        if key is not None:
+            self._content_cache = (key, value)
+        return value
+
+    @content.setter
+    def content(self, value: str) -> None:
+        # 记下修改前的内容，供修订历史生成增量
+        if "_previous_content" not in self.__dict__:
+            self._previous_content = self.content if self.content_hash is not None else None
+        self._content_cache = (content_hash(value), value)
+        self.content_hash = self._content_cache[0]
+
+
+@event.listens_for(Session, "before_flush")
+def _sync_content_blobs(session: Session, flush_context, instances) -> None:
+    """写入简历前维护内容块的引用计数（先引用新内容，再释放旧内容）"""
+    acquired: List[str] = []
+    released: List[Optional[str]] = []
+    for obj in session.new:
+        if isinstance(obj, Resume) and obj.content_hash is not None:
+            acquired.append(obj.content)
+    for obj in session.dirty:
+        if isinstance(obj, Resume):
+            history = inspect(obj).attrs.content_hash.history
+            if history.has_changes():
+                acquired.append(obj.content)
+                released.extend(history.deleted)
+    for obj in session.deleted:
+        if isinstance(obj, Resume):
+            # 删除前改过内容时释放的是数据库中原来的内容块
+            history = inspect(obj).attrs.content_hash.history
+            released.append(history.deleted[0] if history.deleted else obj.content_hash)
+
+    acquire_blobs(session, acquired)
+    release_blobs(session, released)
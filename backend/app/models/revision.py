@@ -0,0 +1,29 @@
+"""简历修订历史模型"""
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.db.base import Base
+from app.models.resume import Timestamp
+
+# 修订记录类型：完整快照 / 相对上一修订的 JSON Patch
+REVISION_SNAPSHOT = "snapshot"
+REVISION_DELTA = "delta"
+
+
+class ResumeRevision(Base):
+    """简历修订表"""
+
+    __tablename__ = "resume_revisions"
+
+    id = Column(Integer, primary_key=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False)
+    number = Column(Integer, nullable=False)  # 每份简历从 1 开始递增
+    version = Column(Integer, nullable=False)  # 对应的简历版本号（ETag）
+    kind = Column(String, nullable=False)
+    title = Column(String, nullable=False)
+    template_id = Column(String, nullable=False)
+    data = Column(Text, nullable=False)  # 快照为完整 content，增量为 JSON Patch
+    created_at = Column(Timestamp, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_resume_revisions_resume_number", "resume_id", "number", unique=True),
+    )
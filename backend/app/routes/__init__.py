@@ -1 +1,41 @@
 """路由模块"""
+from typing import List, Tuple
+
+from fastapi import APIRouter
+
+
+def override_routes(base: APIRouter, overrides: APIRouter) -> APIRouter:
+    """用 overrides 中同路径、同方法的路由替换 base 中的路由
+
+    保持 base 的声明顺序（静态路径仍排在 /{resume_id} 之前），
+    base 中未被覆盖的路由继续由原实现处理。
+    """
+    replacements = {
+        (route.path, frozenset(route.methods)): route
+        for route in overrides.routes
+    }
+    merged = APIRouter()
+    for route in base.routes:
+        merged.routes.append(replacements.pop((route.path, frozenset(route.methods)), route))
+    merged.routes.extend(replacements.values())
+    return merged
+
+
+def api_routers(db_async: bool) -> List[Tuple[APIRouter, str, str]]:
+    """应用注册的 API 路由：(路由, 前缀, 标签)
+
+    db_async 开启时，认证与简历中已移植的路由改用 AsyncSession，其余仍走线程池。
+    """
+    from app.routes import admin, auth, resumes, templates
+
+    auth_router, resumes_router = auth.router, resumes.router
+    if db_async:
+        from app.routes import auth_async, resumes_async
+        auth_router = override_routes(auth.router, auth_async.router)
+        resumes_router = override_routes(resumes.router, resumes_async.router)
+    return [
+        (auth_router, "/api/auth", "认证"),
+        (resumes_router, "/api/resumes", "简历"),
+        (templates.router, "/api/templates", "模板"),
+        (admin.router, "/api/admin", "管理"),
+    ]
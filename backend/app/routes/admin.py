@@ -0,0 +1,61 @@
+"""管理接口（仅管理员）"""
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.api.deps import get_current_admin
+from app.core.config import get_settings
+from app.core.logging import LogEvent, get_logger
+from app.core.profiler import ProfilerBusy, profiler
+from app.core.responses import envelope
+from app.core.user_cache import UserSnapshot
+
+router = APIRouter()
+settings = get_settings()
+logger = get_logger(__name__)
+
+
+def require_profiler() -> None:
+    """未开启采样分析器时接口不存在"""
+    if not settings.PROFILER_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="采样分析器未开启")
+
+
+@router.post("/profile", dependencies=[Depends(require_profiler)])
+async def profile_process(
+    seconds: float = Query(10, gt=0, description="采样时长（秒）"),
+    interval_ms: float = Query(10, ge=1, le=100, description="采样间隔（毫秒）"),
+    format: str = Query("collapsed", pattern="^(collapsed|json)$", description="collapsed：火焰图输入；json：概况与最常见的栈"),
+    current_user: UserSnapshot = Depends(get_current_admin),
+):
+    """采样整个进程 seconds 秒，返回各线程的调用栈统计"""
+    if seconds > settings.PROFILER_MAX_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"采样时长不能超过 {settings.PROFILER_MAX_SECONDS:g} 秒",
+        )
+    try:
+        sampler = profiler.start(interval_ms / 1000)
+    except ProfilerBusy:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="已有采样在进行，请稍后重试")
+
+    logger.info(LogEvent("开始采样分析", user_id=current_user.id, seconds=seconds, interval_ms=interval_ms))
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        # 采样线程在间隔到期时退出，等待时间不超过一个间隔
+        profiler.stop(sampler)
+
+    if format == "json":
+        return envelope(sampler.summary())
+    return PlainTextResponse(sampler.collapsed())
+
+
+@router.get("/profile/requests/{profile_id}", dependencies=[Depends(require_profiler)])
+def get_request_profile(profile_id: str, current_user: UserSnapshot = Depends(get_current_admin)):
+    """取回带 X-Profile 头的请求的采样结果（collapsed 格式）"""
+    collapsed = profiler.get_result(profile_id)
+    if collapsed is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="采样结果不存在或已过期")
+    return PlainTextResponse(collapsed)
@@ -1,28 +1,46 @@
 """认证相关 API"""
-from datetime import timedelta
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.models.user import User
-from app.schemas.user import (
-    UserCreate, UserLogin, UserResponse, AuthResponse,
-    APIResponse
+from app.schemas.user import UserCreate, UserLogin, UserResponse
+from app.core.responses import envelope
+from app.core.security import (
+    verify_and_update_password_async, get_password_hash_async, create_user_access_token
 )
-from app.core.security import verify_password, get_password_hash, create_access_token
 from app.core.config import get_settings
+from app.core.user_cache import UserSnapshot
 from app.api.deps import get_current_user
 
 router = APIRouter()
 settings = get_settings()
 
 
+# 路由本身是 async def：bcrypt 在哈希工作池中执行时只挂起协程，不占用线程池线程，
+# 登录/注册突发时其他同步接口不会排在 bcrypt 后面；数据库操作仍放到线程池执行。
+
+def _find_user(db: Session, email: str) -> Optional[User]:
+    """按邮箱查找用户，查完即归还连接，排队等待 bcrypt 期间不占用连接池"""
+    user = db.query(User).filter(User.email == email).first()
+    db.close()
+    return user
+
+
+def _save_user(db: Session, user: User) -> None:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+
+
 @router.post("/register", status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """用户注册"""
     # 检查邮箱是否已存在
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+    if await run_in_threadpool(_find_user, db, user_data.email):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="邮箱已被注册",
@@ -42,63 +60,60 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
             detail="姓名长度必须在 1-255 个字符之间",
         )
 
-    # 创建新用户
+    # 创建新用户（bcrypt 在哈希工作池中执行，不阻塞事件循环）
     new_user = User(
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=await get_password_hash_async(user_data.password),
         full_name=user_data.full_name,
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await run_in_threadpool(_save_user, db, new_user)
 
     # 生成 Token
-    access_token = create_access_token(
-        data={"sub": str(new_user.id)},
-        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
-    )
+    access_token = create_user_access_token(new_user)
 
-    return APIResponse(
-        success=True,
-        data={
+    return envelope(
+        {
             "access_token": access_token,
-            "user": UserResponse.model_validate(new_user).model_dump()
-        }
+            "user": UserResponse.model_validate(new_user).model_dump(),
+        },
+        status_code=status.HTTP_201_CREATED,
     )
 
 
 @router.post("/login")
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: Session = Depends(get_db)):
     """用户登录"""
     # 查找用户
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await run_in_threadpool(_find_user, db, credentials.email)
 
     # 验证用户和密码
-    if not user or not verify_password(credentials.password, user.password_hash):
+    valid, new_hash = (
+        await verify_and_update_password_async(credentials.password, user.password_hash)
+        if user else (False, None)
+    )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="邮箱或密码错误",
         )
 
+    # bcrypt 强度调整后，登录时透明地重新哈希
+    if new_hash:
+        user.password_hash = new_hash
+        await run_in_threadpool(_save_user, db, user)
+
     # 生成 Token
-    access_token = create_access_token(
-        data={"sub": str(user.id)},
-        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
-    )
+    access_token = create_user_access_token(user)
 
-    return APIResponse(
-        success=True,
-        data={
+    return envelope(
+        {
             "access_token": access_token,
-            "user": UserResponse.model_validate(user).model_dump()
+            "user": UserResponse.model_validate(user).model_dump(),
         }
     )
 
 
 @router.get("/me")
-def get_me(current_user: User = Depends(get_current_user)):
+def get_me(current_user: UserSnapshot = Depends(get_current_user)):
     """获取当前用户信息"""
-    return APIResponse(
-        success=True,
-        data=UserResponse.model_validate(current_user).model_dump()
-    )
+    return envelope(UserResponse.model_validate(current_user).model_dump())
@@ -0,0 +1,106 @@
+"""认证相关 API（异步数据库版本）"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.async_session import get_async_db
+from app.models.user import User
+from app.schemas.user import UserCreate, UserLogin, UserResponse
+from app.core.responses import envelope
+from app.core.security import (
+    verify_and_update_password_async, get_password_hash_async, create_user_access_token
+)
+from app.core.config import get_settings
+from app.core.user_cache import UserSnapshot
+from app.api.deps_async import get_current_user_async
+
+router = APIRouter()
+settings = get_settings()
+
+
+@router.post("/register", status_code=status.HTTP_201_CREATED)
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    """用户注册"""
+    # 检查邮箱是否已存在
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    if result.scalar_one_or_none():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="邮箱已被注册",
+        )
+
+    # 验证密码长度
+    if len(user_data.password) < 8:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="密码至少需要 8 个字符",
+        )
+
+    # 验证姓名长度
+    if not (1 <= len(user_data.full_name) <= 255):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="姓名长度必须在 1-255 个字符之间",
+        )
+
+    # 创建新用户（bcrypt 在哈希工作池中执行，不阻塞事件循环）
+    new_user = User(
+        email=user_data.email,
+        password_hash=await get_password_hash_async(user_data.password),
+        full_name=user_data.full_name,
+    )
+    db.add(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+
+    # 生成 Token
+    access_token = create_user_access_token(new_user)
+
+    return envelope(
+        {
+            "access_token": access_token,
+            "user": UserResponse.model_validate(new_user).model_dump(),
+        },
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@router.post("/login")
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    """用户登录"""
+    # 查找用户
+    result = await db.execute(select(User).where(User.email == credentials.email))
+    user = result.scalar_one_or_none()
+
+    # 验证用户和密码
+    valid, new_hash = (
+        await verify_and_update_password_async(credentials.password, user.password_hash)
+        if user else (False, None)
+    )
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="邮箱或密码错误",
+        )
+
+    # bcrypt 强度调整后，登录时透明地重新哈希
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+        await db.refresh(user)
+
+    # 生成 Token
+    access_token = create_user_access_token(user)
+
+    return envelope(
+        {
+            "access_token": access_token,
+            "user": UserResponse.model_validate(user).model_dump(),
+        }
+    )
+
+
+@router.get("/me")
+async def get_me(current_user: UserSnapshot = Depends(get_current_user_async)):
+    """获取当前用户信息"""
+    return envelope(UserResponse.model_validate(current_user).model_dump())
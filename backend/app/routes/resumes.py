@@ -1,178 +1,649 @@
 """简历相关 API"""
 import json
 import logging
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import quote
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import Select, and_, or_, select
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.db.session import get_db
-from app.models.user import User
 from app.models.resume import Resume
 from app.schemas.resume import (
+    ResumeContent,
     ResumeCreate,
     ResumeUpdate,
     ResumeResponse,
     ResumeListItem,
     ResumeDuplicate,
+    JobMatchRequest,
 )
-from app.schemas.user import APIResponse
-from app.api.deps import get_current_user, get_resume_by_id_for_user
+from app.core.responses import dumps, envelope, raw_json
+from app.core.json_patch import (
+    JsonPatchError,
+    JsonPatchTestFailed,
+    apply_merge_patch,
+    apply_patch,
+    touched_keys,
+)
+from app.api.deps import get_current_user, get_current_user_readonly, get_resume_by_id_for_user
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.user_cache import UserSnapshot
+from app.core.http_cache import etag_matches
+from app.core.logging import LogEvent
+from app.core.template_registry import template_registry
+from app.services.render_engine import render_engine
+from app.services.autosave import autosave_buffer
+from app.services.revisions import list_revisions, load_revision
+from app.services.search import search_resumes
+from app.services.bulk_import import (
+    BulkImportError,
+    ImportEntry,
+    ImportFailure,
+    ImportItem,
+    import_results,
+    import_summary,
+    insert_resumes,
+    is_ndjson,
+    iter_import_batches,
+    validate_entry,
+)
+from app.services.export import EXPORT_FORMATS, iter_export
+from app.services.matching import MatchCandidate, MatchQuery, build_query, match_resume, rank_resumes
+from app.models.content_blob import content_hash
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# 游标分页默认每页数量
+DEFAULT_PAGE_SIZE = 20
 
-@router.get("")
-def get_resumes(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    """获取用户的所有简历"""
-    logger.info(f"获取用户简历列表: user_id={current_user.id}, email={current_user.email}")
-    resumes = (
-        db.query(Resume)
-        .filter(Resume.user_id == current_user.id)
-        .order_by(Resume.updated_at.desc())
-        .all()
+# 修订列表默认每页数量
+DEFAULT_REVISION_PAGE_SIZE = 50
+
+# 全文检索默认返回条数
+DEFAULT_SEARCH_LIMIT = 20
+
+# 岗位匹配批量模式默认返回条数
+DEFAULT_MATCH_LIMIT = 20
+
+# 简历详情只允许浏览器私有缓存，且每次使用前都要用 ETag 重新验证
+RESUME_CACHE_CONTROL = "private, no-cache"
+
+# PATCH 支持的请求体格式
+JSON_PATCH_MEDIA_TYPE = "application/json-patch+json"
+MERGE_PATCH_MEDIA_TYPE = "application/merge-patch+json"
+
+
+# 摘要模式只查询这些列，避免加载 content 大字段
+SUMMARY_COLUMNS = (
+    Resume.id,
+    Resume.title,
+    Resume.template_id,
+    Resume.created_at,
+    Resume.updated_at,
+)
+
+
+def serialize_summary(row) -> dict:
+    """序列化列表摘要（不含 content）"""
+    return {
+        "id": row.id,
+        "title": row.title,
+        "template_id": row.template_id,
+        "created_at": row.created_at.isoformat(),
+        "updated_at": row.updated_at.isoformat(),
+    }
+
+
+def serialize_resume(resume: Resume, content: Any) -> dict:
+    """序列化简历详情"""
+    return {
+        "id": resume.id,
+        "user_id": resume.user_id,
+        "title": resume.title,
+        "template_id": resume.template_id,
+        "content": content,
+        "created_at": resume.created_at.isoformat(),
+        "updated_at": resume.updated_at.isoformat(),
+        "version": resume.version,
+    }
+
+
+def resume_etag(resume: Resume) -> str:
+    """简历 ETag：每次写入版本号自增，(id, version) 即可唯一标识内容"""
+    return f'"{resume.id}-{resume.version}"'
+
+
+def resume_headers(resume: Resume) -> dict:
+    """简历详情响应头"""
+    return {"ETag": resume_etag(resume), "Cache-Control": RESUME_CACHE_CONTROL}
+
+
+def resume_response(request: Request, resume: Resume) -> Response:
+    """返回简历详情（含未落盘的自动保存），If-None-Match 与当前版本一致时返回 304"""
+    resume = autosave_buffer.overlay(resume)
+    headers = resume_headers(resume)
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return envelope(serialize_resume(resume, raw_json(resume.content)), headers=headers)
+
+
+def precondition_failed() -> HTTPException:
+    """版本冲突异常"""
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="简历已被修改，请刷新后重试",
+    )
+
+
+def check_if_match(request: Request, resume: Resume) -> None:
+    """If-Match 与当前版本不一致时拒绝写入（强比较，弱 ETag 不能通过）"""
+    header = request.headers.get("if-match")
+    if header is not None and not etag_matches(header, resume_etag(resume), strong=True):
+        raise precondition_failed()
+
+
+def write_conflict(request: Request) -> HTTPException:
+    """提交时发现版本已被并发修改：带 If-Match 的请求返回 412，否则返回 409"""
+    if request.headers.get("if-match") is not None:
+        return precondition_failed()
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="简历已被修改，请刷新后重试",
     )
-    # 解析 content JSON 字符串
+
+
+def is_unchanged(resume: Resume, resume_data: ResumeUpdate, content_json: str) -> bool:
+    """提交的内容与数据库中一致时无需写入"""
+    return (
+        resume.title == resume_data.title
+        and resume.template_id == resume_data.template_id
+        and resume.content == content_json
+    )
+
+
+def serialize_patch_result(resume: Resume) -> dict:
+    """PATCH 响应只返回元数据，不回传完整 content"""
+    return {**serialize_summary(resume), "version": resume.version}
+
+
+def patch_content(stored: str, patch: Any, content_type: Optional[str]) -> str:
+    """把补丁应用到已存储的 content，返回新的 JSON 字符串
+
+    只校验补丁涉及的顶层字段，其余字段原样保留；被删除的顶层字段按 Schema 置为 null，
+    与 PUT 写入的结构保持一致。
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    is_json_patch = isinstance(patch, list)
+    if (media_type == JSON_PATCH_MEDIA_TYPE and not is_json_patch) or (
+        media_type == MERGE_PATCH_MEDIA_TYPE and is_json_patch
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="请求体格式与 Content-Type 不一致",
+        )
+
+    content = json.loads(stored)
+    try:
+        if is_json_patch:
+            content = apply_patch(content, patch)
+            touched = touched_keys(patch)
+        else:
+            content = apply_merge_patch(content, patch)
+            touched = set(patch)
+    except JsonPatchTestFailed as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except JsonPatchError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    unknown = touched - set(ResumeContent.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"未知的简历字段: {', '.join(sorted(unknown))}",
+        )
+    try:
+        validated = ResumeContent.model_validate({key: content.get(key) for key in touched})
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"简历内容校验失败: {e.errors()[0]['loc'][0]} {e.errors()[0]['msg']}",
+        )
+    content.update(validated.model_dump(include=touched))
+    return dumps(content).decode("utf-8")
+
+
+def buffer_autosave(request: Request, current: Any, resume_data: ResumeUpdate) -> Response:
+    """把自动保存写入缓冲，current 为当前生效的版本"""
+    check_if_match(request, current)
+    content_json = resume_data.content.model_dump_json()
+    if is_unchanged(current, resume_data, content_json):
+        return envelope(serialize_patch_result(current), headers=resume_headers(current))
+
+    entry = autosave_buffer.put(current, resume_data.title, resume_data.template_id, content_json)
+    logger.debug(LogEvent("自动保存已缓冲", resume_id=entry.id, version=entry.version))
+    return envelope(
+        serialize_patch_result(entry),
+        status_code=status.HTTP_202_ACCEPTED,
+        headers=resume_headers(entry),
+    )
+
+
+def revision_not_found() -> HTTPException:
+    """修订不存在异常"""
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="修订不存在",
+    )
+
+
+def apply_revision(resume: Resume, revision: dict) -> None:
+    """把修订内容写回简历对象（提交后会作为新的修订记录）"""
+    resume.title = revision["title"]
+    resume.template_id = revision["template_id"]
+    resume.content = dumps(revision["content"]).decode("utf-8")
+
+
+def parse_job_description(match_data: JobMatchRequest) -> MatchQuery:
+    """解析岗位描述，没有可用于匹配的词时返回 400"""
+    query = build_query(match_data.job_description)
+    if query is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="岗位描述中没有可用于匹配的关键词")
+    return query
+
+
+def build_match_statement(user_id: int) -> Select:
+    """批量匹配只查询元数据，内容按 content_hash 从向量缓存读取"""
+    return select(Resume.id, Resume.title, Resume.content_hash).where(Resume.user_id == user_id)
+
+
+def match_candidates(rows: Sequence[Any]) -> List[MatchCandidate]:
+    """批量匹配的候选简历，有未落盘的自动保存时以其为准"""
+    candidates = []
+    for row in rows:
+        pending = autosave_buffer.get(row.id)
+        if pending is None:
+            candidates.append(MatchCandidate(row.id, row.title, row.content_hash))
+        else:
+            candidates.append(MatchCandidate(row.id, pending.title, content_hash(pending.content), pending.content))
+    return candidates
+
+
+def match_source(resume: Resume) -> Tuple[str, Optional[str]]:
+    """单份匹配使用的 (content_hash, content)，内容未变时只凭哈希取缓存的向量"""
+    pending = autosave_buffer.get(resume.id)
+    if pending is None:
+        return resume.content_hash, None
+    return content_hash(pending.content), pending.content
+
+
+def export_response(body: Any, fmt: str, schema: str) -> StreamingResponse:
+    """批量导出的流式响应"""
+    suffix = "-jsonresume" if schema == "jsonresume" else ""
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="resumes{suffix}.{fmt}"'},
+    )
+
+
+def validate_import_batch(batch: List[ImportEntry], template_id: str) -> List[Union[ImportItem, ImportFailure]]:
+    """逐项校验一批导入的简历"""
+    return [validate_entry(index, document, template_id) for index, document in batch]
+
+
+def store_import_batch(db: Session, user_id: int, template_id: str, batch: List[ImportEntry]) -> List[dict]:
+    """校验并在一个事务中写入一批导入的简历，写入失败时整批回滚"""
+    entries = validate_import_batch(batch, template_id)
+    items = [entry for entry in entries if isinstance(entry, ImportItem)]
+    if not items:
+        return import_results(entries)
+    try:
+        ids = insert_resumes(db, user_id, items)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(LogEvent("批量导入写入失败", user_id=user_id, count=len(items), error=str(e)), exc_info=True)
+        return import_results(entries, error="写入数据库失败")
+    return import_results(entries, ids)
+
+
+def bulk_import_failed(e: BulkImportError) -> HTTPException:
+    """请求体无法解析"""
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def build_list_statement(
+    user_id: int,
+    summary: bool,
+    limit: Optional[int],
+    cursor: Optional[str],
+) -> Select:
+    """构造简历列表查询（同步和异步路由共用）"""
+    stmt = select(*SUMMARY_COLUMNS) if summary else select(Resume)
+    stmt = stmt.where(Resume.user_id == user_id)
+
+    if cursor is not None:
+        position = decode_cursor(cursor)
+        if position is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="无效的分页游标",
+            )
+        cursor_updated_at, cursor_id = position
+        stmt = stmt.where(
+            or_(
+                Resume.updated_at < cursor_updated_at,
+                and_(Resume.updated_at == cursor_updated_at, Resume.id > cursor_id),
+            )
+        )
+
+    stmt = stmt.order_by(Resume.updated_at.desc(), Resume.id)
+    if limit is not None or cursor is not None:
+        # 多取一条用于判断是否还有下一页
+        stmt = stmt.limit((limit or DEFAULT_PAGE_SIZE) + 1)
+    return stmt
+
+
+def build_list_data(
+    resumes: Sequence[Any],
+    summary: bool,
+    limit: Optional[int],
+    cursor: Optional[str],
+) -> Union[list, dict]:
+    """把查询结果组装为响应数据"""
+    paginated = limit is not None or cursor is not None
+    page_size = limit or DEFAULT_PAGE_SIZE
+
+    next_cursor = None
+    if paginated and len(resumes) > page_size:
+        resumes = resumes[:page_size]
+        last = resumes[-1]
+        next_cursor = encode_cursor(last.updated_at, last.id)
+
     result = []
     for resume in resumes:
-        content = json.loads(resume.content)
-        result.append({
-            "id": resume.id,
-            "title": resume.title,
-            "template_id": resume.template_id,
-            "content": content,
-            "created_at": resume.created_at.isoformat(),
-            "updated_at": resume.updated_at.isoformat(),
-        })
-    logger.info(f"成功获取用户简历列表: user_id={current_user.id}, count={len(result)}")
-    return APIResponse(
-        success=True,
-        data=result
-    )
+        # 未落盘的自动保存对列表同样可见（排序仍按数据库中的 updated_at）
+        resume = autosave_buffer.overlay(resume)
+        item = serialize_summary(resume)
+        if not summary:
+            # content 已是 JSON 字符串，原样拼接进响应
+            item["content"] = raw_json(resume.content)
+        result.append(item)
+
+    if paginated:
+        return {"items": result, "next_cursor": next_cursor}
+    return result
+
+
+@router.get("")
+def get_resumes(
+    summary: bool = Query(False, description="仅返回摘要字段，不含 content"),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="每页数量，启用游标分页"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor"),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user_readonly),
+):
+    """获取用户的所有简历
+
+    默认返回完整列表；传入 summary 时只查询摘要列，传入 limit/cursor 时
+    按 (updated_at, id) 做游标分页，返回 {"items": [...], "next_cursor": ...}。
+    """
+    logger.info(LogEvent("获取用户简历列表", user_id=current_user.id, email=current_user.email))
+    stmt = build_list_statement(current_user.id, summary, limit, cursor)
+    result = db.execute(stmt)
+    resumes = result.all() if summary else result.scalars().all()
+    data = build_list_data(resumes, summary, limit, cursor)
+    logger.info(LogEvent("成功获取用户简历列表", user_id=current_user.id, count=len(resumes)))
+    return envelope(data)
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
 def create_resume(
     resume_data: ResumeCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
 ):
     """创建新简历"""
-    logger.info(f"创建简历: user_id={current_user.id}, title={resume_data.title}, template={resume_data.template_id}")
+    logger.info(LogEvent("创建简历", user_id=current_user.id, title=resume_data.title, template=resume_data.template_id))
     try:
+        content_json = resume_data.content.model_dump_json()
         new_resume = Resume(
             user_id=current_user.id,
             title=resume_data.title,
             template_id=resume_data.template_id,
-            content=resume_data.content.model_dump_json(),
+            content=content_json,
         )
         db.add(new_resume)
         db.commit()
         db.refresh(new_resume)
 
-        logger.info(f"简历创建成功: resume_id={new_resume.id}, user_id={current_user.id}")
-
-        return APIResponse(
-            success=True,
-            data={
-                "id": new_resume.id,
-                "user_id": new_resume.user_id,
-                "title": new_resume.title,
-                "template_id": new_resume.template_id,
-                "content": resume_data.content.model_dump(),
-                "created_at": new_resume.created_at.isoformat(),
-                "updated_at": new_resume.updated_at.isoformat(),
-            }
+        logger.info(LogEvent("简历创建成功", resume_id=new_resume.id, user_id=current_user.id))
+
+        return envelope(
+            serialize_resume(new_resume, raw_json(content_json)),
+            status_code=status.HTTP_201_CREATED,
+            headers=resume_headers(new_resume),
         )
     except Exception as e:
-        logger.error(f"创建简历失败: user_id={current_user.id}, title={resume_data.title}, error={str(e)}", exc_info=True)
+        logger.error(LogEvent("创建简历失败", user_id=current_user.id, title=resume_data.title, error=str(e)), exc_info=True)
         raise
 
 
+@router.post("/bulk")
+async def bulk_import_resumes(
+    request: Request,
+    template_id: str = Query("modern", description="JSON Resume 格式的简历使用的模板"),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user),
+):
+    """批量导入简历（JSON 数组或 NDJSON，本站格式或 JSON Resume），逐项返回结果
+
+    边接收边解析，每批在线程池中校验并用一个事务写入，不阻塞事件循环。
+    """
+    results: List[dict] = []
+    try:
+        batches = iter_import_batches(request.stream(), is_ndjson(request.headers.get("content-type")))
+        async for batch in batches:
+            results.extend(await run_in_threadpool(store_import_batch, db, current_user.id, template_id, batch))
+    except BulkImportError as e:
+        raise bulk_import_failed(e)
+    data = import_summary(results)
+    logger.info(LogEvent("批量导入简历", user_id=current_user.id, created=data['created'], failed=data['failed']))
+    return envelope(data)
+
+
+@router.get("/search")
+def search(
+    q: str = Query(..., min_length=1, max_length=200, description="检索词，空格分隔的各项都须命中，双引号表示短语"),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=50, description="返回条数"),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user_readonly),
+):
+    """全文检索当前用户的简历（按相关度排序，返回高亮摘要）"""
+    items = search_resumes(db, current_user.id, q, limit)
+    logger.info(LogEvent("检索简历", user_id=current_user.id, count=len(items)))
+    return envelope({"items": items})
+
+
+@router.get("/export")
+def export_resumes(
+    format: str = Query("zip", pattern="^(zip|ndjson)$", description="导出格式：zip 或 ndjson"),
+    schema: str = Query("native", pattern="^(native|jsonresume)$", description="内容格式：native 或 jsonresume"),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user_readonly),
+):
+    """流式导出当前用户的全部简历"""
+    logger.info(LogEvent("导出简历", user_id=current_user.id, format=format, schema=schema))
+    return export_response(iter_export(db.get_bind(), current_user.id, format, schema), format, schema)
+
+
+@router.post("/match")
+def match_all_resumes(
+    match_data: JobMatchRequest,
+    limit: int = Query(DEFAULT_MATCH_LIMIT, ge=1, le=1000, description="返回条数"),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user_readonly),
+):
+    """用岗位描述为当前用户的全部简历评分并排序"""
+    query = parse_job_description(match_data)
+    candidates = match_candidates(db.execute(build_match_statement(current_user.id)).all())
+    items = rank_resumes(db, query, candidates, limit)
+    logger.info(LogEvent("批量岗位匹配", user_id=current_user.id, count=len(candidates)))
+    return envelope({"items": items})
+
+
 @router.get("/{resume_id}")
 def get_resume(
+    request: Request,
     resume: Resume = Depends(get_resume_by_id_for_user),
 ):
-    """获取简历详情"""
-    content = json.loads(resume.content)
-    return APIResponse(
-        success=True,
-        data={
-            "id": resume.id,
-            "user_id": resume.user_id,
-            "title": resume.title,
-            "template_id": resume.template_id,
-            "content": content,
-            "created_at": resume.created_at.isoformat(),
-            "updated_at": resume.updated_at.isoformat(),
-        }
-    )
+    """获取简历详情（支持 If-None-Match 条件请求）"""
+    return resume_response(request, resume)
 
 
 @router.put("/{resume_id}")
 def update_resume(
     resume_id: int,
     resume_data: ResumeUpdate,
+    request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
 ):
-    """更新简历"""
-    logger.info(f"更新简历: resume_id={resume_id}, user_id={current_user.id}, title={resume_data.title}")
+    """更新简历
+
+    带 If-Match 时只有与当前 ETag 一致才写入，否则返回 412；内容未变化时不写库。
+    """
+    logger.info(LogEvent("更新简历", resume_id=resume_id, user_id=current_user.id, title=resume_data.title))
     try:
+        # 显式保存前先落盘该简历的自动保存
+        if autosave_buffer.flush([resume_id]):
+            db.expire_all()
+
         # 获取并验证权限
         resume = get_resume_by_id_for_user(resume_id, db, current_user)
+        check_if_match(request, resume)
+
+        content_json = resume_data.content.model_dump_json()
+        if is_unchanged(resume, resume_data, content_json):
+            logger.info(LogEvent("简历内容未变化，跳过写入", resume_id=resume_id, user_id=current_user.id))
+            return envelope(serialize_resume(resume, raw_json(content_json)), headers=resume_headers(resume))
 
         # 更新字段
         resume.title = resume_data.title
         resume.template_id = resume_data.template_id
-        resume.content = resume_data.content.model_dump_json()
+        resume.content = content_json
 
-        db.commit()
+        try:
+            db.commit()
+        except StaleDataError:
+            db.rollback()
+            logger.warning(LogEvent("简历更新冲突", resume_id=resume_id, user_id=current_user.id))
+            raise write_conflict(request)
         db.refresh(resume)
 
-        logger.info(f"简历更新成功: resume_id={resume_id}, user_id={current_user.id}")
-
-        return APIResponse(
-            success=True,
-            data={
-                "id": resume.id,
-                "user_id": resume.user_id,
-                "title": resume.title,
-                "template_id": resume.template_id,
-                "content": resume_data.content.model_dump(),
-                "created_at": resume.created_at.isoformat(),
-                "updated_at": resume.updated_at.isoformat(),
-            }
-        )
+        logger.info(LogEvent("简历更新成功", resume_id=resume_id, user_id=current_user.id, version=resume.version))
+
+        return envelope(serialize_resume(resume, raw_json(content_json)), headers=resume_headers(resume))
     except Exception as e:
-        logger.error(f"更新简历失败: resume_id={resume_id}, user_id={current_user.id}, error={str(e)}", exc_info=True)
+        logger.error(LogEvent("更新简历失败", resume_id=resume_id, user_id=current_user.id, error=str(e)), exc_info=True)
         raise
 
 
+@router.patch("/{resume_id}")
+def patch_resume(
+    resume_id: int,
+    request: Request,
+    patch: Union[List[Dict[str, Any]], Dict[str, Any]] = Body(...),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user),
+):
+    """局部更新简历内容
+
+    请求体为作用于 content 的 JSON Patch（application/json-patch+json，操作数组）
+    或 JSON Merge Patch（application/merge-patch+json，对象）。支持 If-Match，
+    响应只包含元数据和新的 ETag。
+    """
+    logger.info(LogEvent("局部更新简历", resume_id=resume_id, user_id=current_user.id))
+    try:
+        # 显式保存前先落盘该简历的自动保存
+        if autosave_buffer.flush([resume_id]):
+            db.expire_all()
+
+        # 获取并验证权限
+        resume = get_resume_by_id_for_user(resume_id, db, current_user)
+        check_if_match(request, resume)
+
+        content_json = patch_content(resume.content, patch, request.headers.get("content-type"))
+        if content_json == resume.content:
+            logger.info(LogEvent("简历内容未变化，跳过写入", resume_id=resume_id, user_id=current_user.id))
+            return envelope(serialize_patch_result(resume), headers=resume_headers(resume))
+
+        resume.content = content_json
+        try:
+            db.commit()
+        except StaleDataError:
+            db.rollback()
+            logger.warning(LogEvent("简历更新冲突", resume_id=resume_id, user_id=current_user.id))
+            raise write_conflict(request)
+        db.refresh(resume)
+
+        logger.info(LogEvent("简历局部更新成功", resume_id=resume_id, user_id=current_user.id, version=resume.version))
+
+        return envelope(serialize_patch_result(resume), headers=resume_headers(resume))
+    except Exception as e:
+        logger.error(LogEvent("局部更新简历失败", resume_id=resume_id, user_id=current_user.id, error=str(e)), exc_info=True)
+        raise
+
+
+@router.put("/{resume_id}/autosave", status_code=status.HTTP_202_ACCEPTED)
+def autosave_resume(
+    resume_id: int,
+    resume_data: ResumeUpdate,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user),
+):
+    """自动保存简历
+
+    写入进程内缓冲后立即返回 202 和新的 ETag，由后台线程合并落盘；
+    读接口可见缓冲中的版本，支持 If-Match。
+    """
+    current = autosave_buffer.get(resume_id)
+    if current is None or current.user_id != current_user.id:
+        current = get_resume_by_id_for_user(resume_id, db, current_user)
+    return buffer_autosave(request, current, resume_data)
+
+
 @router.delete("/{resume_id}")
 def delete_resume(
     resume_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
 ):
     """删除简历"""
-    logger.info(f"删除简历: resume_id={resume_id}, user_id={current_user.id}")
+    logger.info(LogEvent("删除简历", resume_id=resume_id, user_id=current_user.id))
     try:
         # 获取并验证权限
         resume = get_resume_by_id_for_user(resume_id, db, current_user)
 
         title = resume.title  # 保存标题用于日志
+        autosave_buffer.discard(resume_id)
         db.delete(resume)
         db.commit()
 
-        logger.info(f"简历删除成功: resume_id={resume_id}, user_id={current_user.id}, title={title}")
+        logger.info(LogEvent("简历删除成功", resume_id=resume_id, user_id=current_user.id, title=title))
 
-        return APIResponse(success=True, data=None)
+        return envelope(None)
     except Exception as e:
-        logger.error(f"删除简历失败: resume_id={resume_id}, user_id={current_user.id}, error={str(e)}", exc_info=True)
+        logger.error(LogEvent("删除简历失败", resume_id=resume_id, user_id=current_user.id, error=str(e)), exc_info=True)
         raise
 
 
@@ -181,13 +652,13 @@ def duplicate_resume(
     resume_id: int,
     duplicate_data: ResumeDuplicate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
 ):
     """复制简历"""
-    logger.info(f"复制简历: resume_id={resume_id}, user_id={current_user.id}")
+    logger.info(LogEvent("复制简历", resume_id=resume_id, user_id=current_user.id))
     try:
-        # 获取原简历
-        original_resume = get_resume_by_id_for_user(resume_id, db, current_user)
+        # 获取原简历（含未落盘的自动保存）
+        original_resume = autosave_buffer.overlay(get_resume_by_id_for_user(resume_id, db, current_user))
 
         # 确定新标题
         new_title = duplicate_data.title if duplicate_data.title else f"{original_resume.title} (副本)"
@@ -203,21 +674,124 @@ def duplicate_resume(
         db.commit()
         db.refresh(new_resume)
 
-        logger.info(f"简历复制成功: original_id={resume_id}, new_id={new_resume.id}, user_id={current_user.id}, title={new_title}")
-
-        content = json.loads(new_resume.content)
-        return APIResponse(
-            success=True,
-            data={
-                "id": new_resume.id,
-                "user_id": new_resume.user_id,
-                "title": new_resume.title,
-                "template_id": new_resume.template_id,
-                "content": content,
-                "created_at": new_resume.created_at.isoformat(),
-                "updated_at": new_resume.updated_at.isoformat(),
-            }
+        logger.info(LogEvent("简历复制成功", original_id=resume_id, new_id=new_resume.id, user_id=current_user.id, title=new_title))
+
+        return envelope(
+            serialize_resume(new_resume, raw_json(new_resume.content)),
+            status_code=status.HTTP_201_CREATED,
+            headers=resume_headers(new_resume),
         )
     except Exception as e:
-        logger.error(f"复制简历失败: resume_id={resume_id}, user_id={current_user.id}, error={str(e)}", exc_info=True)
+        logger.error(LogEvent("复制简历失败", resume_id=resume_id, user_id=current_user.id, error=str(e)), exc_info=True)
         raise
+
+
+@router.get("/{resume_id}/revisions")
+def get_resume_revisions(
+    limit: int = Query(DEFAULT_REVISION_PAGE_SIZE, ge=1, le=200, description="每页数量"),
+    before: Optional[int] = Query(None, ge=1, description="上一页返回的 next_before"),
+    resume: Resume = Depends(get_resume_by_id_for_user),
+    db: Session = Depends(get_db),
+):
+    """获取简历修订列表（按修订号倒序，不含内容）"""
+    return envelope(list_revisions(db, resume.id, limit, before))
+
+
+@router.get("/{resume_id}/revisions/{number}")
+def get_resume_revision(
+    number: int,
+    resume: Resume = Depends(get_resume_by_id_for_user),
+    db: Session = Depends(get_db),
+):
+    """获取指定修订（由最近的快照加增量重建）"""
+    revision = load_revision(db, resume.id, number)
+    if revision is None:
+        raise revision_not_found()
+    return envelope(revision)
+
+
+@router.post("/{resume_id}/revisions/{number}/restore")
+def restore_resume_revision(
+    resume_id: int,
+    number: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user),
+):
+    """把简历恢复到指定修订，恢复本身也记录为一条新修订；支持 If-Match"""
+    logger.info(LogEvent("恢复简历修订", resume_id=resume_id, number=number, user_id=current_user.id))
+    try:
+        if autosave_buffer.flush([resume_id]):
+            db.expire_all()
+
+        # 获取并验证权限
+        resume = get_resume_by_id_for_user(resume_id, db, current_user)
+        check_if_match(request, resume)
+
+        revision = load_revision(db, resume_id, number)
+        if revision is None:
+            raise revision_not_found()
+        apply_revision(resume, revision)
+
+        try:
+            db.commit()
+        except StaleDataError:
+            db.rollback()
+            logger.warning(LogEvent("简历更新冲突", resume_id=resume_id, user_id=current_user.id))
+            raise write_conflict(request)
+        db.refresh(resume)
+
+        logger.info(LogEvent("简历修订恢复成功", resume_id=resume_id, number=number, version=resume.version))
+
+        return envelope(serialize_resume(resume, raw_json(resume.content)), headers=resume_headers(resume))
+    except Exception as e:
+        logger.error(LogEvent("恢复简历修订失败", resume_id=resume_id, number=number, error=str(e)), exc_info=True)
+        raise
+
+
+@router.post("/{resume_id}/match")
+def match_single_resume(
+    match_data: JobMatchRequest,
+    resume: Resume = Depends(get_resume_by_id_for_user),
+    db: Session = Depends(get_db),
+):
+    """用岗位描述为简历评分，返回命中和缺失的岗位关键词"""
+    query = parse_job_description(match_data)
+    data = match_resume(db, query, *match_source(resume))
+    return envelope({"resume_id": resume.id, **data})
+
+
+@router.post("/{resume_id}/pdf")
+def export_resume_pdf(
+    request: Request,
+    resume: Resume = Depends(get_resume_by_id_for_user),
+):
+    """服务端渲染简历 PDF
+
+    结果按 (模板版本, 内容) 缓存，ETag 即缓存键，客户端已有相同版本时返回 304。
+    """
+    resume = autosave_buffer.overlay(resume)
+    template_version = template_registry.version(resume.template_id) or ""
+    key = render_engine.cache_key(resume.template_id, template_version, resume.title, resume.content)
+    etag = f'"{key[:32]}"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    try:
+        pdf = render_engine.render(key, resume.template_id, resume.title, json.loads(resume.content))
+    except FutureTimeoutError:
+        logger.error(LogEvent("PDF 渲染超时", resume_id=resume.id))
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="PDF 渲染超时，请稍后重试",
+        )
+
+    filename = quote(f"{resume.title}.pdf")
+    return Response(
+        content=pdf,
+        media_type="application/pdf",
+        headers={
+            "ETag": etag,
+            "Content-Disposition": f"attachment; filename=\"resume.pdf\"; filename*=UTF-8''{filename}",
+        },
+    )
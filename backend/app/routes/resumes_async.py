@@ -0,0 +1,443 @@
+"""简历相关 API（异步数据库版本）
+
+DB_ASYNC 开启时由 main.py 用这里的路由覆盖 resumes.py 中同路径、同方法的路由，
+查询构造和序列化逻辑与同步版本共用。
+"""
+import logging
+from typing import Any, Dict, List, Optional, Union
+from fastapi import APIRouter, Body, Depends, Query, Request, status
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.db.async_session import get_async_db
+from app.models.resume import Resume
+from app.schemas.resume import ResumeCreate, ResumeUpdate, ResumeDuplicate, JobMatchRequest
+from app.core.responses import envelope, raw_json
+from app.api.deps_async import (
+    get_current_user_async,
+    get_current_user_readonly_async,
+    get_resume_by_id_for_user_async,
+)
+from app.core.user_cache import UserSnapshot
+from app.core.logging import LogEvent
+from app.routes.resumes import (
+    build_list_statement,
+    build_list_data,
+    serialize_resume,
+    resume_headers,
+    resume_response,
+    check_if_match,
+    write_conflict,
+    is_unchanged,
+    patch_content,
+    serialize_patch_result,
+    buffer_autosave,
+    DEFAULT_REVISION_PAGE_SIZE,
+    DEFAULT_SEARCH_LIMIT,
+    DEFAULT_MATCH_LIMIT,
+    parse_job_description,
+    build_match_statement,
+    match_candidates,
+    match_source,
+    export_response,
+    validate_import_batch,
+    bulk_import_failed,
+    revision_not_found,
+    apply_revision,
+)
+from app.services.autosave import autosave_buffer
+from app.services.revisions import list_revisions, load_revision
+from app.services.search import search_resumes
+from app.services.export import aiter_export
+from app.services.bulk_import import (
+    BulkImportError,
+    ImportEntry,
+    ImportItem,
+    import_results,
+    import_summary,
+    insert_resumes,
+    is_ndjson,
+    iter_import_batches,
+)
+from app.services.matching import match_resume, rank_resumes
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+async def store_import_batch(db: AsyncSession, user_id: int, template_id: str, batch: List[ImportEntry]) -> List[dict]:
+    """校验并在一个事务中写入一批导入的简历，写入失败时整批回滚"""
+    entries = validate_import_batch(batch, template_id)
+    items = [entry for entry in entries if isinstance(entry, ImportItem)]
+    if not items:
+        return import_results(entries)
+    try:
+        ids = await db.run_sync(lambda session: insert_resumes(session, user_id, items))
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error(LogEvent("批量导入写入失败", user_id=user_id, count=len(items), error=str(e)), exc_info=True)
+        return import_results(entries, error="写入数据库失败")
+    return import_results(entries, ids)
+
+
+@router.get("")
+async def get_resumes(
+    summary: bool = Query(False, description="仅返回摘要字段，不含 content"),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="每页数量，启用游标分页"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_readonly_async),
+):
+    """获取用户的所有简历"""
+    logger.info(LogEvent("获取用户简历列表", user_id=current_user.id, email=current_user.email))
+    stmt = build_list_statement(current_user.id, summary, limit, cursor)
+    result = await db.execute(stmt)
+    resumes = result.all() if summary else result.scalars().all()
+    data = build_list_data(resumes, summary, limit, cursor)
+    logger.info(LogEvent("成功获取用户简历列表", user_id=current_user.id, count=len(resumes)))
+    return envelope(data)
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def create_resume(
+    resume_data: ResumeCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+):
+    """创建新简历"""
+    logger.info(LogEvent("创建简历", user_id=current_user.id, title=resume_data.title, template=resume_data.template_id))
+    try:
+        content_json = resume_data.content.model_dump_json()
+        new_resume = Resume(
+            user_id=current_user.id,
+            title=resume_data.title,
+            template_id=resume_data.template_id,
+            content=content_json,
+        )
+        db.add(new_resume)
+        await db.commit()
+        await db.refresh(new_resume)
+
+        logger.info(LogEvent("简历创建成功", resume_id=new_resume.id, user_id=current_user.id))
+
+        return envelope(
+            serialize_resume(new_resume, raw_json(content_json)),
+            status_code=status.HTTP_201_CREATED,
+            headers=resume_headers(new_resume),
+        )
+    except Exception as e:
+        logger.error(LogEvent("创建简历失败", user_id=current_user.id, title=resume_data.title, error=str(e)), exc_info=True)
+        raise
+
+
+@router.post("/bulk")
+async def bulk_import_resumes(
+    request: Request,
+    template_id: str = Query("modern", description="JSON Resume 格式的简历使用的模板"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+):
+    """批量导入简历（JSON 数组或 NDJSON，本站格式或 JSON Resume），逐项返回结果"""
+    results: List[dict] = []
+    try:
+        batches = iter_import_batches(request.stream(), is_ndjson(request.headers.get("content-type")))
+        async for batch in batches:
+            results.extend(await store_import_batch(db, current_user.id, template_id, batch))
+    except BulkImportError as e:
+        raise bulk_import_failed(e)
+    data = import_summary(results)
+    logger.info(LogEvent("批量导入简历", user_id=current_user.id, created=data['created'], failed=data['failed']))
+    return envelope(data)
+
+
+@router.get("/search")
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="检索词，空格分隔的各项都须命中，双引号表示短语"),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=50, description="返回条数"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_readonly_async),
+):
+    """全文检索当前用户的简历"""
+    items = await db.run_sync(lambda session: search_resumes(session, current_user.id, q, limit))
+    logger.info(LogEvent("检索简历", user_id=current_user.id, count=len(items)))
+    return envelope({"items": items})
+
+
+@router.get("/export")
+async def export_resumes(
+    format: str = Query("zip", pattern="^(zip|ndjson)$", description="导出格式：zip 或 ndjson"),
+    schema: str = Query("native", pattern="^(native|jsonresume)$", description="内容格式：native 或 jsonresume"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_readonly_async),
+):
+    """流式导出当前用户的全部简历"""
+    logger.info(LogEvent("导出简历", user_id=current_user.id, format=format, schema=schema))
+    return export_response(aiter_export(db.bind, current_user.id, format, schema), format, schema)
+
+
+@router.post("/match")
+async def match_all_resumes(
+    match_data: JobMatchRequest,
+    limit: int = Query(DEFAULT_MATCH_LIMIT, ge=1, le=1000, description="返回条数"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_readonly_async),
+):
+    """用岗位描述为当前用户的全部简历评分并排序"""
+    query = parse_job_description(match_data)
+    candidates = match_candidates((await db.execute(build_match_statement(current_user.id))).all())
+    items = await db.run_sync(lambda session: rank_resumes(session, query, candidates, limit))
+    logger.info(LogEvent("批量岗位匹配", user_id=current_user.id, count=len(candidates)))
+    return envelope({"items": items})
+
+
+@router.get("/{resume_id}")
+async def get_resume(
+    request: Request,
+    resume: Resume = Depends(get_resume_by_id_for_user_async),
+):
+    """获取简历详情（支持 If-None-Match 条件请求）"""
+    return resume_response(request, resume)
+
+
+@router.put("/{resume_id}")
+async def update_resume(
+    resume_id: int,
+    resume_data: ResumeUpdate,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+):
+    """更新简历（If-Match 语义同同步版本）"""
+    logger.info(LogEvent("更新简历", resume_id=resume_id, user_id=current_user.id, title=resume_data.title))
+    try:
+        # 显式保存前先落盘该简历的自动保存
+        if await autosave_buffer.flush_async([resume_id]):
+            db.expire_all()
+
+        # 获取并验证权限
+        resume = await get_resume_by_id_for_user_async(resume_id, db, current_user)
+        check_if_match(request, resume)
+
+        content_json = resume_data.content.model_dump_json()
+        if is_unchanged(resume, resume_data, content_json):
+            logger.info(LogEvent("简历内容未变化，跳过写入", resume_id=resume_id, user_id=current_user.id))
+            return envelope(serialize_resume(resume, raw_json(content_json)), headers=resume_headers(resume))
+
+        # 更新字段
+        resume.title = resume_data.title
+        resume.template_id = resume_data.template_id
+        resume.content = content_json
+
+        try:
+            await db.commit()
+        except StaleDataError:
+            await db.rollback()
+            logger.warning(LogEvent("简历更新冲突", resume_id=resume_id, user_id=current_user.id))
+            raise write_conflict(request)
+        await db.refresh(resume)
+
+        logger.info(LogEvent("简历更新成功", resume_id=resume_id, user_id=current_user.id, version=resume.version))
+
+        return envelope(serialize_resume(resume, raw_json(content_json)), headers=resume_headers(resume))
+    except Exception as e:
+        logger.error(LogEvent("更新简历失败", resume_id=resume_id, user_id=current_user.id, error=str(e)), exc_info=True)
+        raise
+
+
+@router.patch("/{resume_id}")
+async def patch_resume(
+    resume_id: int,
+    request: Request,
+    patch: Union[List[Dict[str, Any]], Dict[str, Any]] = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+):
+    """局部更新简历内容（请求格式同同步版本）"""
+    logger.info(LogEvent("局部更新简历", resume_id=resume_id, user_id=current_user.id))
+    try:
+        # 显式保存前先落盘该简历的自动保存
+        if await autosave_buffer.flush_async([resume_id]):
+            db.expire_all()
+
+        # 获取并验证权限
+        resume = await get_resume_by_id_for_user_async(resume_id, db, current_user)
+        check_if_match(request, resume)
+
+        content_json = patch_content(resume.content, patch, request.headers.get("content-type"))
+        if content_json == resume.content:
+            logger.info(LogEvent("简历内容未变化，跳过写入", resume_id=resume_id, user_id=current_user.id))
+            return envelope(serialize_patch_result(resume), headers=resume_headers(resume))
+
+        resume.content = content_json
+        try:
+            await db.commit()
+        except StaleDataError:
+            await db.rollback()
+            logger.warning(LogEvent("简历更新冲突", resume_id=resume_id, user_id=current_user.id))
+            raise write_conflict(request)
+        await db.refresh(resume)
+
+        logger.info(LogEvent("简历局部更新成功", resume_id=resume_id, user_id=current_user.id, version=resume.version))
+
+        return envelope(serialize_patch_result(resume), headers=resume_headers(resume))
+    except Exception as e:
+        logger.error(LogEvent("局部更新简历失败", resume_id=resume_id, user_id=current_user.id, error=str(e)), exc_info=True)
+        raise
+
+
+@router.put("/{resume_id}/autosave", status_code=status.HTTP_202_ACCEPTED)
+async def autosave_resume(
+    resume_id: int,
+    resume_data: ResumeUpdate,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+):
+    """自动保存简历（写入进程内缓冲，见同步版本）"""
+    current = autosave_buffer.get(resume_id)
+    if current is None or current.user_id != current_user.id:
+        current = await get_resume_by_id_for_user_async(resume_id, db, current_user)
+    return buffer_autosave(request, current, resume_data)
+
+
+@router.delete("/{resume_id}")
+async def delete_resume(
+    resume_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+):
+    """删除简历"""
+    logger.info(LogEvent("删除简历", resume_id=resume_id, user_id=current_user.id))
+    try:
+        # 获取并验证权限
+        resume = await get_resume_by_id_for_user_async(resume_id, db, current_user)
+
+        title = resume.title  # 保存标题用于日志
+        autosave_buffer.discard(resume_id)
+        await db.delete(resume)
+        await db.commit()
+
+        logger.info(LogEvent("简历删除成功", resume_id=resume_id, user_id=current_user.id, title=title))
+
+        return envelope(None)
+    except Exception as e:
+        logger.error(LogEvent("删除简历失败", resume_id=resume_id, user_id=current_user.id, error=str(e)), exc_info=True)
+        raise
+
+
+@router.post("/{resume_id}/duplicate", status_code=status.HTTP_201_CREATED)
+async def duplicate_resume(
+    resume_id: int,
+    duplicate_data: ResumeDuplicate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+):
+    """复制简历"""
+    logger.info(LogEvent("复制简历", resume_id=resume_id, user_id=current_user.id))
+    try:
+        # 获取原简历（含未落盘的自动保存）
+        original_resume = autosave_buffer.overlay(await get_resume_by_id_for_user_async(resume_id, db, current_user))
+
+        # 确定新标题
+        new_title = duplicate_data.title if duplicate_data.title else f"{original_resume.title} (副本)"
+
+        # 创建新简历
+        new_resume = Resume(
+            user_id=current_user.id,
+            title=new_title,
+            template_id=original_resume.template_id,
+            content=original_resume.content,
+        )
+        db.add(new_resume)
+        await db.commit()
+        await db.refresh(new_resume)
+
+        logger.info(LogEvent("简历复制成功", original_id=resume_id, new_id=new_resume.id, user_id=current_user.id, title=new_title))
+
+        return envelope(
+            serialize_resume(new_resume, raw_json(new_resume.content)),
+            status_code=status.HTTP_201_CREATED,
+            headers=resume_headers(new_resume),
+        )
+    except Exception as e:
+        logger.error(LogEvent("复制简历失败", resume_id=resume_id, user_id=current_user.id, error=str(e)), exc_info=True)
+        raise
+
+
+@router.get("/{resume_id}/revisions")
+async def get_resume_revisions(
+    limit: int = Query(DEFAULT_REVISION_PAGE_SIZE, ge=1, le=200, description="每页数量"),
+    before: Optional[int] = Query(None, ge=1, description="上一页返回的 next_before"),
+    resume: Resume = Depends(get_resume_by_id_for_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """获取简历修订列表（按修订号倒序，不含内容）"""
+    data = await db.run_sync(lambda session: list_revisions(session, resume.id, limit, before))
+    return envelope(data)
+
+
+@router.get("/{resume_id}/revisions/{number}")
+async def get_resume_revision(
+    number: int,
+    resume: Resume = Depends(get_resume_by_id_for_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """获取指定修订（由最近的快照加增量重建）"""
+    revision = await db.run_sync(lambda session: load_revision(session, resume.id, number))
+    if revision is None:
+        raise revision_not_found()
+    return envelope(revision)
+
+
+@router.post("/{resume_id}/revisions/{number}/restore")
+async def restore_resume_revision(
+    resume_id: int,
+    number: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+):
+    """把简历恢复到指定修订（见同步版本）"""
+    logger.info(LogEvent("恢复简历修订", resume_id=resume_id, number=number, user_id=current_user.id))
+    try:
+        if await autosave_buffer.flush_async([resume_id]):
+            db.expire_all()
+
+        # 获取并验证权限
+        resume = await get_resume_by_id_for_user_async(resume_id, db, current_user)
+        check_if_match(request, resume)
+
+        revision = await db.run_sync(lambda session: load_revision(session, resume_id, number))
+        if revision is None:
+            raise revision_not_found()
+        apply_revision(resume, revision)
+
+        try:
+            await db.commit()
+        except StaleDataError:
+            await db.rollback()
+            logger.warning(LogEvent("简历更新冲突", resume_id=resume_id, user_id=current_user.id))
+            raise write_conflict(request)
+        await db.refresh(resume)
+
+        logger.info(LogEvent("简历修订恢复成功", resume_id=resume_id, number=number, version=resume.version))
+
+        return envelope(serialize_resume(resume, raw_json(resume.content)), headers=resume_headers(resume))
+    except Exception as e:
+        logger.error(LogEvent("恢复简历修订失败", resume_id=resume_id, number=number, error=str(e)), exc_info=True)
+        raise
+
+
+@router.post("/{resume_id}/match")
+async def match_single_resume(
+    match_data: JobMatchRequest,
+    resume: Resume = Depends(get_resume_by_id_for_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """用岗位描述为简历评分，返回命中和缺失的岗位关键词"""
+    query = parse_job_description(match_data)
+    key, content = match_source(resume)
+    data = await db.run_sync(lambda session: match_resume(session, query, key, content))
+    return envelope({"resume_id": resume.id, **data})
@@ -1,5 +1,5 @@
 """简历相关的 Schema"""
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
@@ -37,6 +37,7 @@ class ResumeResponse(ResumeBase):
     user_id: int
     created_at: datetime
     updated_at: datetime
+    version: int
 
     class Config:
         from_attributes = True
@@ -55,3 +56,8 @@ class ResumeListItem(BaseModel):
 class ResumeDuplicate(BaseModel):
     """简历复制 Schema"""
     title: Optional[str] = None
+
+
+class JobMatchRequest(BaseModel):
+    """岗位匹配请求 Schema"""
+    job_description: str = Field(..., min_length=1, max_length=20000)
@@ -0,0 +1 @@
+"""服务模块"""
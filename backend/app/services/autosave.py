@@ -0,0 +1,256 @@
+"""自动保存写缓冲
+
+编辑器每隔几秒就会自动保存一次，逐次 commit 代价很高。这里在进程内按简历 id
+只保留最新的一份待写入版本，由后台线程按时间间隔或数量阈值合并到一个事务里批量写入；
+显式保存（PUT / PATCH）前和应用关闭时同步落盘。
+
+待写入版本对读接口可见（overlay），其 version 就是落盘后数据库中的版本号，
+因此 ETag / If-Match 在落盘前后保持一致。
+"""
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.core.content_codec import decode_content
+from app.models.content_blob import acquire_blobs, content_hash, release_blobs
+from app.models.resume import Resume
+from app.services.revisions import RevisionChange, record_revisions
+from app.services.search import index_resumes
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PendingSave:
+    """待写入的简历版本（字段与 Resume 同名，可直接用于序列化）"""
+
+    id: int
+    user_id: int
+    title: str
+    template_id: str
+    content: str
+    created_at: datetime
+    updated_at: datetime
+    version: int
+    base_version: int  # 数据库中当前的版本号，落盘时用作乐观锁条件
+
+
+class AutosaveBuffer:
+    """按简历 id 合并的写缓冲"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        flush_interval: float = 2.0,
+        max_pending: int = 200,
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[int, PendingSave] = {}
+        self._flushing: Dict[int, PendingSave] = {}  # 正在写入的批次，提交前仍对读可见
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._saves = 0
+        self._flushes = 0
+        self._rows_written = 0
+        self._conflicts = 0
+
+    def get(self, resume_id: int) -> Optional[PendingSave]:
+        """读取尚未落盘的最新版本"""
+        with self._lock:
+            return self._pending.get(resume_id) or self._flushing.get(resume_id)
+
+    def overlay(self, resume: Any) -> Any:
+        """有待写入版本时用它替换数据库中的记录"""
+        return self.get(resume.id) or resume
+
+    def put(self, current: Any, title: str, template_id: str, content: str) -> PendingSave:
+        """缓冲一次自动保存，current 为当前生效的版本（数据库记录或待写入版本）"""
+        with self._lock:
+            queued = self._pending.get(current.id)
+            entry = PendingSave(
+                id=current.id,
+                user_id=current.user_id,
+                title=title,
+                template_id=template_id,
+                content=content,
+                created_at=current.created_at,
+                updated_at=datetime.utcnow().replace(microsecond=0),
+                version=current.version + 1,
+                base_version=queued.base_version if queued is not None else current.version,
+            )
+            self._pending[current.id] = entry
+            self._saves += 1
+            if len(self._pending) >= self.max_pending:
+                self._wake.set()
+        return entry
+
+    def discard(self, resume_id: int) -> None:
+        """丢弃待写入版本（简历被删除时）"""
+        with self._lock:
+            self._pending.pop(resume_id, None)
+
+    def flush(self, resume_ids: Optional[Iterable[int]] = None) -> int:
+        """把待写入版本在一个事务中批量写入，返回写入行数
+
+        resume_ids 为空时写入全部；写入失败时放回缓冲并抛出异常。
+        """
+        with self._flush_lock:
+            with self._lock:
+                if resume_ids is None:
+                    batch, self._pending = self._pending, {}
+                else:
+                    batch = {rid: self._pending.pop(rid) for rid in resume_ids if rid in self._pending}
+                if not batch:
+                    return 0
+                self._flushing = batch
+
+            try:
+                written = self._write(list(batch.values()))
+            except Exception:
+                with self._lock:
+                    # 写入期间又有新的保存时以新的为准
+                    for rid, entry in batch.items():
+                        self._pending.setdefault(rid, entry)
+                    self._flushing = {}
+                raise
+
+            with self._lock:
+                self._flushing = {}
+                self._flushes += 1
+                self._rows_written += written
+                self._conflicts += len(batch) - written
+            if written < len(batch):
+                logger.warning(f"自动保存落盘时有 {len(batch) - written} 条版本冲突，已丢弃")
+            return written
+
+    async def flush_async(self, resume_ids: Optional[Iterable[int]] = None) -> int:
+        """异步路由使用：没有待写入版本时不切换线程"""
+        if resume_ids is not None:
+            resume_ids = [rid for rid in resume_ids if self.get(rid) is not None]
+            if not resume_ids:
+                return 0
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.flush, resume_ids)
+
+    def _write(self, entries: List[PendingSave]) -> int:
+        table = Resume.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"), table.c.version == bindparam("b_base_version"))
+            .values(
+                title=bindparam("b_title"),
+                template_id=bindparam("b_template_id"),
+                content_hash=bindparam("b_content_hash"),
+                version=bindparam("b_version"),
+                updated_at=func.now(),
+            )
+        )
+        params = [
+            {
+                "b_id": entry.id,
+                "b_base_version": entry.base_version,
+                "b_title": entry.title,
+                "b_template_id": entry.template_id,
+                "b_content_hash": content_hash(entry.content),
+                "b_version": entry.version,
+            }
+            for entry in entries
+        ]
+        db = self.session_factory()
+        try:
+            # 写入前的内容用于生成修订增量，旧的内容块在写入后释放引用
+            ids = [entry.id for entry in entries]
+            old_rows = {
+                row.id: row
+                for row in db.execute(
+                    select(Resume.id, Resume.content_hash, Resume.stored_content).where(Resume.id.in_(ids))
+                )
+            }
+            acquire_blobs(db, [entry.content for entry in entries])
+            written = db.execute(stmt, params).rowcount
+            rejected: List[PendingSave] = []
+            if written < len(entries):
+                # 有版本冲突时只为确实写入的行记录修订，未写入的内容退回引用
+                current = dict(db.execute(select(table.c.id, table.c.version).where(table.c.id.in_(ids))).all())
+                rejected = [entry for entry in entries if current.get(entry.id) != entry.version]
+                entries = [entry for entry in entries if current.get(entry.id) == entry.version]
+            release_blobs(db, [content_hash(entry.content) for entry in rejected] + [
+                old_rows[entry.id].content_hash for entry in entries if entry.id in old_rows
+            ])
+            record_revisions(db, [
+                RevisionChange(entry.id, entry.version, entry.title, entry.template_id,
+                               decode_content(old_rows[entry.id].stored_content) if entry.id in old_rows else None, entry.content)
+                for entry in entries
+            ])
+            index_resumes(db, [(entry.id, entry.user_id, entry.title, entry.content) for entry in entries])
+            db.commit()
+            return written
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """缓冲状态：保存次数与实际提交次数"""
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "saves": self._saves,
+                "flushes": self._flushes,
+                "rows_written": self._rows_written,
+                "conflicts": self._conflicts,
+                "flush_interval": self.flush_interval,
+                "max_pending": self.max_pending,
+            }
+
+    def start(self) -> None:
+        """启动后台落盘线程"""
+        if self._flusher is not None:
+            return
+        self._stop.clear()
+        self._flusher = threading.Thread(target=self._run, name="autosave-flusher", daemon=True)
+        self._flusher.start()
+
+    def stop(self) -> None:
+        """停止后台线程并同步写入剩余版本"""
+        self._stop.set()
+        self._wake.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            started = time.perf_counter()
+            try:
+                written = self.flush()
+            except Exception as e:
+                logger.error(f"自动保存落盘失败: {e}", exc_info=True)
+                continue
+            if written:
+                logger.debug(f"自动保存落盘: rows={written}, elapsed={(time.perf_counter() - started) * 1000:.1f}ms")
+
+
+autosave_buffer = AutosaveBuffer(
+    SessionLocal,
+    flush_interval=settings.AUTOSAVE_FLUSH_INTERVAL,
+    max_pending=settings.AUTOSAVE_MAX_PENDING,
+)
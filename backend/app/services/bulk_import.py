@@ -0,0 +1,252 @@
+"""简历批量导入
+
+请求体为 JSON 数组或 NDJSON（每行一份），边接收边解析，每凑满 BULK_IMPORT_BATCH_SIZE
+份就校验并在一个事务里写入：内容块、简历行（多行 INSERT ... RETURNING）、初始修订和
+检索索引都按批执行，不再逐份 commit / refresh。
+
+每一项可以是本站格式（与创建接口相同的 title / template_id / content），也可以是
+JSON Resume。单项解析或校验失败只影响该项；JSON 数组中出现语法错误时无法定位
+后续各项，导入在该处停止，之前的批次已经提交。
+"""
+import codecs
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.content_blob import acquire_blobs, content_hash
+from app.models.resume import Resume
+from app.schemas.resume import ResumeCreate
+from app.services.json_resume import from_json_resume, is_json_resume
+from app.services.revisions import RevisionChange, record_revisions
+from app.services.search import index_resumes
+
+settings = get_settings()
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+# 单份简历的最大字节数，超过时停止导入（避免在缓冲区里无限累积）
+MAX_ITEM_BYTES = 1024 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+class BulkImportError(ValueError):
+    """请求体无法作为批量导入解析"""
+
+
+@dataclass(frozen=True)
+class ImportFailure:
+    """未能导入的一项"""
+
+    index: int
+    error: str
+
+
+@dataclass(frozen=True)
+class ImportItem:
+    """校验通过、待写入的一项"""
+
+    index: int
+    title: str
+    template_id: str
+    content: str
+
+
+# 请求体中的一项：解析出的文档，或解析失败的原因
+ImportEntry = Tuple[int, Any]
+
+
+def is_ndjson(content_type: Optional[str]) -> bool:
+    """按 Content-Type 判断请求体是否为 NDJSON"""
+    return (content_type or "").split(";")[0].strip().lower() in NDJSON_MEDIA_TYPES
+
+
+async def _iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[ImportEntry]:
+    """按行解析，空行跳过，单行格式错误不影响其余各行"""
+    buffer = b""
+    index = 0
+    async for chunk in chunks:
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield index, _parse_line(index, line)
+                index += 1
+        if len(buffer) > MAX_ITEM_BYTES:
+            yield index, ImportFailure(index, "单份简历超过 1MB，之后的内容未导入")
+            return
+    if buffer.strip():
+        yield index, _parse_line(index, buffer)
+
+
+def _parse_line(index: int, line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        return ImportFailure(index, "JSON 格式错误")
+
+
+class _TextReader:
+    """从字节块中增量读取 JSON 文本"""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self) -> bool:
+        """读入下一块，已读完时返回 False"""
+        if self.eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            chunk, self.eof = b"", True
+        try:
+            decoded = self._utf8.decode(chunk, final=self.eof)
+        except UnicodeDecodeError:
+            raise BulkImportError("请求体不是有效的 UTF-8 文本")
+        self.text = self.text[self.pos:] + decoded
+        self.pos = 0
+        return True
+
+    async def peek(self) -> Optional[str]:
+        """跳过空白，返回下一个字符（不消费），读完时返回 None"""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not await self.fill():
+                return None
+
+    async def value(self) -> Any:
+        """解析下一个 JSON 值，数据不完整时继续读入"""
+        await self.peek()
+        while True:
+            try:
+                value, self.pos = _decoder.raw_decode(self.text, self.pos)
+                return value
+            except ValueError:
+                if len(self.text) - self.pos > MAX_ITEM_BYTES or not await self.fill():
+                    raise
+
+
+async def _iter_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[ImportEntry]:
+    """逐项解析 JSON 数组，出现语法错误时停止"""
+    reader = _TextReader(chunks)
+    if await reader.peek() != "[":
+        raise BulkImportError("请求体应为 JSON 数组或 NDJSON")
+    reader.pos += 1
+    index = 0
+    try:
+        closed = await reader.peek() == "]"
+        while not closed:
+            document = await reader.value()
+            separator = await reader.peek()
+            if separator not in (",", "]"):
+                raise ValueError(separator)
+            reader.pos += 1
+            closed = separator == "]"
+            yield index, document
+            index += 1
+    except ValueError:
+        yield index, ImportFailure(index, "JSON 格式错误，之后的内容未导入")
+
+
+async def iter_import_batches(
+    chunks: AsyncIterator[bytes],
+    ndjson: bool,
+    batch_size: int = settings.BULK_IMPORT_BATCH_SIZE,
+    max_items: int = settings.BULK_IMPORT_MAX_ITEMS,
+) -> AsyncIterator[List[ImportEntry]]:
+    """把请求体按 batch_size 项分批，请求体开头就无法解析时抛出 BulkImportError"""
+    batch: List[ImportEntry] = []
+    async for index, document in (_iter_ndjson(chunks) if ndjson else _iter_array(chunks)):
+        if index >= max_items:
+            batch.append((index, ImportFailure(index, f"单次最多导入 {max_items} 份，之后的内容未导入")))
+            break
+        batch.append((index, document))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def validate_entry(index: int, document: Any, template_id: str) -> Union[ImportItem, ImportFailure]:
+    """校验一项，JSON Resume 先转换为本站格式（使用 template_id 指定的模板）"""
+    if isinstance(document, ImportFailure):
+        return document
+    if not isinstance(document, dict):
+        return ImportFailure(index, "每一项应为 JSON 对象")
+    if is_json_resume(document):
+        title, content = from_json_resume(document)
+        name = content["personalInfo"].get("name")
+        document = {
+            "title": title or (f"{name}的简历" if name else "导入的简历"),
+            "template_id": template_id,
+            "content": content,
+        }
+    try:
+        data = ResumeCreate.model_validate(document)
+    except ValidationError as e:
+        error = e.errors()[0]
+        location = ".".join(str(part) for part in error["loc"])
+        return ImportFailure(index, f"简历校验失败: {location} {error['msg']}")
+    return ImportItem(index, data.title, data.template_id, data.content.model_dump_json())
+
+
+def insert_resumes(db: Session, user_id: int, items: Sequence[ImportItem]) -> List[int]:
+    """在当前事务中写入一批简历，返回与 items 顺序对应的 id（不提交）"""
+    acquire_blobs(db, [item.content for item in items])
+    table = Resume.__table__
+    ids = db.execute(
+        insert(table).returning(table.c.id, sort_by_parameter_order=True),
+        [
+            {
+                "user_id": user_id,
+                "title": item.title,
+                "template_id": item.template_id,
+                "content_hash": content_hash(item.content),
+            }
+            for item in items
+        ],
+    ).scalars().all()
+    # Core 写入不会触发 ORM 事件，修订和检索索引需要自行维护
+    record_revisions(db, [
+        RevisionChange(resume_id, 1, item.title, item.template_id, None, item.content)
+        for resume_id, item in zip(ids, items)
+    ])
+    index_resumes(db, [(resume_id, user_id, item.title, item.content) for resume_id, item in zip(ids, items)], replace=False)
+    return list(ids)
+
+
+def import_results(
+    entries: Sequence[Union[ImportItem, ImportFailure]],
+    ids: Sequence[int] = (),
+    error: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """逐项结果：ids 与 entries 中的 ImportItem 按顺序对应，error 表示整批写入失败"""
+    created = iter(ids)
+    results = []
+    for entry in entries:
+        if isinstance(entry, ImportFailure):
+            results.append({"index": entry.index, "success": False, "error": entry.error})
+        elif error is not None:
+            results.append({"index": entry.index, "success": False, "error": error})
+        else:
+            results.append({"index": entry.index, "success": True, "id": next(created)})
+    return results
+
+
+def import_summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """批量导入响应数据"""
+    created = sum(1 for result in results if result["success"])
+    return {"created": created, "failed": len(results) - created, "items": results}
@@ -0,0 +1,168 @@
+"""简历批量导出
+
+按 id 顺序用服务端游标（yield_per）逐批读取当前用户的简历，边读边编码边输出，
+内存占用与简历数量无关。支持两种容器：
+- ndjson：每行一份简历
+- zip：每份简历一个 JSON 文件；输出不可寻址，zipfile 会在文件数据之后写入
+  数据描述符，无需回写本地文件头（只有末尾的中央目录随文件数增长，每项约百余字节）
+
+内容可按本站格式（与简历详情接口一致）或 JSON Resume（https://jsonresume.org）格式输出。
+导出在独立的连接上进行，不依赖请求结束时已关闭的会话。
+"""
+import json
+import zipfile
+from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Select, select
+from sqlalchemy.engine import Engine
+
+from app.core.content_codec import decode_content
+from app.core.responses import dumps, raw_json
+from app.models.content_blob import ContentBlob
+from app.models.resume import Resume
+from app.services.autosave import autosave_buffer
+from app.services.json_resume import to_json_resume
+
+# 导出格式 -> 响应类型
+EXPORT_FORMATS = {"zip": "application/zip", "ndjson": "application/x-ndjson"}
+EXPORT_SCHEMAS = ("native", "jsonresume")
+# 每批从数据库读取的行数
+EXPORT_BATCH_SIZE = 500
+# 攒够这么多字节再输出一块，减少小块写入的开销
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def build_export_statement(user_id: int) -> Select:
+    """导出查询：元数据与编码后的内容一起按 id 顺序读取"""
+    return (
+        select(
+            Resume.id,
+            Resume.title,
+            Resume.template_id,
+            Resume.created_at,
+            Resume.updated_at,
+            Resume.version,
+            ContentBlob.data,
+        )
+        .join(ContentBlob, ContentBlob.hash == Resume.content_hash)
+        .where(Resume.user_id == user_id)
+        .order_by(Resume.id)
+    )
+
+
+def export_entry(row: Any, schema: str) -> Tuple[str, Any]:
+    """把一行查询结果转换为 (ZIP 内文件名, 导出文档)，有未落盘的自动保存时以其为准"""
+    pending = autosave_buffer.get(row.id)
+    current = pending or row
+    content = pending.content if pending is not None else decode_content(row.data)
+
+    name = f"{row.id}.json"
+    if schema == "jsonresume":
+        return name, to_json_resume(current.title, json.loads(content), current.updated_at)
+    return name, {
+        "id": row.id,
+        "title": current.title,
+        "template_id": current.template_id,
+        "content": raw_json(content),
+        "created_at": current.created_at.isoformat(),
+        "updated_at": current.updated_at.isoformat(),
+        "version": current.version,
+    }
+
+
+class _ChunkBuffer:
+    """zipfile 的输出目标：不提供 tell/seek，写入的数据由 drain 取走"""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+class NdjsonWriter:
+    """每份简历编码为一行 JSON"""
+
+    def write(self, name: str, document: Any) -> bytes:
+        return dumps(document) + b"\n"
+
+    def close(self) -> bytes:
+        return b""
+
+
+class ZipWriter:
+    """每份简历写为 ZIP 中的一个 JSON 文件"""
+
+    def __init__(self):
+        self._buffer = _ChunkBuffer()
+        self._zip = zipfile.ZipFile(self._buffer, "w", compression=zipfile.ZIP_DEFLATED)
+
+    def write(self, name: str, document: Any) -> bytes:
+        self._zip.writestr(name, dumps(document))
+        return self._buffer.drain()
+
+    def close(self) -> bytes:
+        self._zip.close()
+        return self._buffer.drain()
+
+
+def make_writer(fmt: str) -> Any:
+    """按导出格式创建编码器"""
+    return ZipWriter() if fmt == "zip" else NdjsonWriter()
+
+
+class _Chunker:
+    """把编码结果攒成较大的块"""
+
+    def __init__(self, fmt: str, schema: str):
+        self.writer = make_writer(fmt)
+        self.schema = schema
+        self.pending = bytearray()
+
+    def feed(self, row: Any) -> Optional[bytes]:
+        self.pending += self.writer.write(*export_entry(row, self.schema))
+        if len(self.pending) < EXPORT_CHUNK_SIZE:
+            return None
+        return self.take()
+
+    def take(self) -> bytes:
+        data = bytes(self.pending)
+        self.pending.clear()
+        return data
+
+    def close(self) -> bytes:
+        self.pending += self.writer.close()
+        return self.take()
+
+
+def iter_export(bind: Engine, user_id: int, fmt: str, schema: str) -> Iterator[bytes]:
+    """逐块生成导出文件"""
+    chunker = _Chunker(fmt, schema)
+    with bind.connect() as conn:
+        result = conn.execution_options(yield_per=EXPORT_BATCH_SIZE).execute(build_export_statement(user_id))
+        for row in result:
+            chunk = chunker.feed(row)
+            if chunk:
+                yield chunk
+    yield chunker.close()
+
+
+async def aiter_export(bind: Any, user_id: int, fmt: str, schema: str) -> AsyncIterator[bytes]:
+    """逐块生成导出文件（异步引擎）"""
+    chunker = _Chunker(fmt, schema)
+    async with bind.connect() as conn:
+        result = await conn.stream(build_export_statement(user_id).execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for row in result:
+            chunk = chunker.feed(row)
+            if chunk:
+                yield chunk
+    yield chunker.close()
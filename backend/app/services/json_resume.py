@@ -0,0 +1,154 @@
+"""JSON Resume（https://jsonresume.org，v1.0.0）格式转换
+
+本站简历内容与 JSON Resume 字段大体一一对应；JSON Resume 中没有对应位置的
+字段（如 highlights、certificates）导入时并入描述或忽略。
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+JSON_RESUME_SCHEMA = "https://raw.githubusercontent.com/jsonresume/resume-schema/v1.0.0/schema.json"
+
+
+def _compact(value: Dict[str, Any]) -> Dict[str, Any]:
+    """去掉空值字段"""
+    return {key: item for key, item in value.items() if item not in (None, "", [], {})}
+
+
+def _items(content: Dict[str, Any], field: str) -> List[Dict[str, Any]]:
+    return [item for item in content.get(field) or [] if isinstance(item, dict)]
+
+
+def to_json_resume(title: str, content: Dict[str, Any], updated_at: Any) -> Dict[str, Any]:
+    """把简历内容转换为 JSON Resume v1.0.0 格式"""
+    info = content.get("personalInfo") or {}
+    basics = _compact({
+        "name": info.get("name"),
+        "label": info.get("title"),
+        "email": info.get("email"),
+        "phone": info.get("phone"),
+        "url": info.get("website"),
+        "summary": content.get("summary"),
+        "location": _compact({"address": info.get("location")}),
+        "profiles": [{"network": "LinkedIn", "url": info["linkedin"]}] if info.get("linkedin") else [],
+    })
+    return _compact({
+        "$schema": JSON_RESUME_SCHEMA,
+        "basics": basics,
+        "work": [
+            _compact({
+                "name": job.get("company"),
+                "position": job.get("position"),
+                "startDate": job.get("startDate"),
+                "endDate": None if job.get("current") else job.get("endDate"),
+                "summary": job.get("description"),
+            })
+            for job in _items(content, "workExperience")
+        ],
+        "education": [
+            _compact({
+                "institution": school.get("school"),
+                "area": school.get("major"),
+                "studyType": school.get("degree"),
+                "startDate": school.get("startDate"),
+                "endDate": school.get("endDate"),
+            })
+            for school in _items(content, "education")
+        ],
+        "skills": [{"name": skill} for skill in content.get("skills") or [] if skill],
+        "projects": [
+            _compact({
+                "name": project.get("name"),
+                "description": project.get("description"),
+                "keywords": project.get("technologies"),
+                "startDate": project.get("startDate"),
+                "endDate": project.get("endDate"),
+            })
+            for project in _items(content, "projects")
+        ],
+        "meta": _compact({
+            "version": "v1.0.0",
+            "lastModified": updated_at.isoformat() if updated_at else None,
+            "title": title,
+        }),
+    })
+
+
+def is_json_resume(document: Dict[str, Any]) -> bool:
+    """判断导入的文档是否为 JSON Resume 格式（本站格式必有 content 字段）"""
+    return "content" not in document and ("basics" in document or "$schema" in document)
+
+
+def _text(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) and value else None
+
+
+def _description(item: Dict[str, Any], key: str) -> Optional[str]:
+    """描述与 highlights 合并为一段文本"""
+    lines = [_text(item.get(key))] + [_text(line) for line in item.get("highlights") or []]
+    return "\n".join(line for line in lines if line) or None
+
+
+def from_json_resume(document: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, Any]]:
+    """把 JSON Resume 转换为 (标题, 本站简历内容)，标题取 meta.title，没有时为 None"""
+    basics = document.get("basics") if isinstance(document.get("basics"), dict) else {}
+    location = basics.get("location") if isinstance(basics.get("location"), dict) else {}
+    linkedin = next(
+        (
+            profile.get("url") or profile.get("username")
+            for profile in _items(basics, "profiles")
+            if str(profile.get("network", "")).lower() == "linkedin"
+        ),
+        None,
+    )
+    address = location.get("address") or " ".join(
+        part for part in (location.get("city"), location.get("region")) if isinstance(part, str) and part
+    )
+    personal_info = _compact({
+        "name": _text(basics.get("name")),
+        "title": _text(basics.get("label")),
+        "email": _text(basics.get("email")),
+        "phone": _text(basics.get("phone")),
+        "location": _text(address),
+        "linkedin": _text(linkedin),
+        "website": _text(basics.get("url")),
+    })
+    content = {
+        "personalInfo": personal_info,
+        "summary": _text(basics.get("summary")),
+        "workExperience": [
+            _compact({
+                "id": str(i),
+                "company": _text(job.get("name")),
+                "position": _text(job.get("position")),
+                "startDate": _text(job.get("startDate")),
+                "endDate": _text(job.get("endDate")) or "",
+                "current": not job.get("endDate"),
+                "description": _description(job, "summary"),
+            })
+            for i, job in enumerate(_items(document, "work"), 1)
+        ],
+        "education": [
+            _compact({
+                "id": str(i),
+                "school": _text(school.get("institution")),
+                "degree": _text(school.get("studyType")),
+                "major": _text(school.get("area")),
+                "startDate": _text(school.get("startDate")),
+                "endDate": _text(school.get("endDate")),
+            })
+            for i, school in enumerate(_items(document, "education"), 1)
+        ],
+        "skills": [skill["name"] for skill in _items(document, "skills") if _text(skill.get("name"))],
+        "projects": [
+            _compact({
+                "id": str(i),
+                "name": _text(project.get("name")),
+                "description": _description(project, "description"),
+                "technologies": [keyword for keyword in project.get("keywords") or [] if _text(keyword)],
+                "startDate": _text(project.get("startDate")),
+                "endDate": _text(project.get("endDate")),
+            })
+            for i, project in enumerate(_items(document, "projects"), 1)
+        ],
+    }
+    meta = document.get("meta") if isinstance(document.get("meta"), dict) else {}
+    return _text(meta.get("title")), content
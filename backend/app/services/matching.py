@@ -0,0 +1,278 @@
+"""岗位描述匹配评分
+
+把岗位描述当作查询，用 BM25 对简历的 skills / workExperience / projects 打分。
+中文按相邻两字切分（单字区分度太低），英文数字按词切分并转小写，
+词项经 CRC32 哈希到固定维度，简历表示为 (词项 id, 加权词频) 的稀疏向量。
+
+批量评分时把所有简历的稀疏向量拼接成一维数组，借助查询词的稠密查找表一次性
+算出全部命中项，再用 bincount 按简历累加，IDF 以参与评分的简历为语料计算。
+简历向量按 content_hash 缓存：内容一旦修改哈希随之改变，旧向量不会再被命中，
+由 LRU 淘汰；复制出的简历共用同一份向量。
+"""
+import json
+import re
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.content_codec import decode_content
+from app.models.content_blob import ContentBlob
+from app.services.search import CJK_CHARS, iter_texts
+
+settings = get_settings()
+
+HASH_DIM = 1 << 18
+BM25_K1 = 1.2
+BM25_B = 0.75
+# 参与匹配的字段及其词频权重
+FIELD_WEIGHTS = {"skills": 2.0, "workExperience": 1.0, "projects": 1.0}
+# 返回的命中词 / 缺失词个数
+TERMS_LIMIT = 20
+
+# 岗位描述中的套话，不参与匹配
+STOP_TERMS = frozenset({
+    "岗位", "职责", "任职", "要求", "以上", "以下", "相关", "经验", "优先", "熟悉", "具备",
+    "具有", "能力", "良好", "工作", "负责", "我们", "公司", "团队", "进行", "参与", "以及",
+    "或者", "并且", "至少", "描述", "职位",
+    "and", "or", "the", "a", "an", "of", "to", "in", "for", "with", "on", "as", "is", "are",
+    "be", "we", "you", "our", "your", "will", "experience", "years", "etc",
+})
+
+_TERM_RUN = re.compile(rf"([{CJK_CHARS}]+)|([^\W_{CJK_CHARS}]+)")
+
+
+def extract_terms(text: str) -> List[str]:
+    """切分词项：中文按相邻两字，英文数字按词"""
+    terms: List[str] = []
+    for cjk, word in _TERM_RUN.findall(text):
+        if cjk:
+            if len(cjk) == 1:
+                terms.append(cjk)
+            else:
+                terms.extend(cjk[i:i + 2] for i in range(len(cjk) - 1))
+        else:
+            terms.append(word.lower())
+    return [term for term in terms if term not in STOP_TERMS]
+
+
+def term_id(term: str) -> int:
+    """词项哈希到 [0, HASH_DIM)，进程间稳定"""
+    return zlib.crc32(term.encode("utf-8")) & (HASH_DIM - 1)
+
+
+@dataclass(frozen=True)
+class ResumeVector:
+    """简历的稀疏词频向量"""
+
+    ids: np.ndarray  # int32，升序、不重复的词项 id
+    tf: np.ndarray  # float32，按字段加权的词频
+    length: float  # 加权后的文档长度
+
+
+@dataclass(frozen=True)
+class MatchCandidate:
+    """参与批量评分的简历，content 为 None 时按 content_hash 从缓存或数据库读取"""
+
+    id: int
+    title: str
+    content_hash: str
+    content: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class MatchQuery:
+    """岗位描述解析出的查询"""
+
+    ids: np.ndarray  # int64，不重复的词项 id
+    weights: np.ndarray  # float32，查询词频饱和后的权重
+    terms: List[str]  # 与 ids 对应的词项原文
+
+
+def vectorize(content: Optional[str]) -> ResumeVector:
+    """把简历内容转换为稀疏向量"""
+    try:
+        data = json.loads(content) if content else {}
+    except ValueError:
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    counts: Counter = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for value in iter_texts(data.get(field)):
+            for term in extract_terms(value):
+                counts[term_id(term)] += weight
+    ids = sorted(counts)
+    tf = np.array([counts[i] for i in ids], dtype=np.float32)
+    return ResumeVector(np.array(ids, dtype=np.int32), tf, float(tf.sum()))
+
+
+def build_query(job_description: str) -> Optional[MatchQuery]:
+    """解析岗位描述，没有可用词项时返回 None"""
+    counts: Dict[int, float] = {}
+    names: Dict[int, str] = {}
+    for term, qtf in Counter(extract_terms(job_description)).items():
+        tid = term_id(term)
+        counts[tid] = counts.get(tid, 0.0) + qtf
+        names.setdefault(tid, term)
+    if not counts:
+        return None
+    qtf = np.array(list(counts.values()), dtype=np.float32)
+    return MatchQuery(
+        ids=np.array(list(counts), dtype=np.int64),
+        weights=qtf * (BM25_K1 + 1) / (qtf + BM25_K1),
+        terms=[names[tid] for tid in counts],
+    )
+
+
+def score_vectors(query: MatchQuery, vectors: Sequence[ResumeVector]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """批量计算 BM25 得分
+
+    返回 (得分, 覆盖率, 命中项所属简历下标, 命中项对应的查询词下标)，
+    覆盖率为简历包含的查询词权重占全部查询词权重的比例。
+    """
+    n = len(vectors)
+    if n == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return np.zeros(0), np.zeros(0), empty, empty
+
+    lengths = np.array([vector.length for vector in vectors], dtype=np.float32)
+    sizes = np.array([len(vector.ids) for vector in vectors], dtype=np.int64)
+    all_ids = np.concatenate([vector.ids for vector in vectors])
+    all_tf = np.concatenate([vector.tf for vector in vectors])
+    doc_index = np.repeat(np.arange(n), sizes)
+
+    # 查询词的稠密查找表：词项 id -> 查询词下标，未出现为 -1
+    lookup = np.full(HASH_DIM, -1, dtype=np.int32)
+    lookup[query.ids] = np.arange(len(query.ids), dtype=np.int32)
+    slots = lookup[all_ids]
+    hit = slots >= 0
+    hit_doc = doc_index[hit]
+    hit_slot = slots[hit]
+    hit_tf = all_tf[hit]
+
+    df = np.bincount(hit_slot, minlength=len(query.ids))
+    idf = np.log1p((n - df + 0.5) / (df + 0.5))
+    avgdl = float(lengths.mean()) or 1.0
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / avgdl)
+    term_scores = hit_tf * (BM25_K1 + 1) / (hit_tf + norm[hit_doc]) * idf[hit_slot] * query.weights[hit_slot]
+
+    scores = np.bincount(hit_doc, weights=term_scores, minlength=n)
+    coverage = np.bincount(hit_doc, weights=query.weights[hit_slot], minlength=n) / float(query.weights.sum())
+    return scores, coverage, hit_doc, hit_slot
+
+
+class VectorCache:
+    """content_hash -> 简历向量的 LRU 缓存"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, ResumeVector]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[ResumeVector]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key: str, vector: ResumeVector) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """命中/未命中计数"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+vector_cache = VectorCache(maxsize=settings.MATCH_CACHE_SIZE)
+
+
+def load_vectors(db: Session, candidates: Sequence[Tuple[str, Optional[str]]]) -> List[ResumeVector]:
+    """按 (content_hash, content) 取简历向量，content 为 None 时未命中缓存才从数据库读取"""
+    vectors: Dict[str, ResumeVector] = {}
+    missing: Dict[str, Optional[str]] = {}
+    for key, content in candidates:
+        if key in vectors or key in missing:
+            continue
+        vector = vector_cache.get(key)
+        if vector is None:
+            missing[key] = content
+        else:
+            vectors[key] = vector
+
+    unloaded = [key for key, content in missing.items() if content is None]
+    if unloaded:
+        rows = db.execute(select(ContentBlob.hash, ContentBlob.data).where(ContentBlob.hash.in_(unloaded)))
+        for key, data in rows:
+            missing[key] = decode_content(data)
+    for key, content in missing.items():
+        vector = vectorize(content)
+        vector_cache.put(key, vector)
+        vectors[key] = vector
+    return [vectors[key] for key, _ in candidates]
+
+
+def _term_lists(query: MatchQuery, slots: np.ndarray) -> Dict[str, List[str]]:
+    """按查询权重从高到低列出命中和缺失的词"""
+    matched = np.zeros(len(query.ids), dtype=bool)
+    matched[slots] = True
+    order = np.argsort(-query.weights, kind="stable")
+    return {
+        "matched_terms": [query.terms[i] for i in order if matched[i]][:TERMS_LIMIT],
+        "missing_terms": [query.terms[i] for i in order if not matched[i]][:TERMS_LIMIT],
+    }
+
+
+def match_resume(db: Session, query: MatchQuery, key: str, content: Optional[str]) -> Dict[str, Any]:
+    """为单份简历评分，并给出命中和缺失的岗位关键词"""
+    scores, coverage, _, hit_slot = score_vectors(query, load_vectors(db, [(key, content)]))
+    return {
+        "score": round(float(scores[0]), 4),
+        "coverage": round(float(coverage[0]), 4),
+        **_term_lists(query, hit_slot),
+    }
+
+
+def rank_resumes(db: Session, query: MatchQuery, candidates: Sequence[MatchCandidate], limit: int) -> List[Dict[str, Any]]:
+    """为多份简历评分并按得分排序"""
+    vectors = load_vectors(db, [(candidate.content_hash, candidate.content) for candidate in candidates])
+    scores, coverage, _, _ = score_vectors(query, vectors)
+    order = np.argsort(-scores, kind="stable")[:limit]
+    return [
+        {
+            "id": candidates[i].id,
+            "title": candidates[i].title,
+            "score": round(float(scores[i]), 4),
+            "coverage": round(float(coverage[i]), 4),
+        }
+        for i in order.tolist()
+    ]
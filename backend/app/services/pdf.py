@@ -0,0 +1,282 @@
+"""简历 PDF 渲染
+
+纯 Python 实现，不依赖第三方库：文字使用 PDF 内置的 Adobe-GB1 CID 字体
+STSong-Light（UniGB-UCS2-H 编码），阅读器自带该字体，无需嵌入即可显示中文。
+本模块不导入应用配置，可以安全地在 spawn 出来的渲染进程中导入。
+"""
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+# A4 页面尺寸（pt）
+PAGE_WIDTH = 595.0
+PAGE_HEIGHT = 842.0
+MARGIN = 50.0
+CONTENT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+
+FONT_NAME = "STSong-Light"
+
+Color = Tuple[float, float, float]
+
+# 模板主题：强调色、正文色、次要文字色
+THEMES: Dict[str, Dict[str, Color]] = {
+    "modern": {"accent": (0.145, 0.388, 0.922), "text": (0.122, 0.161, 0.216), "muted": (0.420, 0.447, 0.502)},
+    "classic": {"accent": (0.067, 0.094, 0.153), "text": (0.067, 0.094, 0.153), "muted": (0.294, 0.333, 0.388)},
+    "creative": {"accent": (0.486, 0.227, 0.929), "text": (0.122, 0.161, 0.216), "muted": (0.420, 0.447, 0.502)},
+}
+DEFAULT_THEME = "modern"
+
+
+def char_width(char: str) -> float:
+    """字符宽度（单位：字号的倍数），半角 0.5，全角 1.0"""
+    return 0.5 if ord(char) < 0x2E80 else 1.0
+
+
+def text_width(text: str, size: float) -> float:
+    """估算文本宽度（pt）"""
+    return sum(char_width(char) for char in text) * size
+
+
+def as_text(value: Any) -> str:
+    """内容字段按文本显示（Schema 允许任意 JSON 值，如数字）"""
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else str(value)
+
+
+def join_text(separator: str, values: List[Any]) -> str:
+    """拼接非空字段"""
+    return separator.join(as_text(value) for value in values if value)
+
+
+def wrap_text(text: str, size: float, max_width: float) -> List[str]:
+    """按宽度折行，英文优先在空格处断行"""
+    lines: List[str] = []
+    for paragraph in text.splitlines() or [""]:
+        line = ""
+        width = 0.0
+        for char in paragraph:
+            w = char_width(char) * size
+            if width + w > max_width and line:
+                break_at = line.rfind(" ")
+                if char_width(char) == 0.5 and char != " " and break_at > 0:
+                    # 英文单词整体移到下一行
+                    lines.append(line[:break_at])
+                    line = line[break_at + 1:]
+                else:
+                    lines.append(line)
+                    line = ""
+                width = text_width(line, size)
+                if char == " " and not line:
+                    continue
+            line += char
+            width += w
+        lines.append(line)
+    return lines
+
+
+def encode_text(text: str) -> str:
+    """编码为 UCS-2 大端十六进制字符串（超出 BMP 的字符替换为 ?）"""
+    return "".join(
+        f"{ord(char):04X}" if ord(char) <= 0xFFFF else "003F"
+        for char in text
+    )
+
+
+def pdf_string(text: str) -> str:
+    """文档信息字典中使用的 UTF-16BE 字符串"""
+    return "<FEFF" + encode_text(text) + ">"
+
+
+class PdfDocument:
+    """逐页写入绘图指令，最后序列化为 PDF 字节"""
+
+    def __init__(self, title: str = ""):
+        self.title = title
+        self.pages: List[List[str]] = []
+        self.new_page()
+
+    def new_page(self) -> None:
+        self.pages.append([])
+
+    @property
+    def ops(self) -> List[str]:
+        return self.pages[-1]
+
+    def text(self, x: float, y: float, text: str, size: float, color: Color) -> None:
+        if not text:
+            return
+        self.ops.append(
+            f"BT /F1 {size:.2f} Tf {color[0]:.3f} {color[1]:.3f} {color[2]:.3f} rg "
+            f"{x:.2f} {y:.2f} Td <{encode_text(text)}> Tj ET"
+        )
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, width: float, color: Color) -> None:
+        self.ops.append(
+            f"{color[0]:.3f} {color[1]:.3f} {color[2]:.3f} RG {width:.2f} w "
+            f"{x1:.2f} {y1:.2f} m {x2:.2f} {y2:.2f} l S"
+        )
+
+    def to_bytes(self) -> bytes:
+        objects: List[bytes] = []
+
+        def add(body: bytes) -> int:
+            objects.append(body)
+            return len(objects)
+
+        catalog_id = add(b"")  # 占位，页面树确定后回填
+        pages_id = add(b"")
+        font_id = add(b"")
+        cid_font_id = add(b"")
+        descriptor_id = add(
+            f"<< /Type /FontDescriptor /FontName /{FONT_NAME} /Flags 6 "
+            f"/FontBBox [-25 -254 1000 880] /ItalicAngle 0 /Ascent 880 /Descent -120 "
+            f"/CapHeight 880 /StemV 93 >>".encode()
+        )
+        objects[cid_font_id - 1] = (
+            f"<< /Type /Font /Subtype /CIDFontType0 /BaseFont /{FONT_NAME} "
+            f"/CIDSystemInfo << /Registry (Adobe) /Ordering (GB1) /Supplement 2 >> "
+            f"/FontDescriptor {descriptor_id} 0 R /DW 1000 /W [1 95 500] >>".encode()
+        )
+        objects[font_id - 1] = (
+            f"<< /Type /Font /Subtype /Type0 /BaseFont /{FONT_NAME} /Encoding /UniGB-UCS2-H "
+            f"/DescendantFonts [{cid_font_id} 0 R] >>".encode()
+        )
+
+        page_ids = []
+        for ops in self.pages:
+            stream = zlib.compress("\n".join(ops).encode("ascii"))
+            content_id = add(
+                f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode()
+                + stream + b"\nendstream"
+            )
+            page_ids.append(add(
+                f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {PAGE_WIDTH:g} {PAGE_HEIGHT:g}] "
+                f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>".encode()
+            ))
+
+        kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+        objects[pages_id - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+        objects[catalog_id - 1] = f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode()
+        info_id = add(f"<< /Title {pdf_string(self.title)} /Producer (AwesomeCV) >>".encode())
+
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(out))
+            out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+        xref_offset = len(out)
+        out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+        for offset in offsets:
+            out += f"{offset:010d} 00000 n \n".encode()
+        out += (
+            f"trailer\n<< /Size {len(objects) + 1} /Root {catalog_id} 0 R /Info {info_id} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n"
+        ).encode()
+        return bytes(out)
+
+
+class ResumeLayout:
+    """自上而下排版，空间不足时自动换页"""
+
+    def __init__(self, doc: PdfDocument, theme: Dict[str, Color]):
+        self.doc = doc
+        self.theme = theme
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def ensure_space(self, height: float) -> None:
+        if self.y - height < MARGIN:
+            self.doc.new_page()
+            self.y = PAGE_HEIGHT - MARGIN
+
+    def paragraph(self, text: Any, size: float = 10.5, color: Optional[Color] = None,
+                  indent: float = 0.0, leading: float = 1.5) -> None:
+        color = color or self.theme["text"]
+        for line in wrap_text(as_text(text), size, CONTENT_WIDTH - indent):
+            self.ensure_space(size * leading)
+            self.y -= size * leading
+            self.doc.text(MARGIN + indent, self.y, line, size, color)
+
+    def row(self, left: Any, right: str, size: float = 11.5) -> None:
+        """左侧标题 + 右侧日期"""
+        left = as_text(left)
+        self.ensure_space(size * 1.6)
+        self.y -= size * 1.6
+        right_width = text_width(right, size - 1.5)
+        max_left = CONTENT_WIDTH - right_width - 12
+        left = wrap_text(left, size, max_left)[0] if left else ""
+        self.doc.text(MARGIN, self.y, left, size, self.theme["text"])
+        self.doc.text(PAGE_WIDTH - MARGIN - right_width, self.y, right, size - 1.5, self.theme["muted"])
+
+    def heading(self, text: str) -> None:
+        self.ensure_space(40)
+        self.y -= 22
+        self.doc.text(MARGIN, self.y, text, 13.5, self.theme["accent"])
+        self.y -= 6
+        self.doc.line(MARGIN, self.y, PAGE_WIDTH - MARGIN, self.y, 0.8, self.theme["accent"])
+        self.y -= 2
+
+    def space(self, height: float) -> None:
+        self.y -= height
+
+
+def date_range(item: Dict[str, Any]) -> str:
+    """格式化起止时间"""
+    start = item.get("startDate") or ""
+    end = "至今" if item.get("current") else (item.get("endDate") or "")
+    return f"{start} - {end}" if start or end else ""
+
+
+def render_resume_pdf(template_id: str, title: str, content: Dict[str, Any]) -> bytes:
+    """把简历内容按模板主题渲染为 PDF"""
+    theme = THEMES.get(template_id, THEMES[DEFAULT_THEME])
+    doc = PdfDocument(title=title)
+    layout = ResumeLayout(doc, theme)
+
+    info = content.get("personalInfo") or {}
+    layout.paragraph(info.get("name") or title, size=22, color=theme["accent"], leading=1.2)
+    if info.get("title"):
+        layout.paragraph(info["title"], size=12.5, color=theme["muted"])
+    contacts = [info.get(key) for key in ("email", "phone", "location", "website", "linkedin")]
+    contact_line = join_text("  |  ", contacts)
+    if contact_line:
+        layout.paragraph(contact_line, size=9.5, color=theme["muted"])
+
+    if content.get("summary"):
+        layout.heading("个人简介")
+        layout.paragraph(content["summary"])
+
+    if content.get("workExperience"):
+        layout.heading("工作经历")
+        for job in content["workExperience"]:
+            position = join_text(" · ", [job.get("company"), job.get("position")])
+            layout.row(position, date_range(job))
+            if job.get("description"):
+                layout.paragraph(job["description"], indent=4)
+            layout.space(4)
+
+    if content.get("education"):
+        layout.heading("教育背景")
+        for edu in content["education"]:
+            layout.row(edu.get("school"), date_range(edu))
+            detail = join_text(" · ", [edu.get("degree"), edu.get("major"), edu.get("gpa")])
+            if detail:
+                layout.paragraph(detail, color=theme["muted"], indent=4)
+            layout.space(4)
+
+    if content.get("skills"):
+        layout.heading("专业技能")
+        layout.paragraph(join_text(" · ", content["skills"]))
+
+    if content.get("projects"):
+        layout.heading("项目经历")
+        for project in content["projects"]:
+            layout.row(project.get("name"), date_range(project))
+            if project.get("description"):
+                layout.paragraph(project["description"], indent=4)
+            technologies = project.get("technologies") or []
+            if technologies:
+                layout.paragraph("技术栈：" + join_text("、", technologies), size=9.5,
+                                 color=theme["muted"], indent=4)
+            layout.space(4)
+
+    return doc.to_bytes()
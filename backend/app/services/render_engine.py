@@ -0,0 +1,162 @@
+"""PDF 渲染引擎
+
+渲染在独立的进程池中执行（spawn 启动，避免 fork 继承线程和锁），
+排队数量有上限，超过后立即拒绝。渲染结果按 (模板版本, 内容) 的哈希
+缓存在进程内 LRU 中，相同内容的重复下载直接命中缓存；同一份内容的并发
+请求只渲染一次。
+"""
+import hashlib
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+from app.core.config import get_settings
+from app.core.hashing import LatencyStats
+from app.services.pdf import render_resume_pdf
+
+settings = get_settings()
+
+# 渲染逻辑变化时递增，使旧缓存失效
+RENDERER_VERSION = "1"
+
+
+class RenderPoolSaturated(Exception):
+    """渲染进程池已满"""
+
+
+class RenderEngine:
+    """有界的 PDF 渲染进程池 + 结果缓存"""
+
+    def __init__(self, max_workers: int, max_queue: int, cache_max_bytes: int, timeout: float):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.cache_max_bytes = cache_max_bytes
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(max(max_workers, 1) + max_queue)
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cache_bytes = 0
+        self._inflight: Dict[str, Future] = {}
+        self._hits = 0
+        self._misses = 0
+        self._rejected = 0
+        self._render_latency = LatencyStats()
+
+    @staticmethod
+    def cache_key(template_id: str, template_version: str, title: str, content_json: str) -> str:
+        """渲染结果缓存键"""
+        digest = hashlib.sha256()
+        for part in (RENDERER_VERSION, template_id, template_version, title, content_json):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def render(self, key: str, template_id: str, title: str, content: Dict[str, Any]) -> bytes:
+        """渲染 PDF（优先读取缓存），进程池已满时抛出 RenderPoolSaturated"""
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return cached
+            self._misses += 1
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            # 同一内容正在渲染，等待其结果
+            return future.result(timeout=self.timeout)
+
+        try:
+            pdf = self._render(template_id, title, content)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self._cache_put(key, pdf)
+            future.set_result(pdf)
+            return pdf
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _render(self, template_id: str, title: str, content: Dict[str, Any]) -> bytes:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise RenderPoolSaturated("PDF 渲染队列已满")
+        started_at = time.perf_counter()
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                return render_resume_pdf(template_id, title, content)
+            return executor.submit(render_resume_pdf, template_id, title, content).result(timeout=self.timeout)
+        finally:
+            self._slots.release()
+            with self._lock:
+                self._render_latency.record(time.perf_counter() - started_at)
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """按需创建进程池；max_workers 为 0 时在当前线程内渲染"""
+        if self.max_workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _cache_put(self, key: str, pdf: bytes) -> None:
+        if len(pdf) > self.cache_max_bytes:
+            return
+        with self._lock:
+            if key in self._cache:
+                return
+            self._cache[key] = pdf
+            self._cache_bytes += len(pdf)
+            while self._cache_bytes > self.cache_max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= len(evicted)
+
+    def clear_cache(self) -> None:
+        """清空渲染缓存"""
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存命中与渲染耗时"""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "cache_entries": len(self._cache),
+                "cache_bytes": self._cache_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "rejected": self._rejected,
+                "render": self._render_latency.snapshot(),
+            }
+
+    def shutdown(self) -> None:
+        """关闭进程池"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+render_engine = RenderEngine(
+    max_workers=settings.PDF_RENDER_WORKERS,
+    max_queue=settings.PDF_RENDER_MAX_QUEUE,
+    cache_max_bytes=settings.PDF_CACHE_MAX_BYTES,
+    timeout=settings.PDF_RENDER_TIMEOUT,
+)
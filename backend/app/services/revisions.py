@@ -0,0 +1,188 @@
+"""简历修订历史
+
+每次写入简历都追加一条修订：每 REVISION_SNAPSHOT_INTERVAL 条保存一次完整快照，
+其余只保存相对上一条修订的 JSON Patch，存储增长与编辑量成正比。
+读取第 N 条修订时从不晚于 N 的最近一次快照开始依次应用增量。
+
+ORM 写入（创建、PUT、PATCH、恢复）由 after_flush 事件自动记录；
+自动保存缓冲这类 Core 批量写入需要自行调用 record_revisions。
+"""
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, event, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.json_patch import apply_patch, make_patch
+from app.core.responses import dumps
+from app.models.resume import Resume
+from app.models.revision import REVISION_DELTA, REVISION_SNAPSHOT, ResumeRevision
+
+settings = get_settings()
+
+# 列表接口返回的修订元数据（不含 data）
+REVISION_COLUMNS = (
+    ResumeRevision.number,
+    ResumeRevision.version,
+    ResumeRevision.kind,
+    ResumeRevision.title,
+    ResumeRevision.template_id,
+    ResumeRevision.created_at,
+    func.length(ResumeRevision.data).label("size"),
+)
+
+
+@dataclass(frozen=True)
+class RevisionChange:
+    """一次简历写入：old_content 为写入前的内容，未知时保存快照"""
+
+    resume_id: int
+    version: int
+    title: str
+    template_id: str
+    old_content: Optional[str]
+    new_content: str
+
+
+def is_snapshot_number(number: int) -> bool:
+    """第 1、1+K、1+2K … 条修订保存完整快照"""
+    interval = max(settings.REVISION_SNAPSHOT_INTERVAL, 1)
+    return (number - 1) % interval == 0
+
+
+def record_revisions(db: Session, changes: Sequence[RevisionChange]) -> None:
+    """在当前事务中追加修订记录"""
+    if not changes:
+        return
+    resume_ids = {change.resume_id for change in changes}
+    numbers: Dict[int, int] = dict(db.execute(
+        select(ResumeRevision.resume_id, func.max(ResumeRevision.number))
+        .where(ResumeRevision.resume_id.in_(resume_ids))
+        .group_by(ResumeRevision.resume_id)
+    ).all())
+
+    rows = []
+    for change in changes:
+        number = numbers.get(change.resume_id, 0) + 1
+        numbers[change.resume_id] = number
+        if change.old_content is None or is_snapshot_number(number):
+            kind, data = REVISION_SNAPSHOT, change.new_content
+        else:
+            kind = REVISION_DELTA
+            operations = make_patch(json.loads(change.old_content), json.loads(change.new_content))
+            data = dumps(operations).decode("utf-8")
+        rows.append({
+            "resume_id": change.resume_id,
+            "number": number,
+            "version": change.version,
+            "kind": kind,
+            "title": change.title,
+            "template_id": change.template_id,
+            "data": data,
+        })
+    db.execute(insert(ResumeRevision.__table__), rows)
+
+
+def _resume_changed(resume: Resume) -> Optional[RevisionChange]:
+    """根据属性历史判断本次 flush 是否修改了简历内容"""
+    attrs = inspect(resume).attrs
+    # 修改前的内容由 Resume.content 的 setter 记录
+    previous = resume.__dict__.pop("_previous_content", None)
+    content_changed = attrs.content_hash.history.has_changes()
+    if not (content_changed or attrs.title.history.has_changes() or attrs.template_id.history.has_changes()):
+        return None
+    return RevisionChange(
+        resume_id=resume.id,
+        version=resume.version,
+        title=resume.title,
+        template_id=resume.template_id,
+        old_content=previous if content_changed else resume.content,
+        new_content=resume.content,
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _record_resume_revisions(session: Session, flush_context) -> None:
+    """ORM 写入简历后记录修订，删除简历时一并删除其修订"""
+    changes: List[RevisionChange] = []
+    for obj in session.new:
+        if isinstance(obj, Resume):
+            obj.__dict__.pop("_previous_content", None)
+            changes.append(RevisionChange(obj.id, obj.version, obj.title, obj.template_id, None, obj.content))
+    for obj in session.dirty:
+        if isinstance(obj, Resume):
+            change = _resume_changed(obj)
+            if change is not None:
+                changes.append(change)
+
+    deleted = [obj.id for obj in session.deleted if isinstance(obj, Resume)]
+    if deleted:
+        session.execute(delete(ResumeRevision.__table__).where(ResumeRevision.resume_id.in_(deleted)))
+    record_revisions(session, changes)
+
+
+def serialize_revision_summary(row) -> dict:
+    """序列化修订元数据"""
+    return {
+        "number": row.number,
+        "version": row.version,
+        "kind": row.kind,
+        "title": row.title,
+        "template_id": row.template_id,
+        "size": row.size,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+    }
+
+
+def list_revisions(db: Session, resume_id: int, limit: int, before: Optional[int] = None) -> dict:
+    """按修订号倒序列出修订，before 为上一页最后一条的修订号"""
+    stmt = select(*REVISION_COLUMNS).where(ResumeRevision.resume_id == resume_id)
+    if before is not None:
+        stmt = stmt.where(ResumeRevision.number < before)
+    rows = db.execute(stmt.order_by(ResumeRevision.number.desc()).limit(limit + 1)).all()
+
+    next_before = rows[limit - 1].number if len(rows) > limit else None
+    return {
+        "items": [serialize_revision_summary(row) for row in rows[:limit]],
+        "next_before": next_before,
+    }
+
+
+def load_revision(db: Session, resume_id: int, number: int) -> Optional[Dict[str, Any]]:
+    """从最近的快照开始应用增量，重建第 number 条修订"""
+    snapshot_number = db.execute(
+        select(func.max(ResumeRevision.number)).where(
+            ResumeRevision.resume_id == resume_id,
+            ResumeRevision.kind == REVISION_SNAPSHOT,
+            ResumeRevision.number <= number,
+        )
+    ).scalar()
+    if snapshot_number is None:
+        return None
+
+    rows = db.execute(
+        select(ResumeRevision)
+        .where(
+            ResumeRevision.resume_id == resume_id,
+            ResumeRevision.number.between(snapshot_number, number),
+        )
+        .order_by(ResumeRevision.number)
+    ).scalars().all()
+    if not rows or rows[-1].number != number:
+        return None
+
+    content = json.loads(rows[0].data)
+    for row in rows[1:]:
+        content = apply_patch(content, json.loads(row.data))
+
+    target = rows[-1]
+    return {
+        "number": target.number,
+        "version": target.version,
+        "title": target.title,
+        "template_id": target.template_id,
+        "content": content,
+        "created_at": target.created_at.isoformat() if target.created_at else None,
+    }
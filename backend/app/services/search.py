@@ -0,0 +1,268 @@
+"""简历全文检索（SQLite FTS5）
+
+FTS5 内置的 unicode61 分词器会把连续的中文当成一个词，这里在 Python 中预先分词：
+中日韩字符逐字成词（查询时按短语匹配相邻的字），其余按字母数字切分并转小写。
+每个词前加上由用户 id 编码的私用区字符作为前缀，使索引中的词按用户隔离：
+查询只会命中当前用户的倒排列表，耗时与全库简历数无关。
+
+索引只保存分词结果，摘要片段在 Python 中根据原文生成。ORM 写入由 after_flush
+事件增量维护，自动保存等 Core 批量写入需要自行调用 index_resumes。
+FTS5 只在 SQLite 上可用：其他数据库不建索引表、不维护索引，检索返回空结果。
+"""
+import html
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DDL, event, inspect, select, text
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.models.resume import Resume
+
+SEARCH_TABLE = "resume_search"
+# 建立全文索引的数据库方言
+SEARCH_DIALECT = "sqlite"
+SEARCH_FIELDS = ("title", "summary", "experience", "skills", "projects")
+# bm25 各列权重，与 SEARCH_FIELDS 对应
+FIELD_WEIGHTS = (10.0, 2.0, 1.0, 3.0, 1.0)
+# 生成摘要时优先选择的字段
+SNIPPET_FIELDS = ("summary", "experience", "projects", "skills", "title")
+SNIPPET_WIDTH = 48
+MAX_QUERY_TERMS = 10
+
+# 中日韩字符范围（含假名、谚文），检索时逐字成词
+CJK_CHARS = "぀-ヿ㐀-䶿一-鿿가-힯豈-﫿"
+_TOKEN = re.compile(rf"[{CJK_CHARS}]|[^\W_{CJK_CHARS}]+")
+_QUERY_TERM = re.compile(r'"([^"]*)"|(\S+)')
+# 私用区 U+E000 ~ U+F8FF，unicode61 视为词内字符，用于编码用户 id
+_SCOPE_BASE = 0xE000
+_SCOPE_RADIX = 0x1900
+# 内容中与检索无关的字段
+_IGNORED_KEYS = {"id", "startDate", "endDate", "current"}
+
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+        f"{', '.join(SEARCH_FIELDS)}, tokenize = 'unicode61 remove_diacritics 2')"
+    ).execute_if(dialect=SEARCH_DIALECT),
+)
+event.listen(
+    Base.metadata,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {SEARCH_TABLE}").execute_if(dialect=SEARCH_DIALECT),
+)
+
+
+def search_supported(db: Any) -> bool:
+    """当前数据库是否有全文索引；db 为 Session、Connection 或 Engine"""
+    bind = db.get_bind() if isinstance(db, Session) else db
+    return bind.dialect.name == SEARCH_DIALECT
+
+
+def _scope(user_id: int) -> str:
+    """把用户 id 编码为私用区字符（真实的词不会以这些字符开头，前缀互不混淆）"""
+    chars = []
+    while True:
+        user_id, digit = divmod(user_id, _SCOPE_RADIX)
+        chars.append(chr(_SCOPE_BASE + digit))
+        if not user_id:
+            return "".join(reversed(chars))
+
+
+def tokenize(value: str) -> List[str]:
+    """切分为检索用的词（小写）"""
+    return _TOKEN.findall(value.lower())
+
+
+def _index_text(scope: str, value: str) -> str:
+    """索引列的值：每个词前加上用户前缀，空格分隔"""
+    tokens = tokenize(value)
+    return scope + (" " + scope).join(tokens) if tokens else ""
+
+
+def iter_texts(value: Any) -> Iterator[str]:
+    """递归取出内容中的文本"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if key not in _IGNORED_KEYS:
+                yield from iter_texts(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_texts(item)
+
+
+def search_document(title: str, content: Optional[str]) -> Dict[str, str]:
+    """提取参与检索的各字段原文"""
+    try:
+        data = json.loads(content) if content else {}
+    except ValueError:
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    return {
+        "title": title or "",
+        "summary": "\n".join(iter_texts(data.get("summary"))),
+        "experience": "\n".join(iter_texts(data.get("workExperience"))),
+        "skills": "\n".join(iter_texts(data.get("skills"))),
+        "projects": "\n".join(iter_texts(data.get("projects"))),
+    }
+
+
+def index_resumes(db: Any, resumes: Iterable[Tuple[int, int, str, Optional[str]]], replace: bool = True) -> None:
+    """写入或更新索引，resumes 为 (id, user_id, title, content)；db 为 Session 或 Connection
+
+    replace 为 False 时不先删除旧的索引行（新插入的简历还没有索引）。
+    """
+    if not search_supported(db):
+        return
+    rows = []
+    for resume_id, user_id, title, content in resumes:
+        scope = _scope(user_id)
+        document = search_document(title, content)
+        row = {field: _index_text(scope, document[field]) for field in SEARCH_FIELDS}
+        row["rowid"] = resume_id
+        rows.append(row)
+    if not rows:
+        return
+    if replace:
+        remove_from_index(db, [row["rowid"] for row in rows])
+    db.execute(
+        text(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, {', '.join(SEARCH_FIELDS)}) "
+            f"VALUES (:rowid, {', '.join(':' + field for field in SEARCH_FIELDS)})"
+        ),
+        rows,
+    )
+
+
+def remove_from_index(db: Any, resume_ids: Sequence[int]) -> None:
+    """从索引中删除"""
+    if resume_ids and search_supported(db):
+        db.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :rowid"), [{"rowid": rid} for rid in resume_ids])
+
+
+@event.listens_for(Session, "after_flush")
+def _index_resume_changes(session: Session, flush_context) -> None:
+    """ORM 写入简历后更新索引"""
+    if not search_supported(session):
+        return
+    changed = []
+    for obj in session.new:
+        if isinstance(obj, Resume):
+            changed.append(obj)
+    for obj in session.dirty:
+        if isinstance(obj, Resume):
+            attrs = inspect(obj).attrs
+            if attrs.content_hash.history.has_changes() or attrs.title.history.has_changes():
+                changed.append(obj)
+    index_resumes(session, [(obj.id, obj.user_id, obj.title, obj.content) for obj in changed])
+    remove_from_index(session, [obj.id for obj in session.deleted if isinstance(obj, Resume)])
+
+
+def parse_query(user_id: int, q: str) -> Tuple[Optional[str], List[str]]:
+    """把查询串转换为 FTS5 表达式，返回 (表达式, 用于高亮的词语)
+
+    空格分隔的每一项都必须出现（双引号包住的视为一项），中文按相邻字组成短语；
+    查询串末尾的英文单词按前缀匹配，便于边输入边搜索。
+    """
+    scope = _scope(user_id)
+    phrases: List[str] = []
+    needles: List[str] = []
+    matches = list(_QUERY_TERM.finditer(q))[:MAX_QUERY_TERMS]
+    for i, match in enumerate(matches):
+        term = match.group(1) if match.group(1) is not None else match.group(2)
+        tokens = tokenize(term)
+        if not tokens:
+            continue
+        phrase = '"' + " ".join(scope + token for token in tokens) + '"'
+        is_last = i == len(matches) - 1 and match.group(2) is not None and match.end() == len(q)
+        if is_last and not re.fullmatch(f"[{CJK_CHARS}]", tokens[-1]):
+            phrase += " *"
+        phrases.append(phrase)
+        needles.append(term.strip().lower())
+    if not phrases:
+        return None, []
+    return " ".join(phrases), needles
+
+
+def make_snippet(document: Dict[str, str], needles: List[str]) -> Tuple[Optional[str], Optional[str]]:
+    """选出命中词语最多的字段，截取命中位置附近的原文并用 <mark> 标出（已转义 HTML）"""
+    best: Optional[Tuple[int, str, List[Tuple[int, int]]]] = None
+    for field in SNIPPET_FIELDS:
+        value = document[field]
+        lowered = value.lower()
+        spans = []
+        matched = 0
+        for needle in needles:
+            start = lowered.find(needle)
+            if start >= 0:
+                matched += 1
+            while start >= 0:
+                spans.append((start, start + len(needle)))
+                start = lowered.find(needle, start + len(needle))
+        if matched and (best is None or matched > best[0]):
+            best = (matched, field, sorted(spans))
+    if best is None:
+        return None, None
+
+    _, field, spans = best
+    value = document[field]
+    begin = max(0, spans[0][0] - SNIPPET_WIDTH // 4)
+    end = min(len(value), begin + SNIPPET_WIDTH)
+    parts = ["…" if begin > 0 else ""]
+    cursor = begin
+    for start, stop in spans:
+        if start < cursor or start >= end:
+            continue
+        stop = min(stop, end)
+        parts.append(html.escape(value[cursor:start]))
+        parts.append(f"<mark>{html.escape(value[start:stop])}</mark>")
+        cursor = stop
+    parts.append(html.escape(value[cursor:end]))
+    parts.append("…" if end < len(value) else "")
+    return field, "".join(parts).replace("\n", " ")
+
+
+def search_resumes(db: Session, user_id: int, q: str, limit: int) -> List[Dict[str, Any]]:
+    """在当前用户的简历中检索，按相关度排序（没有全文索引的数据库返回空结果）"""
+    expression, needles = parse_query(user_id, q)
+    if expression is None or not search_supported(db):
+        return []
+    weights = ", ".join(str(weight) for weight in FIELD_WEIGHTS)
+    ranked = db.execute(
+        text(
+            f"SELECT rowid, bm25({SEARCH_TABLE}, {weights}) AS rank FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH :expression ORDER BY rank LIMIT :limit"
+        ),
+        {"expression": expression, "limit": limit},
+    ).all()
+    if not ranked:
+        return []
+
+    resumes = {
+        resume.id: resume
+        for resume in db.execute(
+            select(Resume).where(Resume.id.in_([row.rowid for row in ranked]), Resume.user_id == user_id)
+        ).scalars()
+    }
+    items = []
+    for row in ranked:
+        resume = resumes.get(row.rowid)
+        if resume is None:
+            continue
+        field, snippet = make_snippet(search_document(resume.title, resume.content), needles)
+        items.append({
+            "id": resume.id,
+            "title": resume.title,
+            "template_id": resume.template_id,
+            "updated_at": resume.updated_at.isoformat() if resume.updated_at else None,
+            "score": -row.rank,
+            "field": field,
+            "snippet": snippet,
+        })
+    return items
@@ -0,0 +1,79 @@
+"""自动保存合并写入基准：逐次 commit vs 写缓冲
+
+模拟 RESUMES 位用户同时编辑，每人每个落盘间隔内自动保存 SAVES_PER_INTERVAL 次，
+对比逐次提交与写缓冲批量落盘的提交次数和每秒可处理的保存次数。
+用法（在 backend 目录下）：
+    python -m benchmarks.bench_autosave
+"""
+import json
+import time
+
+from app.models.resume import Resume
+from app.services.autosave import AutosaveBuffer
+from benchmarks.common import seed_resumes, seed_user, temp_database
+
+RESUMES = 100
+SAVES_PER_INTERVAL = 3
+INTERVALS = 10
+
+
+def content(i: int) -> str:
+    return json.dumps({"summary": f"第 {i} 次自动保存"}, ensure_ascii=False)
+
+
+def run_direct(session_factory, ids) -> dict:
+    """每次保存都 commit + refresh（原 update_resume 路径）"""
+    db = session_factory()
+    saves = commits = 0
+    start = time.perf_counter()
+    for i in range(INTERVALS * SAVES_PER_INTERVAL):
+        for resume_id in ids:
+            resume = db.get(Resume, resume_id)
+            resume.content = content(i)
+            db.commit()
+            db.refresh(resume)
+            saves += 1
+            commits += 1
+    elapsed = time.perf_counter() - start
+    db.close()
+    return {"saves": saves, "commits": commits, "elapsed": elapsed}
+
+
+def run_buffered(session_factory, ids) -> dict:
+    """保存写入缓冲，每个间隔批量落盘一次"""
+    db = session_factory()
+    rows = {resume.id: resume for resume in db.query(Resume).filter(Resume.id.in_(ids))}
+    db.close()
+    buffer = AutosaveBuffer(session_factory)
+    saves = 0
+    start = time.perf_counter()
+    for interval in range(INTERVALS):
+        for n in range(SAVES_PER_INTERVAL):
+            for resume_id in ids:
+                current = buffer.get(resume_id) or rows[resume_id]
+                rows[resume_id] = buffer.put(current, current.title, current.template_id,
+                                             content(interval * SAVES_PER_INTERVAL + n))
+                saves += 1
+        buffer.flush()
+    elapsed = time.perf_counter() - start
+    return {"saves": saves, "commits": buffer.stats()["flushes"], "elapsed": elapsed}
+
+
+def report(label: str, result: dict) -> None:
+    print(f"{label:<12} 保存 {result['saves']:>6}  提交 {result['commits']:>6}  "
+          f"耗时 {result['elapsed']:7.2f}s  {result['saves'] / result['elapsed']:9.0f} 次保存/s")
+
+
+def main() -> None:
+    for label, runner in (("逐次提交", run_direct), ("写缓冲", run_buffered)):
+        with temp_database() as (_, session_factory):
+            db = session_factory()
+            user = seed_user(db)
+            seed_resumes(db, user.id, RESUMES)
+            ids = [resume_id for (resume_id,) in db.query(Resume.id)]
+            db.close()
+            report(label, runner(session_factory, ids))
+
+
+if __name__ == "__main__":
+    main()
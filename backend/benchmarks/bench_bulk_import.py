@@ -0,0 +1,84 @@
+"""批量导入基准：逐份创建 vs 按批写入
+
+逐份创建走原 create_resume 路径（ORM add + commit + refresh），批量导入走
+/api/resumes/bulk 的解析、校验和按批写入（不含 HTTP 开销），比较每秒导入的简历数，
+目标为每秒 5000 份以上。
+用法（在 backend 目录下）：
+    python -m benchmarks.bench_bulk_import [简历数]
+"""
+import asyncio
+import json
+import sys
+import time
+
+from app.core.config import get_settings
+from app.models.resume import Resume
+from app.services.bulk_import import ImportItem, insert_resumes, iter_import_batches, validate_entry
+from benchmarks.common import make_resume_content, seed_user, temp_database
+
+settings = get_settings()
+
+RESUME_COUNT = 20_000
+SINGLE_COUNT = 500
+CHUNK_SIZE = 64 * 1024
+
+
+def documents(count: int):
+    return [
+        {"title": f"导入简历 {i}", "template_id": "modern", "content": json.loads(make_resume_content(i))}
+        for i in range(count)
+    ]
+
+
+def run_single(count: int) -> float:
+    """逐份 ORM 创建，返回每秒份数"""
+    with temp_database() as (_, session_factory):
+        db = session_factory()
+        user_id = seed_user(db).id
+        items = [validate_entry(i, document, "modern") for i, document in enumerate(documents(count))]
+        started = time.perf_counter()
+        for item in items:
+            resume = Resume(user_id=user_id, title=item.title, template_id=item.template_id, content=item.content)
+            db.add(resume)
+            db.commit()
+            db.refresh(resume)
+        elapsed = time.perf_counter() - started
+        db.close()
+    return count / elapsed
+
+
+def run_bulk(count: int) -> float:
+    """NDJSON 请求体分块解析、按批写入，返回每秒份数"""
+    body = "\n".join(json.dumps(document, ensure_ascii=False) for document in documents(count)).encode("utf-8")
+
+    async def chunks():
+        for start in range(0, len(body), CHUNK_SIZE):
+            yield body[start:start + CHUNK_SIZE]
+
+    with temp_database() as (_, session_factory):
+        db = session_factory()
+        user_id = seed_user(db).id
+
+        async def run():
+            async for batch in iter_import_batches(chunks(), ndjson=True, max_items=count):
+                entries = [validate_entry(index, document, "modern") for index, document in batch]
+                insert_resumes(db, user_id, [entry for entry in entries if isinstance(entry, ImportItem)])
+                db.commit()
+
+        started = time.perf_counter()
+        asyncio.run(run())
+        elapsed = time.perf_counter() - started
+        assert db.query(Resume).count() == count
+        db.close()
+    return count / elapsed
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else RESUME_COUNT
+    print(f"每批 {settings.BULK_IMPORT_BATCH_SIZE} 份\n")
+    print(f"逐份创建（{SINGLE_COUNT} 份）: {run_single(SINGLE_COUNT):10.0f} 份/秒")
+    print(f"批量导入（{count} 份）:      {run_bulk(count):10.0f} 份/秒")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""并发吞吐基准：同步线程池路由 vs 异步数据库路由
+
+需要先启动服务，分别以 DB_ASYNC=false / DB_ASYNC=true 各跑一次对比：
+    DB_ASYNC=true uvicorn app.main:app --port 8000
+    python -m benchmarks.bench_concurrency http://localhost:8000
+"""
+import asyncio
+import sys
+import time
+import uuid
+
+import httpx
+
+CONCURRENCY_LEVELS = (50, 200, 1000)
+REQUESTS_PER_CLIENT = 20
+
+
+async def prepare(client: httpx.AsyncClient) -> dict:
+    """注册测试账号并创建一份简历"""
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    response = await client.post(
+        "/api/auth/register",
+        json={"email": email, "password": "password123", "full_name": "基准用户"},
+    )
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+    response = await client.post(
+        "/api/resumes",
+        json={"title": "基准简历", "template_id": "modern", "content": {"summary": "基准"}},
+        headers=headers,
+    )
+    response.raise_for_status()
+    return headers
+
+
+async def run_level(base_url: str, headers: dict, concurrency: int) -> None:
+    """以指定并发数压测简历列表接口"""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        errors = 0
+
+        async def worker():
+            nonlocal errors
+            for _ in range(REQUESTS_PER_CLIENT):
+                response = await client.get("/api/resumes?summary=true&limit=20", headers=headers)
+                if response.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    total = concurrency * REQUESTS_PER_CLIENT
+    print(f"并发 {concurrency:>5}: {total / elapsed:9.1f} req/s  耗时 {elapsed:6.2f}s  错误 {errors}")
+
+
+async def main(base_url: str) -> None:
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        headers = await prepare(client)
+    for concurrency in CONCURRENCY_LEVELS:
+        await run_level(base_url, headers, concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else "http://localhost:8000"))
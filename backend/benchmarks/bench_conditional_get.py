@@ -0,0 +1,83 @@
+"""编辑会话带宽测量：无条件轮询 vs ETag 条件请求
+
+模拟一个编辑器会话：前端每隔几秒轮询一次简历详情，期间偶尔保存。
+对比每次都完整下载与携带 If-None-Match（未变化时 304）两种方式的传输字节数。
+需要先启动服务：
+    uvicorn app.main:app --port 8000
+    python -m benchmarks.bench_conditional_get http://localhost:8000
+"""
+import sys
+import uuid
+
+import httpx
+
+from app.core.template_registry import template_registry
+
+POLLS = 300  # 约 25 分钟、每 5 秒一次
+SAVE_EVERY = 30  # 每 30 次轮询保存一次
+
+
+def response_bytes(response: httpx.Response) -> int:
+    """响应头 + 响应体字节数"""
+    header_bytes = sum(len(k) + len(v) + 4 for k, v in response.headers.raw)
+    return header_bytes + len(response.content)
+
+
+def prepare(client: httpx.Client) -> tuple:
+    """注册测试账号并创建一份使用模板默认内容的简历"""
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    response = client.post(
+        "/api/auth/register",
+        json={"email": email, "password": "password123", "full_name": "基准用户"},
+    )
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+    resume = {
+        "title": "基准简历",
+        "template_id": "modern",
+        "content": template_registry.get("modern")["defaultContent"],
+    }
+    response = client.post("/api/resumes", json=resume, headers=headers)
+    response.raise_for_status()
+    return headers, response.json()["data"]
+
+
+def run_session(client: httpx.Client, conditional: bool) -> dict:
+    """跑一次编辑会话，返回传输统计"""
+    headers, resume = prepare(client)
+    url = f"/api/resumes/{resume['id']}"
+    etag = None
+    total = not_modified = 0
+
+    for i in range(POLLS):
+        if i and i % SAVE_EVERY == 0:
+            resume["title"] = f"基准简历 v{i}"
+            save_headers = {**headers, "If-Match": etag} if conditional and etag else headers
+            response = client.put(url, json=resume, headers=save_headers)
+            response.raise_for_status()
+            etag = response.headers.get("etag")
+
+        poll_headers = {**headers, "If-None-Match": etag} if conditional and etag else headers
+        response = client.get(url, headers=poll_headers)
+        total += response_bytes(response)
+        if response.status_code == 304:
+            not_modified += 1
+        else:
+            etag = response.headers.get("etag")
+
+    return {"bytes": total, "not_modified": not_modified}
+
+
+def main(base_url: str) -> None:
+    with httpx.Client(base_url=base_url, timeout=30) as client:
+        plain = run_session(client, conditional=False)
+        conditional = run_session(client, conditional=True)
+
+    print(f"轮询 {POLLS} 次，每 {SAVE_EVERY} 次保存一次")
+    print(f"无条件轮询:   {plain['bytes'] / 1024:9.1f} KB")
+    print(f"ETag 条件请求: {conditional['bytes'] / 1024:9.1f} KB  (304 {conditional['not_modified']} 次)")
+    print(f"节省: {1 - conditional['bytes'] / plain['bytes']:.1%}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "http://localhost:8000")
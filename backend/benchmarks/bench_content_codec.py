@@ -0,0 +1,85 @@
+"""内容压缩基准：10 万份简历的数据库大小与编解码 CPU 开销
+
+按模板默认内容随机组合生成互不相同的简历（中文描述、重复的键名；短语取自模板，压缩率偏乐观），
+分别以 none / zlib / zstd（已安装时）写入临时数据库，VACUUM 后比较文件大小，
+并统计每份简历的编码（写）与解码（读）耗时，以及读取一页 20 份简历的耗时。
+用法（在 backend 目录下）：
+    python -m benchmarks.bench_content_codec [简历数]
+"""
+import sys
+import time
+
+from sqlalchemy import func, insert, select, text
+
+from app.core import content_codec
+from app.core.content_codec import CODECS, decode_content, encode_content
+from app.models.content_blob import ContentBlob, content_hash
+from app.models.resume import Resume
+from benchmarks.common import make_resume_content, measure, print_row, seed_user, temp_database
+
+RESUME_COUNT = 100_000
+BATCH_SIZE = 2000
+DECODE_SAMPLES = 10_000
+
+
+def run_codec(codec: str, count: int) -> None:
+    fmt = content_codec.resolve_format(codec)
+    with temp_database() as (engine, session_factory):
+        db = session_factory()
+        user_id = seed_user(db).id
+        raw_bytes = 0
+        encode_seconds = 0.0
+        for start in range(0, count, BATCH_SIZE):
+            blobs, resumes = [], []
+            for i in range(start, min(start + BATCH_SIZE, count)):
+                content = make_resume_content(i)
+                raw_bytes += len(content.encode("utf-8"))
+                started = time.perf_counter()
+                data = encode_content(content, fmt)
+                encode_seconds += time.perf_counter() - started
+                key = content_hash(content)
+                blobs.append({"hash": key, "data": data, "size": len(content.encode("utf-8")), "refcount": 1})
+                resumes.append({"user_id": user_id, "title": f"简历 {i}", "template_id": "modern", "content_hash": key})
+            db.execute(insert(ContentBlob), blobs)
+            db.execute(insert(Resume), resumes)
+        db.commit()
+
+        stored_bytes = db.execute(select(func.sum(func.length(ContentBlob.data)))).scalar()
+        sample = db.execute(select(ContentBlob.data).order_by(func.random()).limit(DECODE_SAMPLES)).scalars().all()
+        started = time.perf_counter()
+        for data in sample:
+            decode_content(data)
+        decode_seconds = time.perf_counter() - started
+
+        def read_page():
+            with session_factory() as session:
+                for resume in session.execute(select(Resume).order_by(Resume.id.desc()).limit(20)).scalars():
+                    resume.content
+
+        page = measure(read_page, repeat=50)
+        db.close()
+        with engine.connect() as conn:
+            conn.execute(text("VACUUM"))
+            db_bytes = conn.execute(text("PRAGMA page_count")).scalar() * conn.execute(text("PRAGMA page_size")).scalar()
+
+    print(f"[{codec}]")
+    print(f"内容原始大小: {raw_bytes / 1048576:8.1f} MB   存储: {stored_bytes / 1048576:8.1f} MB  ({stored_bytes / raw_bytes:.1%})")
+    print(f"数据库文件:   {db_bytes / 1048576:8.1f} MB")
+    print(f"编码（写）:   {encode_seconds / count * 1e6:8.1f} µs/份")
+    print(f"解码（读）:   {decode_seconds / len(sample) * 1e6:8.1f} µs/份")
+    print_row("读取一页 20 份（含解码）", page)
+    print()
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else RESUME_COUNT
+    print(f"简历 {count} 份，字典 v1 {len(content_codec.load_dictionary('v1'))} 字节\n")
+    for codec in CODECS:
+        if codec == "zstd" and content_codec.zstandard is None:
+            print("[zstd] 未安装 zstandard，跳过\n")
+            continue
+        run_codec(codec, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""响应序列化微基准：APIResponse + jsonable_encoder vs envelope
+
+对比列表、详情、模板三类响应在旧路径（FastAPI 对返回的 APIResponse 做
+jsonable_encoder 转换后由 JSONResponse 编码）和新路径（EnvelopeResponse
+直接编码为字节）下的耗时。
+用法（在 backend 目录下）：
+    python -m benchmarks.bench_json_envelope
+"""
+import json
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.responses import envelope, orjson
+from app.core.template_registry import template_registry
+from app.schemas.user import APIResponse
+from benchmarks.common import measure, print_row
+
+
+def old_path(data):
+    return JSONResponse(content=jsonable_encoder(APIResponse(success=True, data=data))).body
+
+
+def new_path(data):
+    return envelope(data).body
+
+
+def main() -> None:
+    content = template_registry.get("modern")["defaultContent"]
+    content_json = json.dumps(content, ensure_ascii=False)
+    resume = {
+        "id": 1,
+        "user_id": 1,
+        "title": "算法工程师简历",
+        "template_id": "modern",
+        "content": content,
+        "created_at": "2024-01-01T00:00:00",
+        "updated_at": "2024-01-01T00:00:00",
+    }
+
+    def resume_list():
+        # 模拟 get_resumes：每行都要 json.loads 一次
+        return [{**resume, "id": i, "content": json.loads(content_json)} for i in range(100)]
+
+    cases = {
+        "列表 (100 份)": resume_list,
+        "详情": lambda: {**resume, "content": json.loads(content_json)},
+        "模板目录": template_registry.all,
+    }
+    print(f"JSON 后端: {'orjson' if orjson is not None else 'json (标准库)'}\n")
+    for label, build in cases.items():
+        print_row(f"{label} 旧路径", measure(lambda: old_path(build()), repeat=200))
+        print_row(f"{label} 新路径", measure(lambda: new_path(build()), repeat=200))
+
+
+if __name__ == "__main__":
+    main()
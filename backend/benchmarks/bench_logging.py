@@ -0,0 +1,103 @@
+"""日志开销基准：关闭日志 vs 同步写文件 vs 队列后台写出（drop / block 两种策略）
+
+CONCURRENCY 个线程模拟并发请求，每个请求做少量计算并像简历路由一样记录
+LOGS_PER_REQUEST 条 INFO 日志，统计单个请求的延迟。磁盘偶尔卡顿时同步写文件会把
+卡顿直接加到请求上，这里每写 STALL_EVERY 条模拟一次 STALL_MS 毫秒的卡顿。
+用法（在 backend 目录下）：
+    python -m benchmarks.bench_logging [卡顿毫秒数]
+"""
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from app.core.logging import (
+    DATE_FORMAT,
+    LOG_FORMAT,
+    QUEUE_POLICIES,
+    LogEvent,
+    LogPipeline,
+    RotatingLogFileHandler,
+    TextFormatter,
+)
+
+CONCURRENCY = 16
+REQUESTS = 20_000
+LOGS_PER_REQUEST = 2
+STALL_EVERY = 500
+STALL_MS = 20.0
+
+
+class StallingFileHandler(RotatingLogFileHandler):
+    """每写 STALL_EVERY 条卡顿一次，模拟回写或 fsync 造成的磁盘停顿"""
+
+    def __init__(self, *args, stall_ms: float, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stall = stall_ms / 1000
+        self.count = 0
+
+    def emit(self, record):
+        super().emit(record)
+        self.count += 1
+        if self.stall and self.count % STALL_EVERY == 0:
+            time.sleep(self.stall)
+
+
+def run(mode: str, stall_ms: float) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        handler = StallingFileHandler(
+            Path(directory) / "app.log", "midnight", max_bytes=0, backup_count=0, stall_ms=stall_ms
+        )
+        handler.setFormatter(TextFormatter(LOG_FORMAT, datefmt=DATE_FORMAT))
+        logger = logging.getLogger(f"bench.{mode}")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        pipeline = None
+        if mode == "sync":
+            logger.handlers = [handler]
+        elif mode in QUEUE_POLICIES:
+            pipeline = LogPipeline([handler], maxsize=10_000, policy=mode, block_timeout=1.0)
+            pipeline.start()
+            logger.handlers = [pipeline.handler]
+        else:
+            logger.handlers = [logging.NullHandler()]
+            logger.setLevel(logging.WARNING)
+
+
+        def request(i: int) -> float:
+            started = time.perf_counter()
+            payload = sum(range(2000))
+            for _ in range(LOGS_PER_REQUEST):
+                logger.info(LogEvent("简历更新成功", resume_id=i, user_id=i % 100, payload=payload))
+            elapsed = (time.perf_counter() - started) * 1000
+            return elapsed
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(CONCURRENCY) as executor:
+            samples = sorted(executor.map(request, range(REQUESTS)))
+        total = time.perf_counter() - started
+        if pipeline is not None:
+            pipeline.close()
+        else:
+            handler.close()
+
+    dropped = pipeline.stats()["dropped"] if pipeline is not None else 0
+    print(
+        f"{mode:<6} 吞吐 {REQUESTS / total:9.0f} 次/秒  "
+        f"mean={statistics.mean(samples):7.3f}ms  p50={samples[len(samples) // 2]:7.3f}ms  "
+        f"p99={samples[int(len(samples) * 0.99)]:7.3f}ms  max={samples[-1]:7.2f}ms  丢弃 {dropped}"
+    )
+
+
+def main() -> None:
+    stall_ms = float(sys.argv[1]) if len(sys.argv) > 1 else STALL_MS
+    print(f"并发 {CONCURRENCY}，请求 {REQUESTS} 次，每次 {LOGS_PER_REQUEST} 条日志，每 {STALL_EVERY} 条卡顿 {stall_ms}ms\n")
+    for mode in ("off", "sync") + QUEUE_POLICIES:
+        run(mode, stall_ms)
+
+
+if __name__ == "__main__":
+    main()
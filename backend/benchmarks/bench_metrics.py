@@ -0,0 +1,74 @@
+"""请求指标开销基准
+
+1. 只测 MetricsMiddleware：内层是立即返回的空应用，差值即每个请求记录指标的开销
+2. 完整应用处理 GET /health（不访问数据库）的耗时，作为对照
+多进程模式（设置 PROMETHEUS_MULTIPROC_DIR）下指标写入 mmap 文件，可设置该环境变量后再运行对比。
+用法（在 backend 目录下）：
+    python -m benchmarks.bench_metrics
+"""
+import asyncio
+import time
+
+import benchmarks.common  # noqa: F401  关闭 INFO 日志
+from app.core.metrics import MetricsMiddleware
+from app.main import app
+
+REQUESTS = 50_000
+
+
+async def empty_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b'{"status":"ok"}'})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+def make_scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+        "app": app,
+    }
+
+
+async def per_request_us(handler, path: str, count: int) -> float:
+    for _ in range(count // 10):
+        await handler(make_scope(path), receive, send)
+    started = time.perf_counter()
+    for _ in range(count):
+        await handler(make_scope(path), receive, send)
+    return (time.perf_counter() - started) / count * 1e6
+
+
+async def run() -> None:
+    instrumented = MetricsMiddleware(empty_app, router=app.router)
+    base = await per_request_us(empty_app, "/api/resumes/42", REQUESTS)
+    measured = await per_request_us(instrumented, "/api/resumes/42", REQUESTS)
+    print(f"指标中间件开销: {measured - base:6.1f}us / 请求")
+
+    full = await per_request_us(app.build_middleware_stack(), "/health", REQUESTS // 10)
+    print(f"完整应用 GET /health: {full:6.1f}us / 请求（对照）")
+
+
+def main() -> None:
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
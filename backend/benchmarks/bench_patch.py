@@ -0,0 +1,39 @@
+"""自动保存微基准：整份 PUT vs JSON Patch
+
+模拟在一份较大的简历里改动 summary 中的一个字符，对比请求体大小，
+以及服务端校验 + 生成新 content 的耗时。
+用法（在 backend 目录下）：
+    python -m benchmarks.bench_patch
+"""
+import json
+
+from app.core.template_registry import template_registry
+from app.routes.resumes import JSON_PATCH_MEDIA_TYPE, patch_content
+from app.schemas.resume import ResumeUpdate
+from benchmarks.common import measure, print_row
+
+
+def main() -> None:
+    content = dict(template_registry.get("modern")["defaultContent"])
+    content["workExperience"] = content["workExperience"] * 50
+    stored = json.dumps(content, ensure_ascii=False, separators=(",", ":"))
+
+    edited = {**content, "summary": content["summary"] + "。"}
+    put_body = json.dumps({"title": "简历", "template_id": "modern", "content": edited}, ensure_ascii=False).encode()
+    operations = [{"op": "replace", "path": "/summary", "value": edited["summary"]}]
+    patch_body = json.dumps(operations, ensure_ascii=False).encode()
+
+    print(f"content 大小: {len(stored.encode()) / 1024:.1f} KB")
+    print(f"PUT 请求体:   {len(put_body):>8} B")
+    print(f"PATCH 请求体: {len(patch_body):>8} B\n")
+
+    print_row("PUT 全量校验", measure(
+        lambda: ResumeUpdate.model_validate_json(put_body).content.model_dump_json(), repeat=200,
+    ))
+    print_row("PATCH 局部校验", measure(
+        lambda: patch_content(stored, operations, JSON_PATCH_MEDIA_TYPE), repeat=200,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""PDF 渲染基准：冷/热缓存延迟与吞吐
+
+用法（在 backend 目录下）：
+    python -m benchmarks.bench_pdf_render [渲染进程数]
+"""
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.template_registry import template_registry
+from app.services.render_engine import RenderEngine
+from benchmarks.common import measure, print_row
+
+RENDER_COUNT = 200
+
+
+def main(workers: int = 2) -> None:
+    engine = RenderEngine(max_workers=workers, max_queue=RENDER_COUNT, cache_max_bytes=256 * 1024 * 1024, timeout=60)
+    template = template_registry.get("modern")
+    content = template["defaultContent"]
+
+    def variant(i: int):
+        # 每份内容不同，确保都是冷渲染
+        data = {**content, "summary": f"{content['summary']} #{i}"}
+        content_json = json.dumps(data, ensure_ascii=False)
+        key = engine.cache_key("modern", template_registry.version("modern"), "基准简历", content_json)
+        return key, data
+
+    # 预热进程池，同时填充热缓存
+    warm_key, warm_data = variant(-1)
+    engine.render(warm_key, "modern", "基准简历", warm_data)
+
+    counter = iter(range(10_000))
+
+    def cold():
+        key, data = variant(next(counter))
+        engine.render(key, "modern", "基准简历", data)
+
+    def warm():
+        engine.render(warm_key, "modern", "基准简历", warm_data)
+
+    print_row("冷渲染（未命中缓存）", measure(cold, repeat=50))
+    print_row("热渲染（命中缓存）", measure(warm, repeat=1000))
+
+    jobs = [variant(100_000 + i) for i in range(RENDER_COUNT)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(workers, 1) * 2) as pool:
+        list(pool.map(lambda job: engine.render(job[0], "modern", "基准简历", job[1]), jobs))
+    elapsed = time.perf_counter() - start
+    print(f"\n{workers} 个渲染进程: {RENDER_COUNT / elapsed:.1f} 份/秒")
+    engine.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2)
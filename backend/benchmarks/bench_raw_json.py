@@ -0,0 +1,61 @@
+"""简历 content 直通微基准：json.loads + 重新编码 vs raw_json 原样拼接
+
+构造约 50KB / 500KB 的简历 content，对比详情响应在两种路径下的耗时与
+tracemalloc 统计的内存峰值。
+用法（在 backend 目录下）：
+    python -m benchmarks.bench_raw_json
+"""
+import json
+import tracemalloc
+
+from app.core.responses import envelope, orjson, raw_json
+from app.core.template_registry import template_registry
+from benchmarks.common import measure, print_row
+
+
+def build_content(target_bytes: int) -> str:
+    """复制工作经历直到 content 达到目标大小"""
+    content = dict(template_registry.get("modern")["defaultContent"])
+    job = content["workExperience"][0]
+    jobs = []
+    while len(json.dumps({**content, "workExperience": jobs}, ensure_ascii=False).encode()) < target_bytes:
+        jobs.extend([job] * 20)
+    content["workExperience"] = jobs
+    return json.dumps(content, ensure_ascii=False)
+
+
+def resume(content) -> dict:
+    return {
+        "id": 1,
+        "user_id": 1,
+        "title": "算法工程师简历",
+        "template_id": "modern",
+        "content": content,
+        "created_at": "2024-01-01T00:00:00",
+        "updated_at": "2024-01-01T00:00:00",
+    }
+
+
+def peak_kb(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main() -> None:
+    print(f"JSON 后端: {'orjson' if orjson is not None else 'json (标准库)'}\n")
+    for label, size in (("50KB", 50 * 1024), ("500KB", 500 * 1024)):
+        stored = build_content(size)
+        paths = {
+            "解析后重新编码": lambda: envelope(resume(json.loads(stored))).body,
+            "raw_json 直通": lambda: envelope(resume(raw_json(stored))).body,
+        }
+        for name, fn in paths.items():
+            print_row(f"{label} {name}", measure(fn, repeat=100))
+            print(f"    内存峰值 {peak_kb(fn):.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
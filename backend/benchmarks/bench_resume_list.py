@@ -0,0 +1,47 @@
+"""简历列表基准：完整列表 vs 摘要游标分页
+
+用法（在 backend 目录下）：
+    python -m benchmarks.bench_resume_list [每个用户的简历数量]
+"""
+import json
+import sys
+
+from app.routes.resumes import get_resumes
+from benchmarks.common import temp_database, seed_user, seed_resumes, measure, print_row
+
+
+def main(count: int = 10_000) -> None:
+    with temp_database() as (_, SessionLocal):
+        db = SessionLocal()
+        try:
+            user = seed_user(db)
+            seed_resumes(db, user.id, count)
+            print(f"已写入 {count} 份简历\n")
+
+            def full_list():
+                get_resumes(summary=False, limit=None, cursor=None, db=db, current_user=user)
+
+            def summary_list():
+                get_resumes(summary=True, limit=None, cursor=None, db=db, current_user=user)
+
+            def summary_first_page():
+                get_resumes(summary=True, limit=20, cursor=None, db=db, current_user=user)
+
+            def summary_deep_page():
+                # 从第一页开始跟随游标翻 50 页，验证深翻页的成本保持不变
+                cursor = None
+                for _ in range(50):
+                    page = get_resumes(summary=True, limit=20, cursor=cursor, db=db, current_user=user)
+                    cursor = json.loads(page.body)["data"]["next_cursor"]
+
+            print_row("完整列表 (含 content)", measure(full_list, repeat=5))
+            print_row("摘要列表 (不分页)", measure(summary_list, repeat=5))
+            print_row("摘要首页 (limit=20)", measure(summary_first_page))
+            stats = measure(summary_deep_page, repeat=5)
+            print_row("摘要翻页 (每页均值)", {k: v / 50 for k, v in stats.items()})
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,62 @@
+"""修订历史基准：1000 条修订的存储量与重建延迟
+
+对同一份简历做 REVISIONS 次小修改（改一段工作描述或简介），统计修订表占用，
+与每次保存完整副本相比；再测量重建不同位置修订的耗时（快照之后第 0 ~ K-1 条增量）。
+用法（在 backend 目录下）：
+    python -m benchmarks.bench_revisions
+"""
+import json
+import random
+
+from sqlalchemy import func
+
+from app.core.config import get_settings
+from app.models.resume import Resume
+from app.models.revision import ResumeRevision
+from app.services.revisions import load_revision
+from app.core.template_registry import template_registry
+from benchmarks.common import measure, print_row, seed_user, temp_database
+
+REVISIONS = 1000
+
+
+def main() -> None:
+    interval = get_settings().REVISION_SNAPSHOT_INTERVAL
+    random.seed(42)
+    with temp_database() as (_, session_factory):
+        db = session_factory()
+        user = seed_user(db)
+        content = template_registry.get("modern")["defaultContent"]
+        content = {**content, "workExperience": content["workExperience"] * 5}
+        resume = Resume(user_id=user.id, title="基准简历", template_id="modern",
+                        content=json.dumps(content, ensure_ascii=False))
+        db.add(resume)
+        db.commit()
+
+        full_bytes = len(resume.content.encode())
+        for i in range(2, REVISIONS + 1):
+            content = json.loads(resume.content)
+            if random.random() < 0.5:
+                content["summary"] = f"{content['summary'][:200]} 第 {i} 次修改"
+            else:
+                job = random.randrange(len(content["workExperience"]))
+                content["workExperience"][job] = {**content["workExperience"][job], "description": f"第 {i} 次修改的描述"}
+            resume.content = json.dumps(content, ensure_ascii=False)
+            full_bytes += len(resume.content.encode())
+            db.commit()
+
+        stored = db.query(func.sum(func.length(ResumeRevision.data))).scalar()
+        snapshots = db.query(ResumeRevision).filter(ResumeRevision.kind == "snapshot").count()
+        print(f"修订 {REVISIONS} 条，快照间隔 {interval}，快照 {snapshots} 条")
+        print(f"每次保存完整副本: {full_bytes / 1024:9.1f} KB")
+        print(f"快照 + 增量:       {stored / 1024:9.1f} KB  ({stored / full_bytes:.1%})\n")
+
+        for number in (1, 2, interval, REVISIONS):
+            deltas = (number - 1) % interval
+            print_row(f"重建第 {number} 条（{deltas} 个增量）",
+                      measure(lambda: load_revision(db, resume.id, number), repeat=50))
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
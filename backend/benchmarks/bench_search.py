@@ -0,0 +1,66 @@
+"""全文检索基准：10 万份简历中检索单个用户的简历
+
+每个用户 RESUMES_PER_USER 份简历，内容由模板短语随机组合（常用字在全库中极为常见，
+不按用户隔离时短语查询需要遍历很长的倒排列表）。测量随机用户检索的延迟（含摘要生成）。
+用法（在 backend 目录下）：
+    python -m benchmarks.bench_search [简历数]
+"""
+import random
+import sys
+import time
+
+from sqlalchemy import insert
+
+from app.models.content_blob import acquire_blobs, content_hash
+from app.models.resume import Resume
+from app.models.user import User
+from app.services.search import index_resumes, search_resumes
+from benchmarks.common import make_resume_content, measure, print_row, temp_database
+
+RESUME_COUNT = 100_000
+RESUMES_PER_USER = 10
+BATCH_SIZE = 2000
+QUERIES = ("工程师", "大模型 优化", "推荐系统", "pyth", "不存在的词")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else RESUME_COUNT
+    users = (count + RESUMES_PER_USER - 1) // RESUMES_PER_USER
+    with temp_database() as (_, session_factory):
+        db = session_factory()
+        db.execute(insert(User), [
+            {"email": f"bench{u}@example.com", "password_hash": "x", "full_name": "基准用户"}
+            for u in range(users)
+        ])
+        started = time.perf_counter()
+        for start in range(0, count, BATCH_SIZE):
+            batch = [(i, make_resume_content(i)) for i in range(start, min(start + BATCH_SIZE, count))]
+            acquire_blobs(db, [content for _, content in batch])
+            db.execute(insert(Resume), [
+                {
+                    "id": i + 1,
+                    "user_id": i // RESUMES_PER_USER + 1,
+                    "title": f"简历 {i}",
+                    "template_id": "modern",
+                    "content_hash": content_hash(content),
+                }
+                for i, content in batch
+            ])
+            index_resumes(db, [(i + 1, i // RESUMES_PER_USER + 1, f"简历 {i}", content) for i, content in batch])
+        db.commit()
+        print(f"简历 {count} 份，用户 {users} 个，写入并建立索引 {time.perf_counter() - started:.1f}s\n")
+
+        rng = random.Random(42)
+        for q in QUERIES:
+            hits = []
+
+            def run():
+                hits.append(len(search_resumes(db, rng.randint(1, users), q, 20)))
+
+            stats = measure(run, repeat=200)
+            print_row(f"{q}（平均命中 {sum(hits) / len(hits):.1f}）", stats)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""SQLite PRAGMA 配置档混合读写压测
+
+多个线程同时读取简历、模拟自动保存写入，对比各配置档下的 p50/p99 延迟。
+用法（在 backend 目录下）：
+    python -m benchmarks.bench_sqlite_profiles [读线程数] [写线程数]
+"""
+import random
+import sys
+import threading
+import time
+from typing import List
+
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import SQLITE_PRAGMA_PROFILES, build_sqlite_pragmas, install_sqlite_pragmas
+from app.models.resume import Resume
+from benchmarks.common import temp_database, seed_user, seed_resumes
+
+RESUME_COUNT = 2000
+DURATION_SECONDS = 5.0
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """计算百分位（毫秒）"""
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct))] * 1000
+
+
+def run_profile(profile: str, readers: int, writers: int) -> None:
+    with temp_database() as (seed_engine, SeedSession):
+        db = SeedSession()
+        user = seed_user(db)
+        seed_resumes(db, user.id, RESUME_COUNT)
+        db.close()
+        url = str(seed_engine.url)
+        seed_engine.dispose()
+
+        engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            pool_size=readers + writers,
+        )
+        install_sqlite_pragmas(engine, build_sqlite_pragmas(profile))
+        SessionLocal = sessionmaker(bind=engine, autoflush=False)
+
+        read_samples: List[float] = []
+        write_samples: List[float] = []
+        errors = 0
+        deadline = time.perf_counter() + DURATION_SECONDS
+        lock = threading.Lock()
+
+        def reader():
+            local = []
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                with SessionLocal() as session:
+                    session.execute(select(Resume).where(Resume.id == random.randint(1, RESUME_COUNT))).scalar()
+                local.append(time.perf_counter() - start)
+            with lock:
+                read_samples.extend(local)
+
+        def writer():
+            nonlocal errors
+            local = []
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    with SessionLocal() as session:
+                        session.execute(
+                            update(Resume)
+                            .where(Resume.id == random.randint(1, RESUME_COUNT))
+                            .values(title=f"自动保存 {time.time()}")
+                        )
+                        session.commit()
+                except Exception:
+                    with lock:
+                        errors += 1
+                local.append(time.perf_counter() - start)
+            with lock:
+                write_samples.extend(local)
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        threads += [threading.Thread(target=writer) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    print(
+        f"{profile:<12} 读 {len(read_samples) / DURATION_SECONDS:8.0f}/s "
+        f"p50={percentile(read_samples, 0.5):7.2f}ms p99={percentile(read_samples, 0.99):7.2f}ms | "
+        f"写 {len(write_samples) / DURATION_SECONDS:6.0f}/s "
+        f"p50={percentile(write_samples, 0.5):7.2f}ms p99={percentile(write_samples, 0.99):7.2f}ms "
+        f"错误 {errors}"
+    )
+
+
+def main(readers: int = 8, writers: int = 4) -> None:
+    print(f"读线程 {readers}，写线程 {writers}，每个配置档运行 {DURATION_SECONDS:.0f}s\n")
+    for profile in SQLITE_PRAGMA_PROFILES:
+        run_profile(profile, readers, writers)
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
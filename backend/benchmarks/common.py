@@ -0,0 +1,116 @@
+"""基准脚本公共工具"""
+import json
+import logging
+import os
+import random
+import re
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker, Session
+
+from app.db.base import Base
+from app.models.user import User
+from app.models.resume import Resume
+from app.models.content_blob import acquire_blobs, content_hash
+from app.core.template_registry import template_registry
+
+# 基准测试时只保留警告以上的日志，避免 I/O 干扰计时
+logging.disable(logging.INFO)
+
+_BASES = [template["defaultContent"] for template in template_registry.all()]
+_PHRASES = sorted({
+    phrase
+    for base in _BASES
+    for text_value in [base["summary"]] + [job["description"] for job in base["workExperience"]]
+    for phrase in re.split(r"[，。、；]", text_value)
+    if phrase
+})
+_NAME_CHARS = "林王李张刘陈杨黄赵吴周徐孙马朱胡郭何高罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘蒋蔡余杜叶程苏魏吕丁任沈姚卢"
+
+
+def make_resume_content(index: int) -> str:
+    """按编号生成确定的一份简历内容（模板短语随机组合，各份互不相同）"""
+    rng = random.Random(index)
+    content = json.loads(json.dumps(rng.choice(_BASES)))
+    content["personalInfo"]["name"] = "".join(rng.choice(_NAME_CHARS) for _ in range(rng.randint(2, 3)))
+    content["personalInfo"]["email"] = f"user{index}@example.com"
+    content["summary"] = "，".join(rng.sample(_PHRASES, rng.randint(3, 6))) + "。"
+    jobs = content["workExperience"]
+    content["workExperience"] = [
+        {**rng.choice(jobs), "id": str(i + 1), "description": "，".join(rng.sample(_PHRASES, rng.randint(3, 6))) + "。"}
+        for i in range(rng.randint(1, 4))
+    ]
+    rng.shuffle(content["skills"])
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"))
+
+
+@contextmanager
+def temp_database() -> Iterator[Tuple[Engine, sessionmaker]]:
+    """创建临时 SQLite 数据库，结束后删除"""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    finally:
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+def seed_user(db: Session, email: str = "bench@example.com") -> User:
+    """创建基准测试用户"""
+    user = User(email=email, password_hash="x", full_name="基准用户")
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def seed_resumes(db: Session, user_id: int, count: int, content: dict = None, batch_size: int = 1000) -> None:
+    """批量插入简历（内容相同，共用一个内容块）"""
+    content_json = json.dumps(content or template_registry.get("modern")["defaultContent"], ensure_ascii=False)
+    acquire_blobs(db, [content_json] * count)
+    key = content_hash(content_json)
+    for start in range(0, count, batch_size):
+        rows = [
+            {
+                "user_id": user_id,
+                "title": f"简历 {i}",
+                "template_id": "modern",
+                "content_hash": key,
+            }
+            for i in range(start, min(start + batch_size, count))
+        ]
+        db.execute(insert(Resume), rows)
+    db.commit()
+
+
+def measure(fn: Callable[[], object], repeat: int = 20, warmup: int = 2) -> Dict[str, float]:
+    """多次执行并返回耗时统计（毫秒）"""
+    for _ in range(warmup):
+        fn()
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "mean": statistics.mean(samples),
+        "p50": samples[len(samples) // 2],
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+    }
+
+
+def print_row(label: str, stats: Dict[str, float]) -> None:
+    """打印一行统计结果"""
+    print(f"{label:<32} mean={stats['mean']:9.2f}ms  p50={stats['p50']:9.2f}ms  p99={stats['p99']:9.2f}ms")
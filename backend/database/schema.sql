@@ -12,16 +12,46 @@ CREATE TABLE IF NOT EXISTS users (
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
+-- 内容块表（按 SHA-256 去重的简历内容，refcount 为引用它的简历数）
+CREATE TABLE IF NOT EXISTS content_blobs (
+    hash TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    refcount INTEGER NOT NULL DEFAULT 0
+);
+
 -- 简历表
 CREATE TABLE IF NOT EXISTS resumes (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     user_id INTEGER NOT NULL,
     title TEXT NOT NULL,
     template_id TEXT NOT NULL,
-    content TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+    version INTEGER NOT NULL DEFAULT 1,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (content_hash) REFERENCES content_blobs(hash)
+);
+
+-- 简历修订表（每隔若干条保存完整快照，其余为 JSON Patch 增量）
+CREATE TABLE IF NOT EXISTS resume_revisions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    resume_id INTEGER NOT NULL,
+    number INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    title TEXT NOT NULL,
+    template_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (resume_id) REFERENCES resumes(id) ON DELETE CASCADE
+);
+
+-- 简历全文检索（FTS5，内容由应用分词后写入，词前带有用户 id 编码的前缀）
+CREATE VIRTUAL TABLE IF NOT EXISTS resume_search USING fts5(
+    title, summary, experience, skills, projects,
+    tokenize = 'unicode61 remove_diacritics 2'
 );
 
 -- 测试账号
@@ -33,3 +63,6 @@ VALUES ('test@example.com', '$2b$12$WZUhWX4wJ4Co8QFlBFZXXeggpxAG/mW5nx7QvjkhTZm.
 -- 索引
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_resumes_user_id ON resumes(user_id);
+CREATE INDEX IF NOT EXISTS ix_resumes_content_hash ON resumes(content_hash);
+CREATE INDEX IF NOT EXISTS ix_resumes_user_updated ON resumes(user_id, updated_at DESC, id);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_resume_revisions_resume_number ON resume_revisions(resume_id, number);
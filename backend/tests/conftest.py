@@ -1,6 +1,7 @@
 """测试夹具和配置"""
 import os
 import tempfile
+from contextlib import contextmanager
 from typing import Generator
 import pytest
 from fastapi.testclient import TestClient
@@ -10,12 +11,55 @@ from sqlalchemy.orm import sessionmaker, Session
 from app.main import app
 from app.db.base import Base
 from app.db.session import get_db
+from app.db.query_stats import QueryStats, instrument_engine, track_queries
 from app.core.config import get_settings
+from app.core.user_cache import user_cache
+from app.services.autosave import autosave_buffer
 
 # 创建临时测试数据库
 TEST_DATABASE_URL = "sqlite:///./test.db"
 
 
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    """每个测试使用独立的数据库，清空进程内的用户缓存"""
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+def check_query_budget(stats: QueryStats, limit: int) -> None:
+    """查询条数超出预算时测试失败，列出执行过的语句"""
+    if stats.count <= limit:
+        return
+    statements = "\n".join(f"  {count} x {' '.join(statement.split())}" for statement, count in stats.statements.most_common())
+    pytest.fail(f"执行了 {stats.count} 条 SQL，超出预算 {limit} 条：\n{statements}", pytrace=False)
+
+
+@pytest.fixture
+def query_budget():
+    """限定代码块内执行的 SQL 条数：with query_budget(3): client.get(...)"""
+    @contextmanager
+    def budget(limit: int):
+        with track_queries(global_scope=True) as stats:
+            yield stats
+        check_query_budget(stats, limit)
+
+    return budget
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """@pytest.mark.query_budget(n)：整个测试函数（不含夹具）最多执行 n 条 SQL"""
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+    with track_queries(global_scope=True) as stats:
+        result = yield
+    check_query_budget(stats, marker.args[0])
+    return result
+
+
 @pytest.fixture(scope="function")
 def test_engine():
     """创建测试数据库引擎"""
@@ -23,6 +67,7 @@ def test_engine():
         TEST_DATABASE_URL,
         connect_args={"check_same_thread": False}
     )
+    instrument_engine(engine)
     Base.metadata.create_all(bind=engine)
     yield engine
     Base.metadata.drop_all(bind=engine)
@@ -52,8 +97,12 @@ def client(test_db: Session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    # 自动保存缓冲在请求之外写库，同样指向测试数据库
+    session_factory = autosave_buffer.session_factory
+    autosave_buffer.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=test_db.get_bind())
     with TestClient(app) as test_client:
         yield test_client
+    autosave_buffer.session_factory = session_factory
     app.dependency_overrides.clear()
 
 
@@ -28,3 +28,61 @@ def test_redoc(client):
     """测试 ReDoc 可访问"""
     response = client.get("/redoc")
     assert response.status_code == 200
+
+
+def test_envelope_serialization():
+    """测试统一响应格式的快速序列化"""
+    import json
+    from datetime import datetime
+    from app.core.responses import envelope
+
+    response = envelope({"name": "林徐坤", "at": datetime(2024, 1, 2, 3, 4, 5)}, status_code=201)
+
+    assert response.status_code == 201
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {
+        "success": True,
+        "data": {"name": "林徐坤", "at": "2024-01-02T03:04:05"},
+        "error": None,
+    }
+    assert "林徐坤".encode() in response.body  # 不转义非 ASCII 字符
+
+
+def test_envelope_stdlib_fallback(monkeypatch):
+    """测试未安装 orjson 时回退到标准库"""
+    from app.core import responses
+
+    monkeypatch.setattr(responses, "orjson", None)
+
+    assert responses.dumps({"a": [1, "二"]}) == '{"a":[1,"二"]}'.encode()
+
+
+def test_envelope_raw_json(monkeypatch):
+    """测试已编码的 JSON 片段原样拼接进响应"""
+    import json
+    from app.core import responses
+
+    stored = '{"summary": "含\\u0000与\\"引号\\"", "skills": ["Python", "中文"]}'
+    expected = {"data": {"content": json.loads(stored), "n": [1, 2]}}
+
+    body = responses.dumps({"data": {"content": responses.raw_json(stored), "n": [1, 2]}})
+    assert json.loads(body) == expected
+
+    # 标准库回退路径走占位符替换
+    monkeypatch.setattr(responses, "orjson", None)
+    monkeypatch.setattr(responses, "_FRAGMENT", None)
+    body = responses.dumps({"data": {"content": responses.raw_json(stored), "n": [1, 2]}})
+    assert stored.encode() in body
+    assert json.loads(body) == expected
+
+
+def test_request_id_header(client):
+    """测试响应带上关联 ID，合法的传入 ID 原样沿用，非法的重新生成"""
+    response = client.get("/health")
+    assert len(response.headers["X-Request-ID"]) == 32
+
+    response = client.get("/health", headers={"X-Request-ID": "gateway-123"})
+    assert response.headers["X-Request-ID"] == "gateway-123"
+
+    response = client.get("/health", headers={"X-Request-ID": "bad id\nx"})
+    assert response.headers["X-Request-ID"] != "bad id\nx"
@@ -0,0 +1,74 @@
+"""异步数据库层测试"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import NullPool
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.db.async_session import to_async_url, get_async_db  # noqa: E402
+from app.routes import auth, auth_async, resumes, resumes_async, override_routes  # noqa: E402
+from tests.conftest import TEST_DATABASE_URL  # noqa: E402
+
+
+def test_to_async_url():
+    """测试连接串转换"""
+    assert to_async_url("sqlite:///./resume.db") == "sqlite+aiosqlite:///./resume.db"
+    assert to_async_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert to_async_url("postgres://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+
+
+def test_override_routes_keeps_base_order():
+    """测试覆盖路由时保持原有顺序"""
+    merged = override_routes(resumes.router, resumes_async.router)
+
+    assert [(r.path, r.methods) for r in merged.routes] == [
+        (r.path, r.methods) for r in resumes.router.routes
+    ]
+    ported = {(r.path, frozenset(r.methods)) for r in resumes_async.router.routes}
+    for route in merged.routes:
+        expected = resumes_async if (route.path, frozenset(route.methods)) in ported else resumes
+        assert route.endpoint.__module__ == expected.__name__
+
+
+@pytest.fixture
+def async_client(test_engine):
+    """使用异步路由的测试客户端（与同步测试共用同一个数据库文件）"""
+    engine = create_async_engine(to_async_url(TEST_DATABASE_URL), poolclass=NullPool)
+    SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with SessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(override_routes(auth.router, auth_async.router), prefix="/api/auth")
+    app.include_router(override_routes(resumes.router, resumes_async.router), prefix="/api/resumes")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as client:
+        yield client
+
+
+def test_async_resume_flow(async_client, test_user_data, test_resume_data):
+    """测试异步路由的注册、创建、查询、删除流程"""
+    response = async_client.post("/api/auth/register", json=test_user_data)
+    assert response.status_code == 201
+    headers = {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+    response = async_client.post("/api/resumes", json=test_resume_data, headers=headers)
+    assert response.status_code == 201
+    resume_id = response.json()["data"]["id"]
+
+    response = async_client.get("/api/resumes?summary=true&limit=10", headers=headers)
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["data"]["items"]] == [resume_id]
+
+    response = async_client.get(f"/api/resumes/{resume_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["data"]["content"]["personalInfo"]["name"] == "林徐坤"
+
+    response = async_client.delete(f"/api/resumes/{resume_id}", headers=headers)
+    assert response.status_code == 200
+    assert async_client.get(f"/api/resumes/{resume_id}", headers=headers).status_code == 404
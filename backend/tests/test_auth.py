@@ -170,3 +170,168 @@ class TestPasswordSecurity:
         # JWT 格式：header.payload.signature
         parts = token.split(".")
         assert len(parts) == 3
+
+
+class TestPasswordHashingPool:
+    """密码哈希工作池测试"""
+
+    def test_login_rehashes_when_rounds_change(self, client: TestClient, test_user_data, test_db):
+        """测试 bcrypt 强度变化后登录时重新哈希"""
+        from passlib.hash import bcrypt
+        from app.core.config import get_settings
+        from app.models.user import User
+
+        user = User(
+            email=test_user_data["email"],
+            password_hash=bcrypt.using(rounds=4).hash(test_user_data["password"]),
+            full_name=test_user_data["full_name"],
+        )
+        test_db.add(user)
+        test_db.commit()
+
+        response = client.post("/api/auth/login", json={
+            "email": test_user_data["email"],
+            "password": test_user_data["password"]
+        })
+
+        assert response.status_code == 200
+        test_db.refresh(user)
+        assert user.password_hash.startswith(f"$2b${get_settings().BCRYPT_ROUNDS:02d}$")
+
+    def test_hashing_pool_saturated(self, client: TestClient, test_user_data, monkeypatch):
+        """测试工作池已满时快速返回 503"""
+        import threading
+        from app.core import security
+        from app.core.hashing import PasswordHasher
+
+        saturated = PasswordHasher(max_workers=1, max_queue=0)
+        release = threading.Event()
+        saturated.submit(release.wait)
+        monkeypatch.setattr(security, "password_hasher", saturated)
+
+        try:
+            response = client.post("/api/auth/register", json=test_user_data)
+        finally:
+            release.set()
+            saturated.shutdown()
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert response.json()["error"]["code"] == "SERVICE_UNAVAILABLE"
+        assert saturated.stats()["rejected"] == 1
+
+    def test_hashing_backlog_does_not_block_other_routes(self, client: TestClient, test_engine, monkeypatch):
+        """测试大量登录/注册排队等待 bcrypt 时，其他同步接口仍能及时响应"""
+        import threading
+        from sqlalchemy.orm import sessionmaker
+        from app.core import security
+        from app.core.hashing import PasswordHasher
+        from app.db.session import get_db
+        from app.main import app
+
+        # 并发请求各用一个会话
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+
+        def per_request_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = per_request_db
+        hasher = PasswordHasher(max_workers=1, max_queue=64)
+        release = threading.Event()
+        hasher.submit(release.wait)
+        monkeypatch.setattr(security, "password_hasher", hasher)
+
+        # 超过线程池大小（40）的注册请求，全部卡在 bcrypt 排队上
+        waiting = 48
+        statuses = []
+        registers = [
+            threading.Thread(target=lambda i=i: statuses.append(client.post("/api/auth/register", json={
+                "email": f"burst{i}@example.com", "password": "password123", "full_name": "排队用户",
+            }).status_code))
+            for i in range(waiting)
+        ]
+        try:
+            for thread in registers:
+                thread.start()
+            for _ in range(500):
+                if hasher.stats()["pending"] == waiting + 1:
+                    break
+                threading.Event().wait(0.01)
+            assert hasher.stats()["pending"] == waiting + 1
+
+            health = []
+            probe = threading.Thread(target=lambda: health.append(client.get("/health").status_code))
+            probe.start()
+            probe.join(timeout=5)
+            assert health == [200]
+        finally:
+            release.set()
+            for thread in registers:
+                thread.join()
+            hasher.shutdown()
+
+        assert statuses == [201] * waiting
+
+
+class TestUserCache:
+    """已认证用户缓存测试"""
+
+    def test_repeated_requests_hit_cache(self, client: TestClient, test_user_headers):
+        """测试重复请求命中缓存"""
+        from app.core.user_cache import user_cache
+
+        client.get("/api/auth/me", headers=test_user_headers)
+        before = user_cache.stats()
+        client.get("/api/auth/me", headers=test_user_headers)
+        after = user_cache.stats()
+
+        assert after["hits"] == before["hits"] + 1
+        assert after["misses"] == before["misses"]
+
+    def test_cache_invalidated_on_user_update(self, client: TestClient, test_user_headers, test_user_data, test_db):
+        """测试用户更新后缓存失效"""
+        from app.models.user import User
+
+        client.get("/api/auth/me", headers=test_user_headers)
+        user = test_db.query(User).filter(User.email == test_user_data["email"]).first()
+        user.full_name = "新名字"
+        test_db.commit()
+
+        response = client.get("/api/auth/me", headers=test_user_headers)
+
+        assert response.json()["data"]["full_name"] == "新名字"
+
+    def test_trusted_claims_skip_lookup(self, client: TestClient, test_user_headers, test_user_data, test_db, monkeypatch):
+        """测试只读接口信任令牌声明"""
+        from app.api import deps
+        from app.models.user import User
+
+        monkeypatch.setattr(deps.settings, "AUTH_TRUST_TOKEN_CLAIMS", True)
+        assert client.get("/api/auth/me", headers=test_user_headers).status_code == 200
+        user = test_db.query(User).filter(User.email == test_user_data["email"]).first()
+        test_db.delete(user)
+        test_db.commit()
+
+        # 用户已删除：缓存随之失效，需要查库的接口返回 401；只读接口按签名声明放行
+        assert client.get("/api/resumes", headers=test_user_headers).status_code == 200
+        assert client.get("/api/auth/me", headers=test_user_headers).status_code == 401
+
+    def test_lru_eviction_and_ttl(self):
+        """测试容量淘汰与过期"""
+        from app.core.user_cache import UserCache, UserSnapshot
+
+        cache = UserCache(maxsize=2, ttl=60)
+        for i in range(3):
+            cache.put(f"token-{i}", UserSnapshot(id=i, email=f"{i}@example.com", full_name=str(i)))
+
+        assert cache.get("token-0") is None
+        assert cache.get("token-2").id == 2
+        assert cache.stats()["evictions"] == 1
+
+        expired = UserCache(maxsize=2, ttl=0)
+        expired.put("token", UserSnapshot(id=1, email="a@example.com", full_name="a"))
+        assert expired.get("token") is None
@@ -0,0 +1,127 @@
+"""自动保存写缓冲测试"""
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.resume import Resume
+from app.models.user import User
+from app.services.autosave import AutosaveBuffer
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """独立的临时数据库"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'autosave.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def create_resume(session_factory, title: str = "简历") -> Resume:
+    """插入一份简历并返回（已脱离会话）"""
+    db = session_factory()
+    try:
+        user = db.query(User).first()
+        if user is None:
+            user = User(email="autosave@example.com", password_hash="x", full_name="自动保存")
+            db.add(user)
+            db.flush()
+        resume = Resume(user_id=user.id, title=title, template_id="modern", content='{"summary":"v0"}')
+        db.add(resume)
+        db.commit()
+        db.refresh(resume)
+        db.expunge(resume)
+        return resume
+    finally:
+        db.close()
+
+
+def load(session_factory, resume_id: int) -> Resume:
+    db = session_factory()
+    try:
+        return db.get(Resume, resume_id)
+    finally:
+        db.close()
+
+
+class TestAutosaveBuffer:
+    """写缓冲行为测试"""
+
+    def test_coalesces_to_latest_version(self, session_factory):
+        """测试多次保存只保留最新版本，一次提交落盘"""
+        buffer = AutosaveBuffer(session_factory)
+        resume = create_resume(session_factory)
+
+        current = resume
+        for i in range(1, 4):
+            current = buffer.put(current, "简历", "modern", f'{{"summary":"v{i}"}}')
+
+        assert buffer.get(resume.id).content == '{"summary":"v3"}'
+        assert buffer.get(resume.id).version == 4
+        assert load(session_factory, resume.id).content == '{"summary":"v0"}'
+
+        assert buffer.flush() == 1
+        stored = load(session_factory, resume.id)
+        assert stored.content == '{"summary":"v3"}'
+        assert stored.version == 4  # 与缓冲期间返回的 ETag 版本一致
+        assert buffer.get(resume.id) is None
+        assert buffer.stats()["saves"] == 3
+        assert buffer.stats()["flushes"] == 1
+
+    def test_flush_selected_resumes(self, session_factory):
+        """测试只落盘指定简历"""
+        buffer = AutosaveBuffer(session_factory)
+        first, second = create_resume(session_factory), create_resume(session_factory)
+        buffer.put(first, "简历", "modern", '{"summary":"a"}')
+        buffer.put(second, "简历", "modern", '{"summary":"b"}')
+
+        assert buffer.flush([first.id]) == 1
+        assert buffer.get(first.id) is None
+        assert buffer.get(second.id) is not None
+
+    def test_flush_on_size_threshold(self, session_factory):
+        """测试待写入数量达到阈值时提前落盘"""
+        buffer = AutosaveBuffer(session_factory, flush_interval=60, max_pending=2)
+        buffer.start()
+        try:
+            for resume in (create_resume(session_factory), create_resume(session_factory)):
+                buffer.put(resume, "简历", "modern", '{"summary":"new"}')
+            deadline = time.monotonic() + 5
+            while buffer.stats()["flushes"] == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert buffer.stats()["rows_written"] == 2
+        finally:
+            buffer.stop()
+
+    def test_stop_flushes_pending(self, session_factory):
+        """测试关闭时同步写入，缓冲中的保存不会丢失"""
+        buffer = AutosaveBuffer(session_factory, flush_interval=60)
+        buffer.start()
+        resume = create_resume(session_factory)
+        buffer.put(resume, "关闭前保存", "classic", '{"summary":"durable"}')
+
+        buffer.stop()
+
+        stored = load(session_factory, resume.id)
+        assert stored.title == "关闭前保存"
+        assert stored.template_id == "classic"
+        assert stored.content == '{"summary":"durable"}'
+
+    def test_conflicting_version_is_dropped(self, session_factory):
+        """测试数据库版本已变化时不覆盖"""
+        buffer = AutosaveBuffer(session_factory)
+        resume = create_resume(session_factory)
+        buffer.put(resume, "简历", "modern", '{"summary":"stale"}')
+
+        db = session_factory()
+        stored = db.get(Resume, resume.id)
+        stored.title = "其他请求写入"
+        db.commit()
+        db.close()
+
+        assert buffer.flush() == 0
+        assert buffer.stats()["conflicts"] == 1
+        assert load(session_factory, resume.id).title == "其他请求写入"
@@ -0,0 +1,121 @@
+"""批量导入解析与格式转换测试"""
+import pytest
+
+from app.services.bulk_import import (
+    BulkImportError,
+    ImportFailure,
+    ImportItem,
+    iter_import_batches,
+    validate_entry,
+)
+from app.services.json_resume import from_json_resume, to_json_resume
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def collect(data: bytes, ndjson: bool, size: int = 3, **kwargs):
+    """按 size 字节切块后解析，返回全部项"""
+    entries = []
+    async for batch in iter_import_batches(chunked(data, size), ndjson, **kwargs):
+        entries.extend(batch)
+    return entries
+
+
+class TestImportParsing:
+    """请求体增量解析测试"""
+
+    async def test_array_split_across_chunks(self):
+        """测试 JSON 数组的项被切断在不同块中（含多字节字符）"""
+        data = '[{"title": "简历一"} , {"title": "简历二"},{"skills": [1, 2]}]'.encode("utf-8")
+        for size in (1, 3, 1024):
+            entries = await collect(data, ndjson=False, size=size)
+            assert entries == [(0, {"title": "简历一"}), (1, {"title": "简历二"}), (2, {"skills": [1, 2]})]
+
+    async def test_array_syntax_error_stops(self):
+        """测试数组中出现语法错误时在该项停止"""
+        entries = await collect(b'[{"a": 1}, {"b": ]', ndjson=False)
+        assert entries[0] == (0, {"a": 1})
+        assert isinstance(entries[1][1], ImportFailure)
+        assert len(entries) == 2
+
+    async def test_not_an_array(self):
+        """测试请求体不是数组时直接报错"""
+        with pytest.raises(BulkImportError):
+            await collect('{"title": "简历"}'.encode("utf-8"), ndjson=False)
+
+    async def test_ndjson_bad_line_isolated(self):
+        """测试 NDJSON 单行错误不影响其余各行，空行跳过"""
+        entries = await collect(b'{"a": 1}\n\nnot json\n{"b": 2}', ndjson=True)
+        assert [index for index, _ in entries] == [0, 1, 2]
+        assert isinstance(entries[1][1], ImportFailure)
+        assert entries[2] == (2, {"b": 2})
+
+    async def test_batches_and_limit(self):
+        """测试按批大小分批，超过上限的部分不导入"""
+        batches = []
+        async for batch in iter_import_batches(chunked(b"[1,2,3,4,5,6]", 2), False, batch_size=2, max_items=5):
+            batches.append(batch)
+        assert [len(batch) for batch in batches] == [2, 2, 2]
+        assert isinstance(batches[-1][-1][1], ImportFailure)
+
+
+class TestImportValidation:
+    """逐项校验测试"""
+
+    def test_native_item(self):
+        """测试本站格式按创建接口的 Schema 校验"""
+        item = validate_entry(0, {"title": "简历", "template_id": "modern", "content": {"skills": ["Python"]}}, "classic")
+        assert isinstance(item, ImportItem)
+        assert item.template_id == "modern"
+        assert '"skills":["Python"]' in item.content
+
+    def test_invalid_item(self):
+        """测试校验失败时给出字段位置"""
+        failure = validate_entry(3, {"title": "简历", "content": {}}, "modern")
+        assert isinstance(failure, ImportFailure) and failure.index == 3
+        assert "template_id" in failure.error
+        assert isinstance(validate_entry(4, [1], "modern"), ImportFailure)
+
+    def test_json_resume_item(self):
+        """测试 JSON Resume 转换后使用指定的模板"""
+        item = validate_entry(0, {"basics": {"name": "林徐坤"}, "skills": [{"name": "Go"}]}, "classic")
+        assert item.title == "林徐坤的简历"
+        assert item.template_id == "classic"
+        assert '"skills":["Go"]' in item.content
+
+
+class TestJsonResumeImport:
+    """JSON Resume 导入转换测试"""
+
+    def test_highlights_merged(self):
+        """测试 highlights 并入描述，无结束日期视为在职"""
+        _, content = from_json_resume({
+            "basics": {"name": "林徐坤", "location": {"city": "杭州"}, "profiles": [{"network": "LinkedIn", "url": "in/a"}]},
+            "work": [{"name": "阿里巴巴", "summary": "算法", "highlights": ["大模型", "推荐"]}],
+        })
+        assert content["personalInfo"] == {"name": "林徐坤", "location": "杭州", "linkedin": "in/a"}
+        assert content["workExperience"] == [
+            {"id": "1", "company": "阿里巴巴", "current": True, "description": "算法\n大模型\n推荐"},
+        ]
+
+    def test_roundtrip(self):
+        """测试导出再导入后内容不变"""
+        content = {
+            "personalInfo": {"name": "林徐坤", "title": "算法工程师", "email": "a@example.com", "website": "a.dev"},
+            "summary": "大模型研究",
+            "workExperience": [
+                {"id": "1", "company": "阿里巴巴", "position": "P7", "startDate": "2020-06", "current": True},
+                {"id": "2", "company": "百度", "startDate": "2018-03", "endDate": "2020-05", "current": False},
+            ],
+            "education": [{"id": "1", "school": "浙江大学", "degree": "博士", "major": "计算机"}],
+            "skills": ["Python", "Go"],
+            "projects": [{"id": "1", "name": "训练平台", "description": "千亿参数", "technologies": ["PyTorch"]}],
+        }
+
+        title, imported = from_json_resume(to_json_resume("我的简历", content, None))
+
+        assert title == "我的简历"
+        assert imported == content
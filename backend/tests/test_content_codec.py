@@ -0,0 +1,70 @@
+"""简历内容存储编码测试"""
+import hashlib
+import json
+
+import pytest
+
+from app.core import content_codec
+from app.core.content_codec import (
+    FORMAT_RAW,
+    FORMAT_ZLIB_V1,
+    FORMAT_ZSTD_V1,
+    decode_content,
+    encode_content,
+    load_dictionary,
+)
+
+CONTENT = json.dumps({
+    "personalInfo": {"name": "林徐坤", "title": "后端工程师"},
+    "summary": "五年 Python 后端开发经验，熟悉 FastAPI 与 SQLAlchemy。" * 3,
+    "skills": ["Python", "FastAPI", "SQLite"],
+}, ensure_ascii=False, separators=(",", ":"))
+
+
+class TestContentCodec:
+    """编码格式测试"""
+
+    def test_zlib_roundtrip(self):
+        """测试 zlib 压缩后能还原，且首字节为格式版本"""
+        encoded = encode_content(CONTENT, FORMAT_ZLIB_V1)
+        assert encoded[0] == FORMAT_ZLIB_V1
+        assert len(encoded) < len(CONTENT.encode("utf-8")) / 2
+        assert decode_content(encoded) == CONTENT
+
+    def test_zstd_roundtrip(self):
+        """测试 zstd 压缩后能还原"""
+        if content_codec.zstandard is None:
+            pytest.skip("未安装 zstandard")
+        encoded = encode_content(CONTENT, FORMAT_ZSTD_V1)
+        assert encoded[0] == FORMAT_ZSTD_V1
+        assert decode_content(encoded) == CONTENT
+
+    def test_small_content_stored_raw(self):
+        """测试压缩后更大的内容按原样存储"""
+        encoded = encode_content("{}", FORMAT_ZLIB_V1)
+        assert encoded == bytes((FORMAT_RAW,)) + b"{}"
+        assert decode_content(encoded) == "{}"
+
+    def test_legacy_text_passthrough(self):
+        """测试旧版未编码的文本原样返回"""
+        assert decode_content(CONTENT) == CONTENT
+        assert decode_content(None) is None
+
+    def test_unknown_format(self):
+        """测试未知格式版本报错"""
+        with pytest.raises(ValueError):
+            decode_content(b"\x7f" + CONTENT.encode("utf-8"))
+
+    def test_dictionary_frozen(self):
+        """测试 v1 字典未被修改（修改会导致已压缩的内容无法解压）"""
+        digest = hashlib.sha256(load_dictionary("v1")).hexdigest()
+        assert digest == "678a52451b077495e802c773cd7902386bdcbe4bdc6a39bafa44186a13c44c67"
+
+    def test_blob_column_is_binary(self):
+        """测试内容块列为二进制类型（PostgreSQL 上为 BYTEA）"""
+        from sqlalchemy.dialects import postgresql
+        from sqlalchemy.schema import CreateTable
+        from app.models.content_blob import ContentBlob
+
+        ddl = str(CreateTable(ContentBlob.__table__).compile(dialect=postgresql.dialect()))
+        assert "data BYTEA NOT NULL" in ddl
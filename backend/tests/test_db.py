@@ -0,0 +1,153 @@
+"""数据库配置测试"""
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db.base import build_sqlite_pragmas, install_sqlite_pragmas
+
+
+def test_build_sqlite_pragmas_overrides():
+    """测试配置档与逐项覆盖合并"""
+    pragmas = build_sqlite_pragmas("production", "busy_timeout=10000, cache_size=-2000")
+
+    assert pragmas["journal_mode"] == "WAL"
+    assert pragmas["busy_timeout"] == "10000"
+    assert pragmas["cache_size"] == "-2000"
+
+
+def test_build_sqlite_pragmas_unknown_profile():
+    """测试未知配置档"""
+    with pytest.raises(ValueError):
+        build_sqlite_pragmas("turbo")
+
+
+def test_install_sqlite_pragmas(tmp_path):
+    """测试新连接上应用 PRAGMA"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'pragma.db'}")
+    install_sqlite_pragmas(engine, build_sqlite_pragmas("production"))
+
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+    engine.dispose()
+
+
+def test_migrations_add_missing_columns(tmp_path):
+    """测试旧库启动时补齐新增列，已有数据取默认值"""
+    from app.db.base import Base
+    from app.db.migrations import run_migrations
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE resumes (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, "
+            "title TEXT NOT NULL, template_id TEXT NOT NULL, content TEXT NOT NULL, "
+            "created_at DATETIME DEFAULT CURRENT_TIMESTAMP, updated_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+        ))
+        conn.execute(text("INSERT INTO resumes (user_id, title, template_id, content) VALUES (1, '旧简历', 'modern', '{}')"))
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    run_migrations(engine)  # 可重复执行
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT version FROM resumes")).scalar() == 1
+    engine.dispose()
+
+
+def test_migrations_move_content_to_blobs(tmp_path):
+    """测试旧库的 content 列迁移到 content_blobs，相同内容只存一份"""
+    from app.db.base import Base
+    from app.db.migrations import run_migrations
+    from app.core.content_codec import decode_content
+    from app.models.content_blob import content_hash
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE resumes (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, "
+            "title TEXT NOT NULL, template_id TEXT NOT NULL, content TEXT NOT NULL, "
+            "created_at DATETIME DEFAULT CURRENT_TIMESTAMP, updated_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+        ))
+        conn.execute(text(
+            "INSERT INTO resumes (user_id, title, template_id, content) VALUES "
+            "(1, '简历', 'modern', '{\"summary\":\"a\"}'), "
+            "(1, '简历 (副本)', 'modern', '{\"summary\":\"a\"}'), "
+            "(1, '另一份', 'classic', '{\"summary\":\"b\"}')"
+        ))
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    run_migrations(engine)  # 可重复执行
+
+    with engine.connect() as conn:
+        columns = {row[1] for row in conn.execute(text("PRAGMA table_info(resumes)"))}
+        assert "content" not in columns
+        blobs = dict(conn.execute(text("SELECT hash, refcount FROM content_blobs")).all())
+        assert blobs == {content_hash('{"summary":"a"}'): 2, content_hash('{"summary":"b"}'): 1}
+        rows = conn.execute(text(
+            "SELECT r.title, b.data FROM resumes r JOIN content_blobs b ON b.hash = r.content_hash ORDER BY r.id"
+        )).all()
+        assert (rows[2][0], decode_content(rows[2][1])) == ("另一份", '{"summary":"b"}')
+        # 初始修订从内容块补建
+        assert conn.execute(text("SELECT count(*) FROM resume_revisions WHERE number = 1")).scalar() == 3
+    engine.dispose()
+
+
+def test_concurrent_workers_migrate_once(tmp_path):
+    """测试多个 worker 同时启动：等待迁移锁的 worker 重新检查后跳过，不会读取已删除的 content 列"""
+    import threading
+    import time
+    from app.db.base import Base
+    from app.db.migrations import _lock_for_migration, _rebuild_resumes_with_blobs, migrate_content_blobs
+    from app.models.content_blob import content_hash
+
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    first, second = create_engine(url), create_engine(url)
+    with first.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE resumes (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, "
+            "title TEXT NOT NULL, template_id TEXT NOT NULL, content TEXT NOT NULL, "
+            "created_at DATETIME DEFAULT CURRENT_TIMESTAMP, updated_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+        ))
+        conn.execute(text("INSERT INTO resumes (user_id, title, template_id, content) VALUES (1, '简历', 'modern', '{}')"))
+    Base.metadata.create_all(bind=first)
+
+    errors = []
+
+    def other_worker():
+        try:
+            migrate_content_blobs(second)
+        except Exception as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    # 第一个 worker 持有迁移锁期间，第二个 worker 已通过表结构检查并等待锁
+    with first.begin() as conn:
+        _lock_for_migration(conn)
+        worker = threading.Thread(target=other_worker)
+        worker.start()
+        time.sleep(0.5)
+        _rebuild_resumes_with_blobs(conn, ["id", "user_id", "title", "template_id", "content", "created_at", "updated_at"])
+    worker.join(timeout=10)
+
+    assert not worker.is_alive()
+    assert errors == []
+    with first.connect() as conn:
+        assert dict(conn.execute(text("SELECT hash, refcount FROM content_blobs")).all()) == {content_hash("{}"): 1}
+    first.dispose()
+    second.dispose()
+
+
+def test_engine_options_without_connection_pool(tmp_path, monkeypatch):
+    """测试驱动默认不复用连接（NullPool）时不传连接池大小参数"""
+    from sqlalchemy.pool import NullPool
+    from app.db import base
+
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    assert "pool_size" in base.engine_options(url)
+
+    monkeypatch.setattr(base, "default_pool_class", lambda url: NullPool)
+    options = base.engine_options(url)
+    assert not {"pool_size", "max_overflow", "pool_timeout"} & set(options)
+    create_engine(url, poolclass=NullPool, **options).dispose()
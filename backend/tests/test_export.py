@@ -0,0 +1,116 @@
+"""简历批量导出测试"""
+import json
+import random
+import tracemalloc
+import zipfile
+from datetime import datetime
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.models.content_blob import acquire_blobs, content_hash
+from app.models.resume import Resume
+from app.models.user import User
+from app.services.export import iter_export
+from app.services.json_resume import to_json_resume
+
+EXPORT_COUNT = 10_000
+
+
+class TestJsonResume:
+    """JSON Resume 格式转换测试"""
+
+    def test_convert_fields(self):
+        """测试各字段映射到 JSON Resume 对应位置，空字段省略"""
+        content = {
+            "personalInfo": {"name": "林徐坤", "title": "算法工程师", "email": "a@example.com", "linkedin": "linkedin.com/in/a"},
+            "summary": "大模型研究",
+            "workExperience": [
+                {"company": "阿里巴巴", "position": "P7", "startDate": "2020-06", "endDate": "2021-01", "current": True},
+            ],
+            "education": [{"school": "浙江大学", "degree": "博士", "major": "计算机"}],
+            "skills": ["Python", ""],
+            "projects": [{"name": "训练平台", "technologies": ["PyTorch"]}],
+        }
+
+        document = to_json_resume("我的简历", content, datetime(2024, 1, 2, 3, 4, 5))
+
+        assert document["basics"] == {
+            "name": "林徐坤",
+            "label": "算法工程师",
+            "email": "a@example.com",
+            "summary": "大模型研究",
+            "profiles": [{"network": "LinkedIn", "url": "linkedin.com/in/a"}],
+        }
+        assert document["work"] == [{"name": "阿里巴巴", "position": "P7", "startDate": "2020-06"}]
+        assert document["education"] == [{"institution": "浙江大学", "area": "计算机", "studyType": "博士"}]
+        assert document["skills"] == [{"name": "Python"}]
+        assert document["projects"] == [{"name": "训练平台", "keywords": ["PyTorch"]}]
+        assert document["meta"]["lastModified"] == "2024-01-02T03:04:05"
+
+    def test_convert_empty(self):
+        """测试空内容只保留元数据"""
+        document = to_json_resume("空白简历", {}, None)
+        assert set(document) == {"$schema", "meta"}
+
+
+class TestExportMemory:
+    """导出内存占用测试"""
+
+    def seed(self, engine) -> int:
+        """写入一个用户的 EXPORT_COUNT 份内容互不相同的简历"""
+        with Session(engine) as db:
+            user = User(email="export@example.com", password_hash="x", full_name="导出用户")
+            db.add(user)
+            db.flush()
+            for start in range(0, EXPORT_COUNT, 1000):
+                contents = []
+                for i in range(start, start + 1000):
+                    rng = random.Random(i)
+                    contents.append(json.dumps({
+                        "summary": "".join(rng.choice("0123456789abcdef") for _ in range(2000)),
+                        "skills": ["Python"],
+                    }))
+                acquire_blobs(db, contents)
+                db.execute(insert(Resume), [
+                    {"user_id": user.id, "title": f"简历 {i}", "template_id": "modern", "content_hash": content_hash(content)}
+                    for i, content in enumerate(contents, start)
+                ])
+            db.commit()
+            return user.id
+
+    def consume(self, engine, user_id, fmt, path):
+        """把导出流写入文件，返回 (文件大小, 峰值内存)"""
+        total = 0
+        tracemalloc.start()
+        try:
+            with open(path, "wb") as output:
+                for chunk in iter_export(engine, user_id, fmt, "native"):
+                    total += len(chunk)
+                    output.write(chunk)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return total, peak
+
+    def test_peak_memory_bounded(self, tmp_path):
+        """测试导出 1 万份简历时内存峰值有上限，远小于导出文件大小"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+        Base.metadata.create_all(bind=engine)
+        user_id = self.seed(engine)
+
+        total, peak = self.consume(engine, user_id, "ndjson", tmp_path / "resumes.ndjson")
+        assert total > 16 * 1024 * 1024
+        # 只持有当前一批行和一个输出块
+        assert peak < 4 * 1024 * 1024
+        with open(tmp_path / "resumes.ndjson", "rb") as output:
+            assert sum(1 for _ in output) == EXPORT_COUNT
+
+        total, peak = self.consume(engine, user_id, "zip", tmp_path / "resumes.zip")
+        # 另有中央目录，每份简历约 0.5KB
+        assert peak < 12 * 1024 * 1024
+        with zipfile.ZipFile(tmp_path / "resumes.zip") as archive:
+            assert len(archive.namelist()) == EXPORT_COUNT
+            assert json.loads(archive.read("1.json"))["title"] == "简历 0"
+        engine.dispose()
@@ -0,0 +1,81 @@
+"""JSON Patch / Merge Patch 测试"""
+import pytest
+
+from app.core.json_patch import (
+    JsonPatchError,
+    JsonPatchTestFailed,
+    apply_merge_patch,
+    apply_patch,
+    parse_pointer,
+    touched_keys,
+)
+
+
+class TestJsonPatch:
+    """RFC 6902 测试"""
+
+    def test_parse_pointer_escapes(self):
+        """测试 ~0 / ~1 转义"""
+        assert parse_pointer("") == []
+        assert parse_pointer("/a~1b/c~0d/0") == ["a/b", "c~d", "0"]
+        with pytest.raises(JsonPatchError):
+            parse_pointer("summary")
+
+    def test_apply_operations(self):
+        """测试 add/remove/replace/move/copy/test"""
+        doc = {"summary": "旧", "skills": ["Python", "Go"], "personalInfo": {"name": "林徐坤"}}
+
+        apply_patch(doc, [
+            {"op": "replace", "path": "/summary", "value": "新"},
+            {"op": "add", "path": "/skills/-", "value": "Rust"},
+            {"op": "remove", "path": "/skills/0"},
+            {"op": "copy", "from": "/personalInfo/name", "path": "/personalInfo/alias"},
+            {"op": "move", "from": "/personalInfo/alias", "path": "/personalInfo/nickname"},
+            {"op": "test", "path": "/skills", "value": ["Go", "Rust"]},
+        ])
+
+        assert doc == {
+            "summary": "新",
+            "skills": ["Go", "Rust"],
+            "personalInfo": {"name": "林徐坤", "nickname": "林徐坤"},
+        }
+
+    def test_invalid_operations(self):
+        """测试非法路径与操作"""
+        doc = {"skills": ["Python"]}
+        for operation in (
+            {"op": "remove", "path": "/summary"},
+            {"op": "add", "path": "/skills/5", "value": "Go"},
+            {"op": "replace", "path": "/skills/01", "value": "Go"},
+            {"op": "add", "path": "/skills"},
+            {"op": "move", "from": "/skills", "path": "/skills/0"},
+            {"op": "increment", "path": "/skills"},
+            {"op": "replace", "path": "", "value": {}},
+            {"op": "remove", "path": 5},
+            {"op": "copy", "from": ["skills"], "path": "/languages"},
+        ):
+            with pytest.raises(JsonPatchError):
+                apply_patch(doc, [operation])
+
+    def test_test_operation_failure(self):
+        """测试 test 操作按 JSON 语义比较"""
+        with pytest.raises(JsonPatchTestFailed):
+            apply_patch({"gpa": 1}, [{"op": "test", "path": "/gpa", "value": True}])
+
+    def test_touched_keys(self):
+        """测试统计补丁涉及的顶层字段"""
+        operations = [
+            {"op": "replace", "path": "/workExperience/0/description", "value": "x"},
+            {"op": "move", "from": "/summary", "path": "/projects/0/name"},
+            {"op": "test", "path": "/skills", "value": []},
+        ]
+        assert touched_keys(operations) == {"workExperience", "summary", "projects"}
+
+
+def test_apply_merge_patch():
+    """测试 RFC 7386 合并规则"""
+    target = {"personalInfo": {"name": "林徐坤", "phone": "1"}, "summary": "旧", "skills": ["Python"]}
+
+    result = apply_merge_patch(target, {"personalInfo": {"phone": None, "email": "a@b.c"}, "summary": None, "skills": ["Go"]})
+
+    assert result == {"personalInfo": {"name": "林徐坤", "email": "a@b.c"}, "skills": ["Go"]}
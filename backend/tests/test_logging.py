@@ -0,0 +1,194 @@
+"""日志队列、文件轮转与结构化日志测试"""
+import json
+import logging
+import threading
+
+from app.core.logging import JsonFormatter, LogEvent, LogPipeline, RotatingLogFileHandler
+from app.core.request_context import request_id_var
+
+
+class BlockingHandler(logging.Handler):
+    """放行前阻塞写出，模拟卡住的磁盘"""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.records = []
+        self.messages = []
+
+    def emit(self, record):
+        self.gate.wait(5)
+        self.records.append(record)
+        self.messages.append(record.getMessage())
+
+
+def make_logger(name, pipeline):
+    logger = logging.getLogger(name)
+    logger.handlers = [pipeline.handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+class TestRotatingLogFileHandler:
+    """按大小轮转测试"""
+
+    def test_rollover_by_size(self, tmp_path):
+        """测试超过大小时归档，同一周期内的归档追加序号，只保留最近的几个"""
+        handler = RotatingLogFileHandler(tmp_path / "app.log", "midnight", max_bytes=200, backup_count=2)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger = logging.getLogger("test_rollover_by_size")
+        logger.handlers = [handler]
+        logger.propagate = False
+
+        for i in range(20):
+            logger.warning(f"第 {i} 条日志 " + "x" * 40)
+        handler.close()
+
+        archives = sorted(path.name for path in tmp_path.iterdir() if path.name != "app.log")
+        assert len(archives) == 2
+        assert all(name.startswith("app.log.") for name in archives)
+        assert (tmp_path / "app.log").stat().st_size <= 200
+        assert "第 19 条日志" in (tmp_path / "app.log").read_text(encoding="utf-8")
+
+
+class TestLogPipeline:
+    """队列写出测试"""
+
+    def test_logging_does_not_block(self):
+        """测试写出线程卡住时不阻塞调用方，队列满后丢弃并计数"""
+        handler = BlockingHandler()
+        pipeline = LogPipeline([handler], maxsize=10, policy="drop", block_timeout=1.0)
+        pipeline.start()
+        logger = make_logger("test_logging_does_not_block", pipeline)
+
+        for i in range(100):
+            logger.info(f"消息 {i}")
+
+        stats = pipeline.stats()
+        # 写出线程取走一条后阻塞，队列中最多 10 条
+        assert stats["dropped"] >= 89
+        handler.gate.set()
+        pipeline.stop()
+        assert len(handler.messages) == 100 - pipeline.stats()["dropped"]
+
+    def test_errors_not_dropped(self):
+        """测试 drop 策略下错误日志等待入队而不是丢弃"""
+        handler = BlockingHandler()
+        pipeline = LogPipeline([handler], maxsize=1, policy="drop", block_timeout=5.0)
+        pipeline.start()
+        logger = make_logger("test_errors_not_dropped", pipeline)
+
+        threading.Timer(0.2, handler.gate.set).start()
+        for i in range(5):
+            logger.error(f"错误 {i}")
+        pipeline.stop()
+
+        assert handler.messages == [f"错误 {i}" for i in range(5)]
+        assert pipeline.stats()["dropped"] == 0
+
+    def test_stop_drains_queue(self):
+        """测试停止时写完队列，停止后直接在当前线程写出"""
+        handler = BlockingHandler()
+        handler.gate.set()
+        pipeline = LogPipeline([handler], maxsize=100, policy="block", block_timeout=1.0)
+        pipeline.start()
+        logger = make_logger("test_stop_drains_queue", pipeline)
+
+        for i in range(50):
+            logger.info(f"消息 {i}")
+        pipeline.stop()
+        logger.info("停止后")
+
+        assert handler.messages == [f"消息 {i}" for i in range(50)] + ["停止后"]
+
+
+class CountingValue:
+    """记录被格式化的次数"""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "value"
+
+
+class TestStructuredLogging:
+    """结构化日志、关联 ID 与采样测试"""
+
+    def make_pipeline(self, name, sample_rate=1.0):
+        handler = BlockingHandler()
+        handler.gate.set()
+        pipeline = LogPipeline([handler], maxsize=100, policy="block", block_timeout=1.0, sample_rate=sample_rate)
+        pipeline.start()
+        return handler, pipeline, make_logger(name, pipeline)
+
+    def test_json_fields(self):
+        """测试 JSON 格式把字段展开为顶层键，不覆盖日志系统的键，异常堆栈单独输出"""
+        handler, pipeline, logger = self.make_pipeline("test_json_fields")
+        token = request_id_var.set("req-1")
+        try:
+            try:
+                raise RuntimeError("磁盘已满")
+            except RuntimeError as e:
+                logger.error(LogEvent("更新简历失败", resume_id=1, level="x", error=str(e)), exc_info=True)
+        finally:
+            request_id_var.reset(token)
+        pipeline.stop()
+
+        document = json.loads(JsonFormatter().format(handler.records[0]))
+        assert document["message"] == "更新简历失败"
+        assert document["resume_id"] == 1
+        assert document["level"] == "ERROR"
+        assert document["request_id"] == "req-1"
+        assert "RuntimeError: 磁盘已满" in document["exc_info"]
+        assert handler.messages == ["更新简历失败: resume_id=1, level=x, error=磁盘已满"]
+
+    def test_fields_formatted_lazily(self):
+        """测试被级别过滤或采样掉的日志不格式化字段，写出的日志在后台线程格式化"""
+        handler, pipeline, logger = self.make_pipeline("test_fields_formatted_lazily", sample_rate=0.0)
+        value = CountingValue()
+
+        logger.debug(LogEvent("调试", value=value))
+        logger.info(LogEvent("采样丢弃", value=value))
+        assert value.formatted == 0
+
+        logger.warning(LogEvent("保留", value=value))
+        pipeline.stop()
+        assert handler.messages == ["保留: value=value"]
+
+    def test_sampling_keeps_errors(self):
+        """测试采样只丢弃 INFO 及以下，警告、错误和带异常信息的日志始终保留"""
+        handler, pipeline, logger = self.make_pipeline("test_sampling_keeps_errors", sample_rate=0.0)
+
+        logger.info("信息")
+        logger.warning("警告")
+        logger.error("错误")
+        try:
+            raise ValueError("x")
+        except ValueError:
+            logger.info("带异常的信息", exc_info=True)
+        pipeline.stop()
+
+        assert handler.messages == ["警告", "错误", "带异常的信息"]
+        assert pipeline.stats()["sampled_out"] == 1
+
+    def test_sampling_per_request(self):
+        """测试同一请求的日志整体保留或整体丢弃"""
+        handler, pipeline, logger = self.make_pipeline("test_sampling_per_request", sample_rate=0.5)
+
+        for request in range(200):
+            token = request_id_var.set(f"req-{request}")
+            try:
+                for i in range(3):
+                    logger.info(f"{request}-{i}")
+            finally:
+                request_id_var.reset(token)
+        pipeline.stop()
+
+        kept = {}
+        for record in handler.records:
+            kept[record.request_id] = kept.get(record.request_id, 0) + 1
+        assert set(kept.values()) == {3}
+        assert 50 < len(kept) < 150
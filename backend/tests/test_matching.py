@@ -0,0 +1,56 @@
+"""岗位匹配评分测试"""
+import json
+
+import numpy as np
+
+from app.services.matching import build_query, extract_terms, score_vectors, vectorize
+
+JOB = "负责推荐系统研发，熟悉 Python 和 Spark，有大模型经验优先"
+
+
+def make_content(skills, projects=""):
+    return json.dumps({"skills": skills, "projects": [{"description": projects}], "summary": "推荐系统"}, ensure_ascii=False)
+
+
+class TestMatchScoring:
+    """分词与 BM25 评分测试"""
+
+    def test_extract_terms(self):
+        """测试中文按相邻两字切分，英文转小写，并去掉套话"""
+        assert extract_terms("熟悉Spark 推荐系统") == ["spark", "推荐", "荐系", "系统"]
+
+    def test_query_without_terms(self):
+        """测试没有可用词项时不构造查询"""
+        assert build_query("熟悉 以上 and the") is None
+
+    def test_only_selected_fields(self):
+        """测试只统计 skills / workExperience / projects 字段"""
+        vector = vectorize(make_content([]))
+        assert len(vector.ids) == 0
+        assert vector.length == 0
+
+    def test_more_relevant_scores_higher(self):
+        """测试命中更多岗位关键词的简历得分和覆盖率更高"""
+        query = build_query(JOB)
+        vectors = [
+            vectorize(make_content(["Python", "Spark"], "推荐系统大模型召回")),
+            vectorize(make_content(["Python"])),
+            vectorize(make_content(["Java"])),
+        ]
+        scores, coverage, hit_doc, _ = score_vectors(query, vectors)
+
+        assert scores[0] > scores[1] > scores[2] == 0
+        assert coverage[0] > coverage[1] > coverage[2] == 0
+        assert set(hit_doc.tolist()) == {0, 1}
+
+    def test_skills_weighted(self):
+        """测试技能字段中的命中权重更高"""
+        query = build_query("Spark")
+        vectors = [vectorize(make_content(["Spark"])), vectorize(make_content([], "Spark"))]
+        scores, _, _, _ = score_vectors(query, vectors)
+        assert scores[0] > scores[1]
+
+    def test_empty_batch(self):
+        """测试没有简历时返回空结果"""
+        scores, coverage, _, _ = score_vectors(build_query(JOB), [])
+        assert isinstance(scores, np.ndarray) and len(scores) == 0 and len(coverage) == 0
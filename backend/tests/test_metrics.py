@@ -0,0 +1,105 @@
+"""Prometheus 指标测试"""
+from prometheus_client import REGISTRY
+
+from app.main import app
+from app.core.metrics import UNMATCHED_ROUTE, MetricsMiddleware
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetrics:
+    """请求指标测试"""
+
+    def test_route_template_labels(self):
+        """测试路由标签取路径模板，未匹配的路径合并为一个标签"""
+        middleware = MetricsMiddleware(None, router=app.router)
+
+        assert middleware._match_route("GET", "/api/resumes/42") == "/api/resumes/{resume_id}"
+        assert middleware._match_route("GET", "/api/resumes/export") == "/api/resumes/export"
+        assert middleware._match_route("GET", "/no/such/path") == UNMATCHED_ROUTE
+
+    def test_routes_without_path_skipped(self):
+        """测试不带 path 的路由对象（如新版 FastAPI 的嵌套路由）被跳过，不影响其余路由"""
+        from starlette.routing import BaseRoute, Match, Route, Router
+
+        class PathlessRoute(BaseRoute):
+            def matches(self, scope):
+                return Match.FULL, {}
+
+        router = Router(routes=[PathlessRoute(), Route("/health", lambda request: None)])
+        middleware = MetricsMiddleware(None, router=router)
+
+        assert middleware._match_route("GET", "/health") == "/health"
+        assert middleware._match_route("GET", "/api/resumes") == UNMATCHED_ROUTE
+
+    def test_included_router_prefix(self):
+        """测试新版 FastAPI 的嵌套路由对象（不带 path）按 include 前缀展开为完整模板"""
+        from types import SimpleNamespace
+        from fastapi import APIRouter
+        from starlette.routing import BaseRoute, Route, Router
+
+        class IncludedRouter(BaseRoute):
+            def __init__(self, router, prefix):
+                self.original_router = router
+                self.include_context = SimpleNamespace(prefix=prefix)
+
+        items = APIRouter()
+        items.add_api_route("", lambda: None, methods=["GET"])
+        items.add_api_route("/{item_id}", lambda item_id: None, methods=["PUT"])
+        api = APIRouter()
+        api.routes.append(IncludedRouter(items, "/items"))
+        router = Router(routes=[IncludedRouter(api, "/api"), Route("/health", lambda request: None)])
+        middleware = MetricsMiddleware(None, router=router)
+
+        assert middleware._match_route("GET", "/api/items") == "/api/items"
+        assert middleware._match_route("PUT", "/api/items/7") == "/api/items/{item_id}"
+        assert middleware._match_route("GET", "/api/items/7") == "/api/items/{item_id}"
+        assert middleware._match_route("GET", "/health") == "/health"
+        assert middleware._match_route("GET", "/api") == UNMATCHED_ROUTE
+
+    def test_request_metrics(self, client):
+        """测试请求数、延迟、进行中请求数和响应大小"""
+        labels = {"method": "GET", "route": "/health"}
+        before = sample("http_requests_total", status="200", **labels)
+        size_before = sample("http_response_size_bytes_sum", **labels)
+
+        for _ in range(3):
+            assert client.get("/health").status_code == 200
+
+        assert sample("http_requests_total", status="200", **labels) == before + 3
+        assert sample("http_request_duration_seconds_count", **labels) >= 3
+        assert sample("http_requests_in_progress", **labels) == 0
+        assert sample("http_response_size_bytes_sum", **labels) - size_before == 3 * len(b'{"status":"ok"}')
+
+    def test_metrics_endpoint(self, client, test_user_headers):
+        """测试 /metrics 输出文本格式，包含数据库连接与 bcrypt 耗时"""
+        client.get("/api/resumes", headers=test_user_headers)
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'http_requests_total{method="GET",route="/api/resumes",status="200"}' in response.text
+        assert "password_hash_seconds_count" in response.text
+        assert "db_session_checkout_seconds_bucket" in response.text
+
+    def test_component_stats_gauges(self, client):
+        """测试各组件状态作为 gauge 输出到 /metrics，原 /health/* 状态接口不再公开"""
+        from app.core.user_cache import user_cache
+
+        response = client.get("/metrics")
+
+        assert "password_hasher_pending " in response.text
+        assert "password_hasher_queue_wait_avg_ms " in response.text
+        assert "pdf_render_cache_bytes " in response.text
+        assert "autosave_pending " in response.text
+        assert "log_pipeline_running " in response.text
+        assert "log_pipeline_policy" not in response.text
+        assert "match_vector_cache_hits " in response.text
+        assert sample("user_cache_hits") == user_cache.stats()["hits"]
+        for path in ("/health/hashing", "/health/pdf", "/health/autosave",
+                     "/health/logging", "/health/match-cache", "/health/user-cache"):
+            assert client.get(path).status_code == 404
+        assert client.get("/health").json() == {"status": "ok"}
@@ -0,0 +1,124 @@
+"""采样分析器测试"""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import get_settings
+from app.core.profiler import ProfilerBusy, ProfilerMiddleware, StackSampler, profiler
+from app.core.request_context import request_id_var
+from app.core.security import create_user_access_token
+
+settings = get_settings()
+
+
+def spin(seconds: float) -> None:
+    """占用 CPU 一段时间"""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestStackSampler:
+    """调用栈采样测试"""
+
+    def test_captures_busy_function(self):
+        """测试采样到其他线程中正在执行的函数，输出 collapsed 格式"""
+        worker = threading.Thread(target=spin, args=(0.3,), name="busy-worker")
+        sampler = StackSampler(0.005)
+        sampler.start()
+        worker.start()
+        worker.join()
+        sampler.stop()
+
+        assert sampler.samples > 10
+        lines = sampler.collapsed().splitlines()
+        busy = [line for line in lines if line.startswith("busy-worker;")]
+        assert any("tests.test_profiler:spin" in line for line in busy)
+        stack, count = busy[0].rsplit(" ", 1)
+        assert int(count) > 0 and "stack-sampler" not in stack
+
+    def test_single_sampler(self):
+        """测试同一时间只运行一个采样器"""
+        sampler = profiler.start(0.01)
+        try:
+            with pytest.raises(ProfilerBusy):
+                profiler.start(0.01)
+        finally:
+            profiler.stop(sampler)
+
+
+class TestProfilerApi:
+    """采样接口测试"""
+
+    def test_disabled_by_default(self, client, test_user_headers, monkeypatch, test_user_data):
+        """测试未开启时接口不存在"""
+        monkeypatch.setattr(settings, "ADMIN_EMAILS", test_user_data["email"])
+        response = client.post("/api/admin/profile?seconds=0.1", headers=test_user_headers)
+        assert response.status_code == 404
+
+    def test_admin_only(self, client, test_user_headers, monkeypatch):
+        """测试非管理员无权采样"""
+        monkeypatch.setattr(settings, "PROFILER_ENABLED", True)
+        monkeypatch.setattr(settings, "ADMIN_EMAILS", "admin@example.com")
+        response = client.post("/api/admin/profile?seconds=0.1", headers=test_user_headers)
+        assert response.status_code == 403
+
+    def test_profile_process(self, client, test_user_headers, monkeypatch, test_user_data):
+        """测试采样整个进程，返回 collapsed 格式和 JSON 概况"""
+        monkeypatch.setattr(settings, "PROFILER_ENABLED", True)
+        monkeypatch.setattr(settings, "ADMIN_EMAILS", f"other@example.com, {test_user_data['email'].upper()}")
+
+        response = client.post("/api/admin/profile?seconds=0.2&interval_ms=5", headers=test_user_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in response.text.splitlines())
+
+        response = client.post("/api/admin/profile?seconds=0.1&format=json", headers=test_user_headers)
+        data = response.json()["data"]
+        assert data["samples"] > 0 and data["stacks"]
+
+        response = client.post("/api/admin/profile?seconds=3600", headers=test_user_headers)
+        assert response.status_code == 400
+
+
+class TestProfilerMiddleware:
+    """单请求采样测试"""
+
+    async def call(self, headers):
+        async def app(scope, receive, send):
+            spin(0.1)
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        token = request_id_var.set("req-profile")
+        try:
+            await ProfilerMiddleware(app)({"type": "http", "headers": headers}, None, send)
+        finally:
+            request_id_var.reset(token)
+        return dict(messages[0]["headers"])
+
+    async def test_profile_request(self, monkeypatch):
+        """测试管理员带 X-Profile 头的请求被采样，结果按关联 ID 取回"""
+        monkeypatch.setattr(settings, "ADMIN_EMAILS", "admin@example.com")
+        admin = SimpleNamespace(id=1, email="admin@example.com", full_name="管理员")
+        user = SimpleNamespace(id=2, email="user@example.com", full_name="用户")
+
+        headers = await self.call([
+            (b"x-profile", b"1"),
+            (b"authorization", f"Bearer {create_user_access_token(admin)}".encode()),
+        ])
+        assert headers[b"x-profile-id"] == b"req-profile"
+        assert "tests.test_profiler:spin" in profiler.get_result("req-profile")
+
+        headers = await self.call([
+            (b"x-profile", b"1"),
+            (b"authorization", f"Bearer {create_user_access_token(user)}".encode()),
+        ])
+        assert b"x-profile-id" not in headers
@@ -0,0 +1,67 @@
+"""SQL 查询统计测试"""
+import logging
+
+from sqlalchemy import create_engine, text
+
+from app.db import query_stats
+from app.db.query_stats import QueryStatsMiddleware, instrument_engine, redact_parameters, track_queries
+
+
+def make_engine():
+    engine = instrument_engine(create_engine("sqlite://"))
+    # 重复安装不会重复计数
+    return instrument_engine(engine)
+
+
+class TestQueryStats:
+    """查询计数、慢查询与 N+1 检测测试"""
+
+    def test_count_per_scope(self):
+        """测试只统计当前范围内的查询"""
+        engine = make_engine()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            with track_queries() as stats:
+                for i in range(3):
+                    conn.execute(text("SELECT :i"), {"i": i})
+            conn.execute(text("SELECT 2"))
+
+        assert stats.count == 3
+        assert stats.duration > 0
+        assert stats.repeated(3) == [("SELECT ?", 3)]
+
+    def test_redact_parameters(self):
+        """测试参数只保留类型"""
+        assert redact_parameters(("a@example.com", 1), False) == "(str, int)"
+        assert redact_parameters({"email": "a@example.com"}, False) == "{email: str}"
+        assert redact_parameters([("secret", 1), ("secret", 2)], True) == "(str, int) x 2"
+
+    def test_slow_query_logged_without_values(self, monkeypatch, caplog):
+        """测试慢查询记录语句和参数类型，不记录参数值"""
+        monkeypatch.setattr(query_stats.settings, "DB_SLOW_QUERY_MS", 0.000001)
+        engine = make_engine()
+        with caplog.at_level(logging.WARNING, logger="app.db.query_stats"):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT :password"), {"password": "hunter2"})
+
+        message = caplog.records[-1].getMessage()
+        assert "慢查询" in message
+        assert "params=(str)" in message
+        assert "hunter2" not in message
+
+    async def test_n_plus_one_warning(self, monkeypatch, caplog):
+        """测试同一请求中重复执行同一语句时记录疑似 N+1"""
+        monkeypatch.setattr(query_stats.settings, "DB_N_PLUS_ONE_THRESHOLD", 5)
+        engine = make_engine()
+
+        async def app(scope, receive, send):
+            with engine.connect() as conn:
+                for i in range(5):
+                    conn.execute(text("SELECT :i"), {"i": i})
+
+        with caplog.at_level(logging.WARNING, logger="app.db.query_stats"):
+            await QueryStatsMiddleware(app)({"type": "http", "method": "GET", "path": "/api/resumes"}, None, None)
+
+        message = caplog.records[-1].getMessage()
+        assert message.startswith("疑似 N+1 查询")
+        assert "count=5" in message
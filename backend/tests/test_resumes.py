@@ -1,7 +1,46 @@
 """简历模块测试"""
+import io
+import json
+import zipfile
+
 import pytest
+from fastapi import APIRouter
 from fastapi.testclient import TestClient
 
+from app.main import app
+from app.routes import api_routers
+from tests.conftest import TEST_DATABASE_URL
+
+
+@pytest.fixture(params=["sync", "async"])
+def client(request, client, test_engine, monkeypatch):
+    """每个简历测试分别在同步路由和 DB_ASYNC 的异步路由下运行"""
+    if request.param == "sync":
+        yield client
+        return
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+    from app.db.async_session import get_async_db, to_async_url
+    from app.db.query_stats import instrument_engine
+
+    engine = create_async_engine(to_async_url(TEST_DATABASE_URL), poolclass=NullPool)
+    instrument_engine(engine.sync_engine)
+    SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with SessionLocal() as db:
+            yield db
+
+    # 异步路由排在原有路由之前，同路径的请求由异步实现处理
+    router = APIRouter(dependency_overrides_provider=app)
+    for api_router, prefix, tag in api_routers(db_async=True):
+        router.include_router(api_router, prefix=prefix, tags=[tag])
+    monkeypatch.setattr(app.router, "routes", [*router.routes, *app.router.routes])
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    yield client
+    app.dependency_overrides.pop(get_async_db, None)
+
 
 class TestCreateResume:
     """创建简历测试"""
@@ -68,6 +107,52 @@ class TestGetResumes:
 
         assert response.status_code == 401
 
+    def test_get_resumes_summary(self, client: TestClient, test_user_headers, test_resume):
+        """测试摘要模式不返回 content"""
+        response = client.get("/api/resumes?summary=true", headers=test_user_headers)
+
+        assert response.status_code == 200
+        item = response.json()["data"][0]
+        assert item["id"] == test_resume["id"]
+        assert item["title"] == test_resume["title"]
+        assert "content" not in item
+        assert "updated_at" in item
+
+    def test_get_resumes_keyset_pagination(self, client: TestClient, test_user_headers, test_resume_data):
+        """测试游标分页遍历全部简历且不重复"""
+        created_ids = set()
+        for i in range(5):
+            response = client.post(
+                "/api/resumes",
+                json={**test_resume_data, "title": f"简历 {i}"},
+                headers=test_user_headers
+            )
+            created_ids.add(response.json()["data"]["id"])
+
+        seen_ids = []
+        cursor = None
+        while True:
+            url = "/api/resumes?summary=true&limit=2"
+            if cursor:
+                url += f"&cursor={cursor}"
+            response = client.get(url, headers=test_user_headers)
+            assert response.status_code == 200
+            page = response.json()["data"]
+            assert len(page["items"]) <= 2
+            seen_ids.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert len(seen_ids) == len(created_ids)
+        assert set(seen_ids) == created_ids
+
+    def test_get_resumes_invalid_cursor(self, client: TestClient, test_user_headers):
+        """测试无效游标"""
+        response = client.get("/api/resumes?cursor=not-a-cursor", headers=test_user_headers)
+
+        assert response.status_code == 400
+
 
 class TestGetResumeDetail:
     """获取简历详情测试"""
@@ -138,6 +223,359 @@ class TestUpdateResume:
         assert response.status_code == 404
 
 
+class TestConditionalRequests:
+    """ETag 条件请求与乐观并发测试"""
+
+    def test_get_resume_returns_etag(self, client: TestClient, test_user_headers, test_resume):
+        """测试详情返回 ETag，版本未变时返回 304"""
+        url = f"/api/resumes/{test_resume['id']}"
+        response = client.get(url, headers=test_user_headers)
+        etag = response.headers["etag"]
+
+        assert response.status_code == 200
+        assert response.json()["data"]["version"] == 1
+        assert response.headers["cache-control"] == "private, no-cache"
+
+        response = client.get(url, headers={**test_user_headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_etag_changes_after_update(self, client: TestClient, test_user_headers, test_resume):
+        """测试更新后旧 ETag 失效"""
+        url = f"/api/resumes/{test_resume['id']}"
+        etag = client.get(url, headers=test_user_headers).headers["etag"]
+
+        response = client.put(url, json={**test_resume, "title": "新标题"}, headers=test_user_headers)
+        assert response.status_code == 200
+        assert response.json()["data"]["version"] == 2
+        assert response.headers["etag"] != etag
+
+        response = client.get(url, headers={**test_user_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["data"]["title"] == "新标题"
+
+    def test_update_with_matching_if_match(self, client: TestClient, test_user_headers, test_resume):
+        """测试 If-Match 与当前版本一致时正常写入"""
+        url = f"/api/resumes/{test_resume['id']}"
+        etag = client.get(url, headers=test_user_headers).headers["etag"]
+
+        response = client.put(
+            url,
+            json={**test_resume, "title": "新标题"},
+            headers={**test_user_headers, "If-Match": etag},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["data"]["title"] == "新标题"
+
+    def test_update_with_stale_if_match(self, client: TestClient, test_user_headers, test_resume):
+        """测试两个标签页并发编辑时后提交的一方收到 412"""
+        url = f"/api/resumes/{test_resume['id']}"
+        etag = client.get(url, headers=test_user_headers).headers["etag"]
+
+        first = client.put(
+            url,
+            json={**test_resume, "title": "标签页 A"},
+            headers={**test_user_headers, "If-Match": etag},
+        )
+        second = client.put(
+            url,
+            json={**test_resume, "title": "标签页 B"},
+            headers={**test_user_headers, "If-Match": etag},
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 412
+        assert second.json()["error"]["code"] == "PRECONDITION_FAILED"
+        assert client.get(url, headers=test_user_headers).json()["data"]["title"] == "标签页 A"
+
+    def test_update_with_weak_if_match(self, client: TestClient, test_user_headers, test_resume):
+        """测试 If-Match 使用强比较：弱 ETag 即使版本相同也返回 412"""
+        url = f"/api/resumes/{test_resume['id']}"
+        etag = client.get(url, headers=test_user_headers).headers["etag"]
+
+        response = client.put(
+            url,
+            json={**test_resume, "title": "新标题"},
+            headers={**test_user_headers, "If-Match": f"W/{etag}"},
+        )
+
+        assert response.status_code == 412
+        assert client.get(url, headers=test_user_headers).json()["data"]["title"] == test_resume["title"]
+
+        response = client.put(
+            url,
+            json={**test_resume, "title": "新标题"},
+            headers={**test_user_headers, "If-Match": f"W/{etag}, {etag}"},
+        )
+        assert response.status_code == 200
+
+    def test_unchanged_update_skips_write(self, client: TestClient, test_user_headers, test_resume):
+        """测试提交相同内容时不写库、版本号不变"""
+        url = f"/api/resumes/{test_resume['id']}"
+        etag = client.get(url, headers=test_user_headers).headers["etag"]
+
+        response = client.put(url, json=test_resume, headers=test_user_headers)
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == etag
+        assert response.json()["data"]["version"] == 1
+        assert response.json()["data"]["updated_at"] == test_resume["updated_at"]
+
+
+class TestPatchResume:
+    """局部更新简历测试"""
+
+    def test_json_patch(self, client: TestClient, test_user_headers, test_resume):
+        """测试 JSON Patch 只修改指定字段"""
+        url = f"/api/resumes/{test_resume['id']}"
+        response = client.patch(
+            url,
+            json=[
+                {"op": "replace", "path": "/summary", "value": "专注大模型推理优化"},
+                {"op": "add", "path": "/skills/-", "value": "CUDA"},
+            ],
+            headers={**test_user_headers, "Content-Type": "application/json-patch+json"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["data"]["version"] == 2
+        assert "content" not in response.json()["data"]
+        assert response.headers["etag"] == f'"{test_resume["id"]}-2"'
+
+        content = client.get(url, headers=test_user_headers).json()["data"]["content"]
+        assert content["summary"] == "专注大模型推理优化"
+        assert content["skills"] == ["Python", "PyTorch", "深度学习", "CUDA"]
+        assert content["personalInfo"] == test_resume["content"]["personalInfo"]
+
+    def test_merge_patch(self, client: TestClient, test_user_headers, test_resume):
+        """测试 Merge Patch 合并对象、null 删除字段"""
+        url = f"/api/resumes/{test_resume['id']}"
+        response = client.patch(
+            url,
+            json={"personalInfo": {"phone": None, "title": "高级算法工程师"}, "summary": None},
+            headers={**test_user_headers, "Content-Type": "application/merge-patch+json"},
+        )
+
+        assert response.status_code == 200
+        content = client.get(url, headers=test_user_headers).json()["data"]["content"]
+        assert content["personalInfo"]["title"] == "高级算法工程师"
+        assert "phone" not in content["personalInfo"]
+        assert content["summary"] is None
+        assert content["skills"] == test_resume["content"]["skills"]
+
+    def test_patch_validates_touched_sections(self, client: TestClient, test_user_headers, test_resume):
+        """测试被修改的字段仍按 Schema 校验"""
+        url = f"/api/resumes/{test_resume['id']}"
+        headers = {**test_user_headers, "Content-Type": "application/json-patch+json"}
+
+        response = client.patch(url, json=[{"op": "replace", "path": "/skills", "value": "Python"}], headers=headers)
+        assert response.status_code == 400
+
+        response = client.patch(url, json=[{"op": "add", "path": "/hobbies", "value": []}], headers=headers)
+        assert response.status_code == 400
+
+        response = client.patch(url, json=[{"op": "remove", "path": "/nothing/0"}], headers=headers)
+        assert response.status_code == 400
+
+        response = client.patch(url, json=[{"op": "remove", "path": 5}], headers=headers)
+        assert response.status_code == 400
+
+        assert client.get(url, headers=test_user_headers).json()["data"]["version"] == 1
+
+    def test_patch_test_operation_conflict(self, client: TestClient, test_user_headers, test_resume):
+        """测试 test 操作失败返回 409"""
+        response = client.patch(
+            f"/api/resumes/{test_resume['id']}",
+            json=[
+                {"op": "test", "path": "/summary", "value": "别的内容"},
+                {"op": "replace", "path": "/summary", "value": "新简介"},
+            ],
+            headers={**test_user_headers, "Content-Type": "application/json-patch+json"},
+        )
+
+        assert response.status_code == 409
+
+    def test_patch_with_stale_if_match(self, client: TestClient, test_user_headers, test_resume):
+        """测试 PATCH 同样遵循 If-Match"""
+        response = client.patch(
+            f"/api/resumes/{test_resume['id']}",
+            json={"summary": "新简介"},
+            headers={**test_user_headers, "Content-Type": "application/merge-patch+json", "If-Match": '"0-0"'},
+        )
+
+        assert response.status_code == 412
+
+
+class TestAutosave:
+    """自动保存接口测试"""
+
+    def test_autosave_visible_to_reads(self, client: TestClient, test_user_headers, test_resume):
+        """测试缓冲中的版本对详情和列表可见"""
+        url = f"/api/resumes/{test_resume['id']}"
+        body = {**test_resume, "title": "自动保存标题"}
+
+        response = client.put(f"{url}/autosave", json=body, headers=test_user_headers)
+        assert response.status_code == 202
+        etag = response.headers["etag"]
+
+        detail = client.get(url, headers=test_user_headers)
+        assert detail.json()["data"]["title"] == "自动保存标题"
+        assert detail.headers["etag"] == etag
+        assert client.get(url, headers={**test_user_headers, "If-None-Match": etag}).status_code == 304
+
+        listing = client.get("/api/resumes", headers=test_user_headers).json()["data"]
+        assert listing[0]["title"] == "自动保存标题"
+
+    def test_explicit_save_after_autosave(self, client: TestClient, test_user_headers, test_resume):
+        """测试显式保存先落盘自动保存，并沿用其 ETag"""
+        url = f"/api/resumes/{test_resume['id']}"
+        etag = client.put(
+            f"{url}/autosave", json={**test_resume, "title": "草稿"}, headers=test_user_headers
+        ).headers["etag"]
+
+        response = client.put(
+            url,
+            json={**test_resume, "title": "正式版"},
+            headers={**test_user_headers, "If-Match": etag},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["data"]["title"] == "正式版"
+
+    def test_autosave_durable_on_shutdown(self, client: TestClient, test_user_headers, test_resume, test_db):
+        """测试关闭时缓冲中的自动保存写入数据库"""
+        from app.models.resume import Resume
+        from app.services.autosave import autosave_buffer
+
+        client.put(
+            f"/api/resumes/{test_resume['id']}/autosave",
+            json={**test_resume, "content": {**test_resume["content"], "summary": "未落盘的修改"}},
+            headers=test_user_headers,
+        )
+
+        autosave_buffer.stop()  # 与应用 shutdown 事件相同
+
+        test_db.expire_all()
+        stored = test_db.get(Resume, test_resume["id"])
+        assert "未落盘的修改" in stored.content
+        assert stored.version == 2
+
+    def test_autosave_other_user_forbidden(self, client: TestClient, test_resume, test_resume_data):
+        """测试不能自动保存他人的简历"""
+        response = client.post(
+            "/api/auth/register",
+            json={"email": "other@example.com", "password": "password123", "full_name": "其他用户"},
+        )
+        headers = {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+        response = client.put(f"/api/resumes/{test_resume['id']}/autosave", json=test_resume_data, headers=headers)
+
+        assert response.status_code == 403
+
+
+class TestRevisions:
+    """修订历史测试"""
+
+    def update_summary(self, client, headers, resume, summary):
+        body = {**resume, "content": {**resume["content"], "summary": summary}}
+        response = client.put(f"/api/resumes/{resume['id']}", json=body, headers=headers)
+        assert response.status_code == 200
+        return response.json()["data"]
+
+    def test_revisions_recorded_as_deltas(self, client: TestClient, test_user_headers, test_resume):
+        """测试每次更新记录一条增量修订"""
+        self.update_summary(client, test_user_headers, test_resume, "第二版")
+        self.update_summary(client, test_user_headers, test_resume, "第三版")
+
+        response = client.get(f"/api/resumes/{test_resume['id']}/revisions", headers=test_user_headers)
+        items = response.json()["data"]["items"]
+
+        assert [item["number"] for item in items] == [3, 2, 1]
+        assert [item["kind"] for item in items] == ["delta", "delta", "snapshot"]
+        assert [item["version"] for item in items] == [3, 2, 1]
+        # 增量只包含被修改的字段
+        assert items[0]["size"] < items[2]["size"] / 3
+
+    def test_get_revision_rebuilds_content(self, client: TestClient, test_user_headers, test_resume, monkeypatch):
+        """测试跨越多个快照重建任意修订"""
+        from app.services import revisions
+
+        monkeypatch.setattr(revisions.settings, "REVISION_SNAPSHOT_INTERVAL", 3)
+        for i in range(2, 9):
+            self.update_summary(client, test_user_headers, test_resume, f"第 {i} 版")
+
+        url = f"/api/resumes/{test_resume['id']}/revisions"
+        kinds = [item["kind"] for item in client.get(url, headers=test_user_headers).json()["data"]["items"]]
+        assert kinds.count("snapshot") == 3  # 第 1、4、7 条
+
+        first = client.get(f"{url}/1", headers=test_user_headers).json()["data"]
+        assert first["content"] == test_resume["content"]
+        for i in range(2, 9):
+            revision = client.get(f"{url}/{i}", headers=test_user_headers).json()["data"]
+            assert revision["content"]["summary"] == f"第 {i} 版"
+            assert revision["content"]["skills"] == test_resume["content"]["skills"]
+
+        assert client.get(f"{url}/99", headers=test_user_headers).status_code == 404
+
+    def test_revisions_pagination(self, client: TestClient, test_user_headers, test_resume):
+        """测试修订列表分页"""
+        for i in range(2, 6):
+            self.update_summary(client, test_user_headers, test_resume, f"第 {i} 版")
+        url = f"/api/resumes/{test_resume['id']}/revisions"
+
+        page = client.get(f"{url}?limit=2", headers=test_user_headers).json()["data"]
+        assert [item["number"] for item in page["items"]] == [5, 4]
+
+        page = client.get(f"{url}?limit=2&before={page['next_before']}", headers=test_user_headers).json()["data"]
+        assert [item["number"] for item in page["items"]] == [3, 2]
+
+    def test_restore_revision(self, client: TestClient, test_user_headers, test_resume):
+        """测试恢复到旧修订并记录为新修订"""
+        self.update_summary(client, test_user_headers, test_resume, "改坏了")
+        url = f"/api/resumes/{test_resume['id']}"
+
+        response = client.post(f"{url}/revisions/1/restore", headers=test_user_headers)
+
+        assert response.status_code == 200
+        assert response.json()["data"]["content"] == test_resume["content"]
+        assert response.json()["data"]["version"] == 3
+        items = client.get(f"{url}/revisions", headers=test_user_headers).json()["data"]["items"]
+        assert items[0]["number"] == 3
+
+    def test_autosave_flush_records_revision(self, client: TestClient, test_user_headers, test_resume):
+        """测试自动保存批量落盘同样记录修订"""
+        from app.services.autosave import autosave_buffer
+
+        url = f"/api/resumes/{test_resume['id']}"
+        body = {**test_resume, "content": {**test_resume["content"], "summary": "自动保存"}}
+        client.put(f"{url}/autosave", json=body, headers=test_user_headers)
+        autosave_buffer.flush()
+
+        revision = client.get(f"{url}/revisions/2", headers=test_user_headers).json()["data"]
+        assert revision["content"]["summary"] == "自动保存"
+
+    def test_delete_resume_removes_revisions(self, client: TestClient, test_user_headers, test_resume, test_db):
+        """测试删除简历时删除其修订"""
+        from app.models.revision import ResumeRevision
+
+        self.update_summary(client, test_user_headers, test_resume, "第二版")
+        client.delete(f"/api/resumes/{test_resume['id']}", headers=test_user_headers)
+
+        assert test_db.query(ResumeRevision).filter(ResumeRevision.resume_id == test_resume["id"]).count() == 0
+
+    def test_other_user_cannot_read_revisions(self, client: TestClient, test_resume):
+        """测试不能查看他人的修订"""
+        response = client.post(
+            "/api/auth/register",
+            json={"email": "other@example.com", "password": "password123", "full_name": "其他用户"},
+        )
+        headers = {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+        assert client.get(f"/api/resumes/{test_resume['id']}/revisions/1", headers=headers).status_code == 403
+
+
 class TestDeleteResume:
     """删除简历测试"""
 
@@ -210,6 +648,296 @@ class TestDuplicateResume:
         assert response.status_code == 404
 
 
+class TestContentDedup:
+    """内容去重测试"""
+
+    def blobs(self, db):
+        from app.models.content_blob import ContentBlob
+
+        db.expire_all()
+        return {blob.hash: blob.refcount for blob in db.query(ContentBlob).all()}
+
+    def test_duplicate_shares_blob(self, client: TestClient, test_user_headers, test_resume, test_db):
+        """测试复制出的简历共用同一个内容块"""
+        response = client.post(f"/api/resumes/{test_resume['id']}/duplicate", json={}, headers=test_user_headers)
+        assert response.status_code == 201
+
+        assert list(self.blobs(test_db).values()) == [2]
+        copy = client.get(f"/api/resumes/{response.json()['data']['id']}", headers=test_user_headers)
+        assert copy.json()["data"]["content"] == test_resume["content"]
+
+    def test_update_copy_on_write(self, client: TestClient, test_user_headers, test_resume, test_db):
+        """测试修改副本时另存一份内容，原简历不受影响"""
+        copy = client.post(f"/api/resumes/{test_resume['id']}/duplicate", json={}, headers=test_user_headers).json()["data"]
+        body = {**test_resume, "content": {**test_resume["content"], "summary": "副本的简介"}}
+        assert client.put(f"/api/resumes/{copy['id']}", json=body, headers=test_user_headers).status_code == 200
+
+        assert sorted(self.blobs(test_db).values()) == [1, 1]
+        original = client.get(f"/api/resumes/{test_resume['id']}", headers=test_user_headers).json()["data"]
+        assert original["content"]["summary"] == test_resume["content"]["summary"]
+
+    def test_delete_releases_blob(self, client: TestClient, test_user_headers, test_resume, test_db):
+        """测试删除简历后无人引用的内容块被回收"""
+        copy = client.post(f"/api/resumes/{test_resume['id']}/duplicate", json={}, headers=test_user_headers).json()["data"]
+
+        client.delete(f"/api/resumes/{copy['id']}", headers=test_user_headers)
+        assert list(self.blobs(test_db).values()) == [1]
+        client.delete(f"/api/resumes/{test_resume['id']}", headers=test_user_headers)
+        assert self.blobs(test_db) == {}
+
+    def test_refcount_without_upsert(self, client: TestClient, test_user_headers, test_resume, test_db, monkeypatch):
+        """测试不支持 ON CONFLICT 的数据库先查后改，引用计数一致"""
+        from app.models import content_blob
+
+        monkeypatch.setattr(content_blob, "UPSERT_INSERTS", {})
+        for _ in range(2):
+            response = client.post(f"/api/resumes/{test_resume['id']}/duplicate", json={}, headers=test_user_headers)
+            assert response.status_code == 201
+
+        assert list(self.blobs(test_db).values()) == [3]
+
+    def test_postgresql_upsert(self):
+        """测试 PostgreSQL 使用自身方言的 ON CONFLICT 语句"""
+        from sqlalchemy.dialects import postgresql
+        from app.models.content_blob import UPSERT_INSERTS, ContentBlob
+
+        table = ContentBlob.__table__
+        stmt = UPSERT_INSERTS["postgresql"](table)
+        stmt = stmt.on_conflict_do_update(index_elements=[table.c.hash], set_={"refcount": stmt.excluded.refcount})
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (hash) DO UPDATE" in sql
+
+
+class TestSearch:
+    """全文检索测试"""
+
+    def search(self, client, headers, q):
+        response = client.get("/api/resumes/search", params={"q": q}, headers=headers)
+        assert response.status_code == 200
+        return response.json()["data"]["items"]
+
+    def test_other_databases_skip_index(self, client: TestClient, test_user_headers, test_resume_data, test_db, monkeypatch):
+        """测试没有 FTS5 的数据库写入简历时不维护索引，检索返回空结果"""
+        from sqlalchemy import text
+        from app.services import search
+
+        monkeypatch.setattr(search, "SEARCH_DIALECT", "postgresql")
+        created = client.post("/api/resumes", json=test_resume_data, headers=test_user_headers)
+        assert created.status_code == 201
+        assert client.delete(f"/api/resumes/{created.json()['data']['id']}", headers=test_user_headers).status_code == 200
+        client.post("/api/resumes", json=test_resume_data, headers=test_user_headers)
+
+        assert self.search(client, test_user_headers, "大模型") == []
+        assert test_db.execute(text(f"SELECT count(*) FROM {search.SEARCH_TABLE}")).scalar() == 0
+
+    def test_search_chinese_phrase(self, client: TestClient, test_user_headers, test_resume):
+        """测试中文短语检索并返回高亮摘要"""
+        items = self.search(client, test_user_headers, "大模型")
+
+        assert [item["id"] for item in items] == [test_resume["id"]]
+        assert items[0]["field"] == "summary"
+        assert "<mark>大模型</mark>" in items[0]["snippet"]
+        # 不相邻的字不算命中
+        assert self.search(client, test_user_headers, "大型") == []
+
+    def test_search_requires_all_terms(self, client: TestClient, test_user_headers, test_resume):
+        """测试空格分隔的各项都须命中，末尾英文按前缀匹配"""
+        assert len(self.search(client, test_user_headers, "阿里巴巴 pyto")) == 1
+        assert self.search(client, test_user_headers, "阿里巴巴 腾讯") == []
+
+    def test_search_ranks_title_higher(self, client: TestClient, test_user_headers, test_resume, test_resume_data):
+        """测试标题命中的简历排在前面"""
+        other = client.post(
+            "/api/resumes",
+            json={**test_resume_data, "title": "产品经理简历", "content": {**test_resume_data["content"], "summary": "算法"}},
+            headers=test_user_headers,
+        ).json()["data"]
+
+        items = self.search(client, test_user_headers, "算法")
+        assert [item["id"] for item in items] == [test_resume["id"], other["id"]]
+
+    def test_search_index_follows_updates(self, client: TestClient, test_user_headers, test_resume):
+        """测试更新、自动保存和删除后索引随之更新"""
+        url = f"/api/resumes/{test_resume['id']}"
+        body = {**test_resume, "content": {**test_resume["content"], "summary": "推荐系统负责人"}}
+        client.put(url, json=body, headers=test_user_headers)
+        assert self.search(client, test_user_headers, "大模型") == []
+        assert len(self.search(client, test_user_headers, "推荐系统")) == 1
+
+        body = {**test_resume, "content": {**test_resume["content"], "summary": "搜索引擎"}}
+        client.put(f"{url}/autosave", json=body, headers=test_user_headers)
+        from app.services.autosave import autosave_buffer
+        autosave_buffer.flush()
+        assert len(self.search(client, test_user_headers, "搜索引擎")) == 1
+
+        client.delete(url, headers=test_user_headers)
+        assert self.search(client, test_user_headers, "搜索引擎") == []
+
+    def test_search_other_user_isolated(self, client: TestClient, test_resume, test_resume_data):
+        """测试只能检索到自己的简历"""
+        client.post("/api/auth/register", json={"email": "other@example.com", "password": "password123", "full_name": "其他用户"})
+        login = client.post("/api/auth/login", json={"email": "other@example.com", "password": "password123"})
+        headers = {"Authorization": f"Bearer {login.json()['data']['access_token']}"}
+
+        assert self.search(client, headers, "大模型") == []
+
+    def test_search_escapes_html(self, client: TestClient, test_user_headers, test_resume_data):
+        """测试摘要中的原文经过 HTML 转义"""
+        content = {**test_resume_data["content"], "summary": "<script>前端</script> 工程师"}
+        client.post("/api/resumes", json={**test_resume_data, "content": content}, headers=test_user_headers)
+
+        snippet = self.search(client, test_user_headers, "前端")[0]["snippet"]
+        assert "<script>" not in snippet
+        assert "&lt;script&gt;<mark>前端</mark>" in snippet
+
+
+class TestMatch:
+    """岗位描述匹配测试"""
+
+    JOB = "招聘算法工程师：熟悉 Python、PyTorch，有大模型训练经验，了解 Kubernetes 优先"
+
+    def test_match_single_resume(self, client: TestClient, test_user_headers, test_resume):
+        """测试单份简历返回得分与命中、缺失的关键词"""
+        response = client.post(
+            f"/api/resumes/{test_resume['id']}/match",
+            json={"job_description": self.JOB},
+            headers=test_user_headers,
+        )
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["resume_id"] == test_resume["id"]
+        assert data["score"] > 0
+        assert 0 < data["coverage"] < 1
+        assert {"python", "pytorch"} <= set(data["matched_terms"])
+        assert "kubernetes" in data["missing_terms"]
+
+    def test_match_ranks_resumes(self, client: TestClient, test_user_headers, test_resume, test_resume_data):
+        """测试批量匹配按得分排序"""
+        content = {**test_resume_data["content"], "skills": ["Java", "Spring"]}
+        other = client.post(
+            "/api/resumes", json={**test_resume_data, "title": "Java 简历", "content": content}, headers=test_user_headers
+        ).json()["data"]
+
+        response = client.post("/api/resumes/match", json={"job_description": self.JOB}, headers=test_user_headers)
+
+        assert response.status_code == 200
+        items = response.json()["data"]["items"]
+        assert [item["id"] for item in items] == [test_resume["id"], other["id"]]
+        assert items[0]["score"] > items[1]["score"]
+
+    def test_match_follows_updates(self, client: TestClient, test_user_headers, test_resume):
+        """测试修改内容后按新内容评分（缓存按内容哈希失效）"""
+        url = f"/api/resumes/{test_resume['id']}"
+        before = client.post(f"{url}/match", json={"job_description": self.JOB}, headers=test_user_headers).json()["data"]
+
+        body = {**test_resume, "content": {**test_resume["content"], "skills": ["Python", "PyTorch", "Kubernetes"]}}
+        client.put(f"{url}/autosave", json=body, headers=test_user_headers)
+        after = client.post(f"{url}/match", json={"job_description": self.JOB}, headers=test_user_headers).json()["data"]
+
+        assert "kubernetes" in before["missing_terms"]
+        assert "kubernetes" in after["matched_terms"]
+        assert after["coverage"] > before["coverage"]
+
+    def test_match_without_terms(self, client: TestClient, test_user_headers, test_resume):
+        """测试岗位描述中没有关键词时返回 400"""
+        response = client.post("/api/resumes/match", json={"job_description": "，。！"}, headers=test_user_headers)
+        assert response.status_code == 400
+
+
+class TestExport:
+    """批量导出测试"""
+
+    def test_export_ndjson(self, client: TestClient, test_user_headers, test_resume, test_resume_data):
+        """测试 NDJSON 每行一份简历，按 id 排序，含未落盘的自动保存"""
+        other = client.post("/api/resumes", json={**test_resume_data, "title": "第二份"}, headers=test_user_headers).json()["data"]
+        client.put(
+            f"/api/resumes/{other['id']}/autosave",
+            json={**test_resume_data, "title": "自动保存的标题"},
+            headers=test_user_headers,
+        )
+
+        response = client.get("/api/resumes/export", params={"format": "ndjson"}, headers=test_user_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [item["id"] for item in lines] == [test_resume["id"], other["id"]]
+        assert lines[0]["content"] == test_resume["content"]
+        assert lines[1]["title"] == "自动保存的标题"
+
+    def test_export_zip_json_resume(self, client: TestClient, test_user_headers, test_resume):
+        """测试 ZIP 中每份简历一个 JSON Resume 文件"""
+        response = client.get("/api/resumes/export", params={"schema": "jsonresume"}, headers=test_user_headers)
+
+        assert response.status_code == 200
+        assert "resumes-jsonresume.zip" in response.headers["content-disposition"]
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            assert archive.namelist() == [f"{test_resume['id']}.json"]
+            document = json.loads(archive.read(archive.namelist()[0]))
+        assert document["basics"]["name"] == "林徐坤"
+        assert document["skills"][0] == {"name": "Python"}
+
+    def test_export_only_own_resumes(self, client: TestClient, test_resume):
+        """测试只导出当前用户的简历"""
+        client.post("/api/auth/register", json={"email": "other@example.com", "password": "password123", "full_name": "其他用户"})
+        login = client.post("/api/auth/login", json={"email": "other@example.com", "password": "password123"})
+        headers = {"Authorization": f"Bearer {login.json()['data']['access_token']}"}
+
+        response = client.get("/api/resumes/export", params={"format": "ndjson"}, headers=headers)
+        assert response.status_code == 200
+        assert response.content == b""
+
+    def test_export_invalid_format(self, client: TestClient, test_user_headers):
+        """测试不支持的导出格式"""
+        response = client.get("/api/resumes/export", params={"format": "csv"}, headers=test_user_headers)
+        assert response.status_code == 422
+
+
+class TestBulkImport:
+    """批量导入测试"""
+
+    def test_bulk_import_array(self, client: TestClient, test_user_headers, test_resume_data):
+        """测试 JSON 数组混合本站格式与 JSON Resume，校验失败的项单独报告"""
+        documents = [
+            test_resume_data,
+            {"title": "缺少模板", "content": {}},
+            {"basics": {"name": "林徐坤", "summary": "推荐系统"}, "skills": [{"name": "Go"}]},
+        ]
+        response = client.post("/api/resumes/bulk", json=documents, headers=test_user_headers)
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert (data["created"], data["failed"]) == (2, 1)
+        assert [item["success"] for item in data["items"]] == [True, False, True]
+        assert data["items"][1]["index"] == 1
+
+        imported = client.get(f"/api/resumes/{data['items'][2]['id']}", headers=test_user_headers).json()["data"]
+        assert imported["title"] == "林徐坤的简历"
+        assert imported["content"]["skills"] == ["Go"]
+
+    def test_bulk_import_ndjson(self, client: TestClient, test_user_headers, test_resume_data):
+        """测试 NDJSON 导入后可检索，并有初始修订"""
+        lines = [json.dumps({**test_resume_data, "title": f"导入 {i}"}, ensure_ascii=False) for i in range(3)]
+        response = client.post(
+            "/api/resumes/bulk",
+            content="\n".join(lines + ["{bad"]).encode("utf-8"),
+            headers={**test_user_headers, "Content-Type": "application/x-ndjson"},
+        )
+
+        data = response.json()["data"]
+        assert (data["created"], data["failed"]) == (3, 1)
+        search = client.get("/api/resumes/search", params={"q": "大模型"}, headers=test_user_headers).json()["data"]
+        assert len(search["items"]) == 3
+        revisions = client.get(f"/api/resumes/{data['items'][0]['id']}/revisions", headers=test_user_headers)
+        assert len(revisions.json()["data"]["items"]) == 1
+
+    def test_bulk_import_not_array(self, client: TestClient, test_user_headers, test_resume_data):
+        """测试请求体不是数组时返回 400"""
+        response = client.post("/api/resumes/bulk", json=test_resume_data, headers=test_user_headers)
+        assert response.status_code == 400
+
+
 class TestResumePermissions:
     """简历权限测试"""
 
@@ -280,3 +1008,115 @@ class TestResumePermissions:
         )
 
         assert response.status_code == 403  # 禁止访问
+
+
+class TestExportPdf:
+    """服务端 PDF 导出测试"""
+
+    @pytest.fixture(autouse=True)
+    def inline_render_engine(self, monkeypatch):
+        """测试中在当前线程内渲染，避免启动进程池"""
+        from app.services.render_engine import render_engine
+
+        monkeypatch.setattr(render_engine, "max_workers", 0)
+        render_engine.clear_cache()
+        yield
+        render_engine.clear_cache()
+
+    def test_export_pdf_success(self, client: TestClient, test_user_headers, test_resume):
+        """测试导出 PDF"""
+        response = client.post(f"/api/resumes/{test_resume['id']}/pdf", headers=test_user_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/pdf"
+        assert response.content.startswith(b"%PDF-1.4")
+        assert response.content.rstrip().endswith(b"%%EOF")
+        assert "filename*=UTF-8''" in response.headers["content-disposition"]
+
+    def test_export_pdf_uses_cache(self, client: TestClient, test_user_headers, test_resume):
+        """测试相同内容命中渲染缓存，客户端已有版本时返回 304"""
+        from app.services.render_engine import render_engine
+
+        url = f"/api/resumes/{test_resume['id']}/pdf"
+        first = client.post(url, headers=test_user_headers)
+        hits = render_engine.stats()["hits"]
+        second = client.post(url, headers=test_user_headers)
+
+        assert second.content == first.content
+        assert render_engine.stats()["hits"] == hits + 1
+
+        cached = client.post(url, headers={**test_user_headers, "If-None-Match": first.headers["ETag"]})
+        assert cached.status_code == 304
+
+    def test_export_pdf_changes_with_content(self, client: TestClient, test_user_headers, test_resume):
+        """测试内容变化后重新渲染"""
+        url = f"/api/resumes/{test_resume['id']}/pdf"
+        before = client.post(url, headers=test_user_headers).headers["ETag"]
+
+        client.put(
+            f"/api/resumes/{test_resume['id']}",
+            json={**test_resume, "content": {**test_resume["content"], "summary": "新的简介"}},
+            headers=test_user_headers
+        )
+        after = client.post(url, headers=test_user_headers).headers["ETag"]
+
+        assert after != before
+
+    def test_export_pdf_not_found(self, client: TestClient, test_user_headers):
+        """测试导出不存在的简历"""
+        response = client.post("/api/resumes/99999/pdf", headers=test_user_headers)
+
+        assert response.status_code == 404
+
+    def test_export_pdf_numeric_fields(self, client: TestClient, test_user_headers):
+        """测试内容字段为数字等非字符串值时照常渲染"""
+        resume = client.post("/api/resumes", json={
+            "title": "数字字段",
+            "template_id": "modern",
+            "content": {
+                "personalInfo": {"name": 5, "title": 3.5, "phone": 13800000000},
+                "workExperience": [{"company": 1, "position": "工程师", "description": 123, "startDate": 2020}],
+                "education": [{"school": 2, "degree": None, "gpa": 3.8}],
+                "projects": [{"name": 7, "description": ["多行", "描述"], "technologies": [1, "Go"]}],
+            },
+        }, headers=test_user_headers).json()["data"]
+
+        response = client.post(f"/api/resumes/{resume['id']}/pdf", headers=test_user_headers)
+
+        assert response.status_code == 200
+        assert response.content.startswith(b"%PDF-1.4")
+
+
+class TestQueryBudget:
+    """各接口的 SQL 条数预算（用户已在缓存中）"""
+
+    @pytest.mark.query_budget(1)
+    def test_get_resume_detail(self, client: TestClient, test_user_headers, test_resume):
+        """测试读取详情只执行一条查询（内容与元数据一起读取）"""
+        response = client.get(f"/api/resumes/{test_resume['id']}", headers=test_user_headers)
+        assert response.status_code == 200
+
+    def test_list_does_not_grow_with_count(self, client: TestClient, test_user_headers, test_resume_data, query_budget):
+        """测试列表查询条数与简历数量无关（无 N+1）"""
+        for _ in range(20):
+            client.post("/api/resumes", json=test_resume_data, headers=test_user_headers)
+
+        with query_budget(1):
+            response = client.get("/api/resumes", headers=test_user_headers)
+        assert len(response.json()["data"]) == 20
+
+    def test_update_resume(self, client: TestClient, test_user_headers, test_resume, query_budget):
+        """测试更新简历的查询条数：读取、内容块、简历、修订、检索索引、重新读取"""
+        with query_budget(10):
+            response = client.put(
+                f"/api/resumes/{test_resume['id']}",
+                json={**test_resume, "content": {**test_resume["content"], "summary": "新的简介"}},
+                headers=test_user_headers
+            )
+        assert response.status_code == 200
+
+    def test_budget_exceeded_fails(self, client: TestClient, test_user_headers, test_resume, query_budget):
+        """测试超出预算时测试失败并列出语句"""
+        with pytest.raises(pytest.fail.Exception, match="超出预算 0 条"):
+            with query_budget(0):
+                client.get(f"/api/resumes/{test_resume['id']}", headers=test_user_headers)
@@ -0,0 +1,35 @@
+"""全文检索分词与查询解析测试"""
+from app.services.search import make_snippet, parse_query, search_document, tokenize
+
+
+class TestSearchQuery:
+    """分词与查询解析测试"""
+
+    def test_tokenize_mixed_text(self):
+        """测试中文逐字切分，英文数字按词切分并转小写"""
+        assert tokenize("熟悉FastAPI与大模型 2.0") == ["熟", "悉", "fastapi", "与", "大", "模", "型", "2", "0"]
+
+    def test_terms_scoped_by_user(self):
+        """测试不同用户的查询词前缀不同"""
+        first, _ = parse_query(1, "模型")
+        second, _ = parse_query(2, "模型")
+        assert first != second
+        assert first.count('"') == 2
+
+    def test_prefix_only_for_trailing_word(self):
+        """测试只有末尾的英文单词按前缀匹配"""
+        assert parse_query(1, "pyth")[0].endswith("*")
+        assert not parse_query(1, "pyth ")[0].endswith("*")
+        assert not parse_query(1, '"pyth"')[0].endswith("*")
+        assert not parse_query(1, "模型")[0].endswith("*")
+
+    def test_empty_query(self):
+        """测试没有可检索的词时不查询"""
+        assert parse_query(1, " ，。 ") == (None, [])
+
+    def test_snippet_prefers_most_matches(self):
+        """测试摘要取命中词语最多的字段"""
+        document = search_document("后端简历", '{"summary": "Python 后端", "skills": ["Python", "Go"]}')
+        field, snippet = make_snippet(document, ["python", "go"])
+        assert field == "skills"
+        assert snippet == "<mark>Python</mark> <mark>Go</mark>"
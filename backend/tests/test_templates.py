@@ -0,0 +1,102 @@
+"""模板模块测试"""
+from fastapi.testclient import TestClient
+
+
+class TestTemplateCatalogue:
+    """模板目录测试"""
+
+    def test_get_templates(self, client: TestClient):
+        """测试获取完整模板目录"""
+        response = client.get("/api/templates")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert [t["id"] for t in data["data"]] == ["modern", "classic", "creative"]
+        assert "defaultContent" in data["data"][0]
+        assert response.headers["ETag"].startswith('"')
+        assert "max-age" in response.headers["Cache-Control"]
+
+    def test_get_templates_slim(self, client: TestClient):
+        """测试精简模式不含 defaultContent"""
+        full = client.get("/api/templates")
+        slim = client.get("/api/templates?slim=true")
+
+        assert slim.status_code == 200
+        assert all("defaultContent" not in t for t in slim.json()["data"])
+        assert slim.headers["ETag"] != full.headers["ETag"]
+        assert len(slim.content) < len(full.content)
+
+    def test_get_templates_not_modified(self, client: TestClient):
+        """测试 If-None-Match 命中返回 304"""
+        etag = client.get("/api/templates").headers["ETag"]
+
+        response = client.get("/api/templates", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+    def test_get_template(self, client: TestClient):
+        """测试获取单个模板"""
+        response = client.get("/api/templates/classic")
+
+        assert response.status_code == 200
+        assert response.json()["data"]["id"] == "classic"
+
+        etag = response.headers["ETag"]
+        cached = client.get("/api/templates/classic", headers={"If-None-Match": f'W/{etag}, "other"'})
+        assert cached.status_code == 304
+
+    def test_get_template_not_found(self, client: TestClient):
+        """测试模板不存在"""
+        response = client.get("/api/templates/unknown")
+
+        assert response.status_code == 404
+
+
+class TestTemplateRegistry:
+    """模板注册表测试"""
+
+    def _copy_templates(self, tmp_path):
+        import shutil
+        from app.core.template_registry import template_registry
+
+        directory = tmp_path / "templates"
+        shutil.copytree(template_registry.directory, directory)
+        return directory
+
+    def test_reload_replaces_snapshot(self, tmp_path):
+        """测试目录变化后重新加载并重建预编码响应"""
+        import json
+        from app.core.template_registry import TemplateRegistry
+
+        directory = self._copy_templates(tmp_path)
+        registry = TemplateRegistry(directory)
+        old_etag = registry.snapshot.items["modern"].etag
+        old_version = registry.version("modern")
+
+        manifest = json.loads((directory / "modern.json").read_text(encoding="utf-8"))
+        manifest["name"] = "现代风格 v2"
+        (directory / "modern.json").write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+        (directory / "minimal.json").write_text(json.dumps({"id": "minimal", "order": 9}), encoding="utf-8")
+
+        assert registry.reload_if_changed() is True
+        assert registry.get("modern")["name"] == "现代风格 v2"
+        assert registry.snapshot.items["modern"].etag != old_etag
+        assert registry.version("modern") != old_version
+        assert [t["id"] for t in registry.all()][-1] == "minimal"
+        assert registry.reload_if_changed() is False
+
+    def test_invalid_manifest_keeps_previous_snapshot(self, tmp_path):
+        """测试清单无效时保留旧快照"""
+        from app.core.template_registry import TemplateRegistry
+
+        directory = self._copy_templates(tmp_path)
+        registry = TemplateRegistry(directory)
+        snapshot = registry.snapshot
+
+        (directory / "broken.json").write_text("{", encoding="utf-8")
+
+        assert registry.reload_if_changed() is False
+        assert registry.snapshot is snapshot